@@ -0,0 +1,6 @@
+"""
+Benchmarks for the capture and matching hot paths.
+
+Each module runs standalone on synthetic data (no window or screen needed):
+    python -m benchmarks.capture
+"""
@@ -0,0 +1,45 @@
+"""
+PixelSignature check cost.
+
+Usage:
+    python -m benchmarks.pixel_signature
+"""
+
+from typing import Sequence, Tuple
+import time
+import numpy as np
+
+from core.pixel_signature import PixelSignature
+from utils.logger import log
+
+
+def benchmark(probe_counts: Sequence[int] = (4, 16, 64), size: Tuple[int, int] = (1920, 1080),
+              repeat: int = 200) -> dict:
+    """
+    Time one signature check on a captured-size BGRA frame.
+    
+    Returns:
+        {probe_count: best_us}
+    """
+    w, h = size
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (h, w, 4), dtype=np.uint8)
+    
+    results = {}
+    for n in probe_counts:
+        xs, ys = rng.integers(0, w, n), rng.integers(0, h, n)
+        probes = [(x, y, tuple(int(c) for c in frame[y, x, 2::-1]), 5) for x, y in zip(xs, ys)]
+        signature = PixelSignature(probes)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            signature.check(frame)
+            elapsed = (time.perf_counter() - start) * 1e6
+            best = elapsed if best is None else min(best, elapsed)
+        results[n] = best
+        log(f"[SIGNATURE] {n} probes on {w}x{h}: {best:.1f}us per check")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,94 @@
+"""
+core.pixel_stats kernels vs the pure-Python loops they replaced.
+
+Usage:
+    python -m benchmarks.pixel_stats
+"""
+
+from typing import Sequence, Tuple
+from collections import Counter
+import time
+import numpy as np
+
+from core import pixel_stats
+from utils.logger import log
+
+
+def benchmark(sizes: Sequence[Tuple[int, int]] = ((100, 100), (400, 300), (800, 600)),
+              repeat: int = 5) -> dict:
+    """
+    Micro-benchmark kernel vs the pure-Python loops on synthetic regions.
+    
+    Regions are blocky (like UI) with noise, and a second frame differs in
+    a band.
+    
+    Returns:
+        {(w, h): {name: (python_ms, numpy_ms)}}
+    """
+    def py_changed(d1, d2):
+        diff_count = 0
+        for i in range(0, len(d1), 4):
+            if d1[i] != d2[i] or d1[i+1] != d2[i+1] or d1[i+2] != d2[i+2]:
+                diff_count += 1
+        return diff_count / (len(d1) / 4)
+    
+    def py_match(d, target, tol):
+        r_t, g_t, b_t = target
+        count = 0
+        for i in range(0, len(d), 4):
+            b, g, r = d[i], d[i+1], d[i+2]
+            if abs(r - r_t) <= tol and abs(g - g_t) <= tol and abs(b - b_t) <= tol:
+                count += 1
+        return count / (len(d) // 4)
+    
+    def py_top(d, step, n):
+        counts = Counter()
+        for i in range(0, len(d), 4):
+            b, g, r = d[i], d[i+1], d[i+2]
+            counts[((r // step) * step, (g // step) * step, (b // step) * step)] += 1
+        return counts.most_common(n)
+    
+    def np_top(d, step, n):
+        return pixel_stats.most_common(*pixel_stats.color_counts(d, step), n)
+    
+    def timed(fn, *args):
+        best, out = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            out = fn(*args)
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, out
+    
+    rng = np.random.default_rng(0)
+    results = {}
+    for w, h in sizes:
+        blocks = rng.integers(0, 256, (h // 20 + 1, w // 20 + 1, 4), dtype=np.uint8)
+        img = np.repeat(np.repeat(blocks, 20, axis=0), 20, axis=1)[:h, :w].copy()
+        img[rng.random((h, w)) < 0.05] = 0
+        img[:, :, 3] = 255
+        other = img.copy()
+        other[h // 3:h // 2] ^= 1
+        d1, d2 = img.tobytes(), other.tobytes()
+        target = tuple(int(v) for v in img[h // 2, w // 2, 2::-1])
+        
+        cases = {
+            "changed_ratio": ((py_changed, d1, d2), (pixel_stats.changed_ratio, d1, d2)),
+            "match_ratio": ((py_match, d1, target, 30), (pixel_stats.match_ratio, d1, [target], 30)),
+            "top_colors": ((py_top, d1, 10, 5), (np_top, d1, 10, 5)),
+        }
+        row = {}
+        for name, (py_case, np_case) in cases.items():
+            py_ms, py_out = timed(*py_case)
+            np_ms, np_out = timed(*np_case)
+            if py_out != np_out:
+                log(f"[PIXEL_STATS] {name} mismatch at {w}x{h}: {py_out} != {np_out}")
+            row[name] = (py_ms, np_ms)
+            log(f"[PIXEL_STATS] {w}x{h} {name}: python {py_ms:.2f}ms, numpy {np_ms:.3f}ms "
+                f"({py_ms / max(np_ms, 1e-6):.0f}x)")
+        results[(w, h)] = row
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,81 @@
+"""Synthetic screens and fake capture sources shared by the benchmarks"""
+
+from typing import Optional
+import time
+import numpy as np
+
+from core.capture import Frame, ICaptureProvider
+from core.template_cache import Template
+
+
+def blocky(rng: np.random.Generator, w: int, h: int, block: int = 8, channels: int = 3) -> np.ndarray:
+    """Blocky random image (UI-like flat areas with edges)"""
+    blocks = rng.integers(0, 256, (h // block + 1, w // block + 1, channels), dtype=np.uint8)
+    return np.repeat(np.repeat(blocks, block, axis=0), block, axis=1)[:h, :w].copy()
+
+
+def add_noise(rng: np.random.Generator, img: np.ndarray, amount: int) -> np.ndarray:
+    """img with uniform per-channel noise in [-amount, amount]"""
+    noise = rng.integers(-amount, amount + 1, img.shape)
+    return np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def as_template(bgr: np.ndarray) -> Template:
+    """In-memory Template (no file behind it)"""
+    return Template("<synthetic>", np.ascontiguousarray(bgr), (0, 0))
+
+
+def synthetic_desktop(w: int = 1920, h: int = 1080) -> np.ndarray:
+    """Deterministic BGR desktop of 16 px blocks"""
+    return blocky(np.random.default_rng(0), w, h, block=16)
+
+
+class SyntheticProvider(ICaptureProvider):
+    """Fake provider: slices a synthetic desktop, optionally slow"""
+    
+    def __init__(self, desktop: np.ndarray, delay: float = 0.0):
+        self.desktop = desktop
+        self.delay = delay
+        self.calls = 0
+    
+    @property
+    def name(self) -> str:
+        return "Synthetic"
+    
+    def is_available(self) -> bool:
+        return True
+    
+    def grab(self, x: int, y: int, w: int, h: int) -> Optional[Frame]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        pixels = self.desktop[y:y + h, x:x + w].copy()
+        return Frame(pixels=pixels, width=pixels.shape[1], height=pixels.shape[0],
+                     timestamp=time.time(), provider=self.name)
+    
+    def release(self):
+        pass
+
+
+class FakeShot:
+    """Stand-in for an mss ScreenShot: raw BGRA bytes plus size"""
+    
+    def __init__(self, raw: bytes, width: int, height: int):
+        self.raw = raw
+        self.width = width
+        self.height = height
+    
+    @property
+    def __array_interface__(self) -> dict:
+        return {"version": 3, "shape": (self.height, self.width, 4),
+                "typestr": "|u1", "data": self.raw}
+
+
+class FakeSct:
+    """Stand-in for an mss instance that always returns the same shot"""
+    
+    def __init__(self, shot: FakeShot):
+        self.shot = shot
+    
+    def grab(self, monitor: dict) -> FakeShot:
+        return self.shot
@@ -0,0 +1,172 @@
+"""
+Template matching benchmarks (core.template_match).
+
+Usage:
+    python -m benchmarks.template_match
+"""
+
+from typing import Sequence, Tuple
+import time
+import cv2
+import numpy as np
+
+from core.template_match import match_exact, match_full, match_pyramid, top_k_nms
+from utils.logger import log
+from benchmarks.synthetic import add_noise, as_template, blocky
+
+
+def benchmark_pyramid(screens: int = 60, size: Tuple[int, int] = (960, 540),
+                      template_size: Tuple[int, int] = (60, 48),
+                      accept_score: float = 0.8) -> dict:
+    """
+    Full vs pyramid engine (TM_CCOEFF_NORMED) on synthetic screens, half
+    of which contain a noisy copy of the template.
+    
+    Returns:
+        {"full_ms", "pyramid_ms", "agree", "screens", "fallbacks"}
+    """
+    rng = np.random.default_rng(0)
+    w, h = size
+    tw, th = template_size
+    template = as_template(blocky(rng, tw, th))
+    method = cv2.TM_CCOEFF_NORMED
+    
+    cases = []
+    for i in range(screens):
+        screen = blocky(rng, w, h)
+        if i % 2 == 0:
+            x, y = int(rng.integers(0, w - tw)), int(rng.integers(0, h - th))
+            screen[y:y + th, x:x + tw] = template.bgr
+        cases.append(add_noise(rng, screen, 6))
+    
+    full_time = pyramid_time = 0.0
+    agree = fallbacks = 0
+    for screen in cases:
+        start = time.perf_counter()
+        full = match_full(screen, template.bgr, method)
+        full_time += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        pyr = match_pyramid(screen, template, method, accept_score)
+        pyramid_time += time.perf_counter() - start
+        
+        agree += (full.score >= accept_score) == (pyr.score >= accept_score)
+        fallbacks += pyr.fallback
+    
+    results = {
+        "full_ms": full_time * 1000 / screens,
+        "pyramid_ms": pyramid_time * 1000 / screens,
+        "agree": agree,
+        "screens": screens,
+        "fallbacks": fallbacks,
+    }
+    log(f"[MATCH] pyramid {w}x{h}, {tw}x{th} template: full {results['full_ms']:.1f}ms, "
+        f"pyramid {results['pyramid_ms']:.1f}ms; decisions agree {agree}/{screens}, "
+        f"{fallbacks} fallback(s)")
+    return results
+
+
+def benchmark_find_all(size: Tuple[int, int] = (960, 540), icon: int = 40, gap: int = 24,
+                       max_results: int = 50, threshold: float = 0.7) -> dict:
+    """
+    top_k_nms vs the old scanline collection (first max_results response
+    pixels >= threshold) on a dense grid of repeated, noisy icons. Both
+    run on the same response map; "distinct" counts icons covered.
+    
+    Returns:
+        {"icons", "scanline_ms", "scanline_distinct", "nms_ms", "nms_distinct"}
+    """
+    rng = np.random.default_rng(0)
+    w, h = size
+    template = blocky(rng, icon, icon, block=4)
+    screen = np.full((h, w, 3), 40, dtype=np.uint8)
+    pitch = icon + gap
+    positions = []
+    for y in range(gap // 2, h - icon, pitch):
+        for x in range(gap // 2, w - icon, pitch):
+            screen[y:y + icon, x:x + icon] = template
+            positions.append((x, y))
+    screen = add_noise(rng, screen, 8)
+    grid = np.array(positions)
+    
+    def distinct(points) -> int:
+        hit = set()
+        for x, y in points:
+            d = np.abs(grid - (x, y)).max(axis=1)
+            if d.min() < icon // 2:
+                hit.add(int(d.argmin()))
+        return len(hit)
+    
+    scores = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    
+    start = time.perf_counter()
+    ys, xs = np.where(scores >= threshold)
+    scanline = list(zip(xs[:max_results], ys[:max_results]))
+    scanline_ms = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    picks = top_k_nms(scores, max_results, icon, icon, threshold)
+    nms_ms = (time.perf_counter() - start) * 1000
+    
+    results = {
+        "icons": len(positions),
+        "scanline_ms": scanline_ms,
+        "scanline_distinct": distinct(scanline),
+        "nms_ms": nms_ms,
+        "nms_distinct": distinct(pos for _, pos in picks),
+    }
+    log(f"[MATCH] find_all {len(positions)} icons, max_results={max_results}: "
+        f"scanline {scanline_ms:.2f}ms -> {results['scanline_distinct']} distinct, "
+        f"top-k/NMS {nms_ms:.2f}ms -> {results['nms_distinct']} distinct")
+    return results
+
+
+def benchmark_exact(sizes: Sequence[Tuple[int, int]] = ((1280, 720), (1920, 1080)),
+                    template_size: Tuple[int, int] = (120, 48), repeat: int = 3) -> dict:
+    """
+    Rolling-hash exact match vs TM_CCOEFF_NORMED on full-window frames
+    holding a pixel-perfect copy of the template (and the cost of a miss).
+    
+    Returns:
+        {(w, h): {"exact_ms", "ccoeff_ms", "miss_ms"}}
+    """
+    rng = np.random.default_rng(0)
+    tw, th = template_size
+    template = as_template(blocky(rng, tw, th, block=4))
+    template.exact_hash  # memoized per template; not part of a match
+    
+    def best_ms(fn) -> float:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+    
+    results = {}
+    for w, h in sizes:
+        screen = blocky(rng, w, h)
+        miss = screen.copy()
+        x, y = w * 2 // 3, h // 2
+        screen[y:y + th, x:x + tw] = template.bgr
+        
+        found = match_exact(screen, template)
+        if found is None or found.top_left != (x, y):
+            log(f"[MATCH] exact benchmark: copy at {(x, y)} not found ({found})")
+        
+        results[(w, h)] = {
+            "exact_ms": best_ms(lambda: match_exact(screen, template)),
+            "ccoeff_ms": best_ms(lambda: match_full(screen, template.bgr, cv2.TM_CCOEFF_NORMED)),
+            "miss_ms": best_ms(lambda: match_exact(miss, template)),
+        }
+        r = results[(w, h)]
+        log(f"[MATCH] exact {w}x{h}, {tw}x{th} template: hash {r['exact_ms']:.1f}ms vs "
+            f"TM_CCOEFF_NORMED {r['ccoeff_ms']:.1f}ms (miss costs {r['miss_ms']:.1f}ms)")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_pyramid()
+    benchmark_find_all()
+    benchmark_exact()
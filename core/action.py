@@ -20,7 +20,9 @@ def wait_motion(worker, action: dict):
     data = _motion_cache[key]
     detector = data["detector"]
 
-    frame = worker.capture()
+    frame = worker.capture_frame(force_refresh=True)
+    if frame is None:
+        return {"result": ActionResult.RETRY}
 
     if detector.update(frame):
         log("[WAIT_MOTION] Màn hình ổn định")
@@ -18,8 +18,8 @@ from enum import Enum
 
 from utils.logger import log
 from core.wait_actions import (
-    WaitTime, WaitPixelColor, WaitScreenChange, WaitHotkey, WaitFile,
-    create_wait_action, WaitResult
+    WaitTime, WaitPixelColor, WaitPixelSignature, WaitScreenChange, WaitHotkey, WaitFile,
+    WaitAnyImage, create_wait_action, signature_from_params, WaitResult
 )
 from core.image_actions import (
     FindImage, CaptureImage, find_image, capture_image, 
@@ -268,6 +268,9 @@ class ActionEngine:
             elif action_type == "WaitPixelColor":
                 return self._exec_wait_pixel_color(params)
             
+            elif action_type == "WaitPixelSignature":
+                return self._exec_wait_pixel_signature(params)
+            
             elif action_type == "WaitScreenChange":
                 return self._exec_wait_screen_change(params)
             
@@ -277,6 +280,9 @@ class ActionEngine:
             elif action_type == "WaitFile":
                 return self._exec_wait_file(params)
             
+            elif action_type == "WaitAnyImage":
+                return self._exec_wait_any_image(params)
+            
             elif action_type == "FindImage":
                 return self._exec_find_image(params)
             
@@ -535,6 +541,32 @@ class ActionEngine:
         
         return ActionResult(status=status, message=result.message)
     
+    def _exec_wait_pixel_signature(self, params: dict) -> ActionResult:
+        """Execute WaitPixelSignature action (multi-probe pixel wait)"""
+        signature = signature_from_params(params)
+        if signature is None:
+            return ActionResult(
+                status=ActionStatus.FAILED,
+                message="Invalid pixel signature"
+            )
+        
+        wait = WaitPixelSignature(
+            signature=signature,
+            timeout_ms=params.get("timeout_ms", 30000),
+            target_hwnd=params.get("target_hwnd", self.target_hwnd),
+            interval_ms=params.get("interval_ms", 100)
+        )
+        result = wait.wait(self._stop_event)
+        
+        if result.timeout:
+            status = ActionStatus.TIMEOUT
+        elif result.success:
+            status = ActionStatus.SUCCESS
+        else:
+            status = ActionStatus.STOPPED
+        
+        return ActionResult(status=status, message=result.message, data=result.data)
+    
     def _exec_wait_screen_change(self, params: dict) -> ActionResult:
         """Execute WaitScreenChange action"""
         region = params.get("region", (0, 0, 100, 100))
@@ -593,6 +625,46 @@ class ActionEngine:
         
         return ActionResult(status=status, message=result.message)
     
+    def _exec_wait_any_image(self, params: dict) -> ActionResult:
+        """Execute WaitAnyImage action (first of N templates to appear)"""
+        if not image_actions_available():
+            return ActionResult(
+                status=ActionStatus.FAILED,
+                message="OpenCV not available"
+            )
+        
+        region = params.get("region")
+        if isinstance(region, list):
+            region = tuple(region)
+        
+        wait = WaitAnyImage(
+            template_paths=params.get("template_paths", []),
+            threshold=params.get("threshold", 0.8),
+            timeout_ms=params.get("timeout_ms", 30000),
+            target_hwnd=params.get("target_hwnd", self.target_hwnd),
+            region=region,
+            engine=params.get("engine", "full")
+        )
+        result = wait.wait(self._stop_event)
+        
+        if result.success:
+            match = result.data["match"]
+            self._variables["last_image_x"] = match.center_x
+            self._variables["last_image_y"] = match.center_y
+            self._variables["last_image_found"] = True
+            self._variables["last_image_index"] = result.data["index"]
+            return ActionResult(status=ActionStatus.SUCCESS, message=result.message,
+                                data=result.data)
+        
+        self._variables["last_image_found"] = False
+        self._variables["last_image_index"] = -1
+        if result.timeout:
+            status = ActionStatus.TIMEOUT
+        else:
+            status = ActionStatus.STOPPED
+        
+        return ActionResult(status=status, message=result.message)
+    
     def _exec_find_image(self, params: dict) -> ActionResult:
         """Execute FindImage action"""
         if not image_actions_available():
@@ -610,7 +682,14 @@ class ActionEngine:
             region=region,
             threshold=params.get("threshold", 0.8),
             timeout_ms=params.get("timeout_ms", 5000),
-            target_hwnd=params.get("target_hwnd", self.target_hwnd)
+            target_hwnd=params.get("target_hwnd", self.target_hwnd),
+            engine=params.get("engine", "full"),
+            pyramid_tolerance=params.get("pyramid_tolerance", 0.1),
+            multi_scale=params.get("multi_scale", False),
+            scale_range=(params.get("scale_min", 0.8), params.get("scale_max", 1.2)),
+            scale_step=params.get("scale_step", 0.05),
+            exact_cutoff=params.get("exact_cutoff", 0.95),
+            fingerprint=params.get("fingerprint")
         )
         
         match = finder.find(self._stop_event)
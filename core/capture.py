@@ -1,16 +1,62 @@
 """
 ICaptureProvider implementation with BetterCam → DXCam → MSS fallback chain
-High-FPS capture with per-worker cache
+High-FPS capture with per-worker cache and optional background producers
 """
 
 from typing import Optional, Tuple, Any
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
+from collections import deque, OrderedDict
+import sys
 import time
 import threading
+import weakref
 import numpy as np
 from utils.logger import log
 
+try:
+    import cv2
+except ImportError:  # derived views fall back to NumPy
+    cv2 = None
+
+
+def get_client_rect(hwnd: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Screen-space client area of a window.
+    
+    Returns:
+        (x, y, w, h) or None if unavailable (non-Windows, invalid hwnd)
+    """
+    if not hwnd or sys.platform != 'win32':
+        return None
+    
+    try:
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        
+        rect = wintypes.RECT()
+        if not user32.GetClientRect(hwnd, ctypes.byref(rect)):
+            return None
+        pt = wintypes.POINT(0, 0)
+        user32.ClientToScreen(hwnd, ctypes.byref(pt))
+        return (pt.x, pt.y, rect.right, rect.bottom)
+    except Exception as e:
+        log(f"[CAPTURE] Client rect error hwnd={hwnd}: {e}")
+        return None
+
+
+def region_to_bgra_bytes(region: np.ndarray) -> bytes:
+    """Pack a BGR/BGRA region view into raw BGRA bytes (MSS .raw layout)"""
+    if region.ndim == 3 and region.shape[2] == 4:
+        return np.ascontiguousarray(region).tobytes()
+    
+    h, w = region.shape[:2]
+    out = np.empty((h, w, 4), dtype=np.uint8)
+    out[:, :, :3] = region
+    out[:, :, 3] = 255
+    return out.tobytes()
+
 
 @dataclass
 class Frame:
@@ -20,11 +66,382 @@ class Frame:
     height: int
     timestamp: float  # time.time()
     provider: str  # Which provider captured this frame
+    seq: int = 0  # Sequence number assigned by FrameRing (0 = not produced in background)
+    _derived: dict = field(default_factory=dict, init=False, repr=False, compare=False)
     
     @property
     def age(self) -> float:
         """Age of frame in seconds"""
         return time.time() - self.timestamp
+    
+    # ==================== DERIVED VIEWS ====================
+    # Computed on first use and memoized, so every consumer of the same
+    # frame pays each conversion once. Treat results as read-only.
+    # Two threads racing on a miss may both compute; the first result wins.
+    
+    def derived(self, key, build) -> np.ndarray:
+        """
+        Memoized view of this frame.
+        
+        Args:
+            key: Hashable cache key, e.g. ("motion", 320)
+            build: Callable(frame) -> np.ndarray, called on a miss
+        """
+        view = self._derived.get(key)
+        if view is None:
+            view = self._derived.setdefault(key, build(self))
+        return view
+    
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale (uint8, H x W)"""
+        return self.derived("gray", _build_gray)
+    
+    @property
+    def packed(self) -> np.ndarray:
+        """24-bit colors packed as 0xRRGGBB (uint32, H x W)"""
+        return self.derived("packed", _build_packed)
+    
+    @property
+    def int16(self) -> np.ndarray:
+        """BGR widened to int16, safe for signed per-channel differences"""
+        return self.derived("int16", lambda f: f.pixels[:, :, :3].astype(np.int16))
+    
+    def pyramid(self, level: int, gray: bool = False) -> np.ndarray:
+        """
+        Downscaled copy, halved `level` times (1 = 1/2, 2 = 1/4).
+        Level 0 is the full-size pixels (or gray).
+        """
+        base = "gray" if gray else "bgr"
+        if level <= 0:
+            return self.gray if gray else self.pixels
+        return self.derived(
+            ("pyr", base, level),
+            lambda f: _half(f.pyramid(level - 1, gray))
+        )
+    
+    @property
+    def derived_nbytes(self) -> int:
+        """Memory held by memoized derived views"""
+        return sum(v.nbytes for v in list(self._derived.values()))
+    
+    def release_derived(self) -> int:
+        """Drop all derived views. Returns bytes released."""
+        freed = self.derived_nbytes
+        self._derived.clear()
+        return freed
+
+
+def _build_gray(frame: Frame) -> np.ndarray:
+    pixels = frame.pixels
+    if pixels.ndim == 2:
+        return pixels
+    if cv2 is not None:
+        code = cv2.COLOR_BGRA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(pixels, code)
+    bgr = pixels[:, :, :3].astype(np.float32)
+    gray = bgr[:, :, 0] * 0.114 + bgr[:, :, 1] * 0.587 + bgr[:, :, 2] * 0.299
+    return np.clip(np.rint(gray), 0, 255).astype(np.uint8)
+
+
+def _build_packed(frame: Frame) -> np.ndarray:
+    pixels = frame.pixels
+    b = pixels[:, :, 0].astype(np.uint32)
+    g = pixels[:, :, 1].astype(np.uint32)
+    r = pixels[:, :, 2].astype(np.uint32)
+    return (r << 16) | (g << 8) | b
+
+
+def _half(img: np.ndarray) -> np.ndarray:
+    """One pyramid step down (Gaussian pyrDown, or 2x2 mean without cv2)"""
+    if cv2 is not None:
+        return cv2.pyrDown(img)
+    h, w = img.shape[0] // 2 * 2, img.shape[1] // 2 * 2
+    quad = img[:h, :w].astype(np.uint16)
+    summed = quad[0::2, 0::2] + quad[1::2, 0::2] + quad[0::2, 1::2] + quad[1::2, 1::2]
+    return ((summed + 2) // 4).astype(np.uint8)
+
+
+class FrameRing:
+    """
+    Small ring buffer of recent frames for one window.
+    
+    Every pushed frame gets a monotonically increasing sequence number so
+    consumers can block until a frame newer than the one they already
+    processed arrives, instead of sleeping and re-grabbing.
+    """
+    
+    def __init__(self, capacity: int = 4):
+        self._frames: deque = deque(maxlen=max(1, capacity))
+        self._seq = 0
+        self._cond = threading.Condition()
+    
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest frame (0 if empty)"""
+        return self._seq
+    
+    def push(self, frame: Frame) -> int:
+        """Append frame, assign its sequence number and wake waiters"""
+        with self._cond:
+            self._seq += 1
+            frame.seq = self._seq
+            self._frames.append(frame)
+            self._cond.notify_all()
+            return self._seq
+    
+    def latest(self) -> Optional[Frame]:
+        """Newest frame or None"""
+        with self._cond:
+            return self._frames[-1] if self._frames else None
+    
+    def wait_newer(self, seq: int, timeout: float) -> Optional[Frame]:
+        """
+        Block until a frame with sequence number > seq is available.
+        
+        Returns:
+            Newest frame, or None on timeout
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > seq, timeout=timeout):
+                return None
+            return self._frames[-1]
+    
+    def get_recent(self, max_age_ms: float) -> Optional[Frame]:
+        """Newest frame if it is at most max_age_ms old, else None"""
+        frame = self.latest()
+        if frame is not None and frame.age * 1000 <= max_age_ms:
+            return frame
+        return None
+    
+    def clear(self):
+        with self._cond:
+            self._frames.clear()
+
+
+class _InFlightCapture:
+    """A capture in progress for one hwnd, shared by concurrent requesters"""
+    
+    __slots__ = ("done", "frame")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.frame: Optional[Frame] = None
+
+
+class _CaptureProducer(threading.Thread):
+    """Background thread that keeps a FrameRing filled for one hwnd"""
+    
+    def __init__(self, manager: 'CaptureManager', hwnd: int,
+                 rect: Tuple[int, int, int, int], interval: float, ring: FrameRing):
+        super().__init__(name=f"CaptureProducer-{hwnd}", daemon=True)
+        self._manager = manager
+        self.hwnd = hwnd
+        self.rect = rect
+        self.interval = interval
+        self.ring = ring
+        self._stop_event = threading.Event()
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def run(self):
+        log(f"[CAPTURE] Producer started for hwnd={self.hwnd} ({self.interval * 1000:.0f}ms)")
+        while not self._stop_event.is_set():
+            tick_start = time.time()
+            x, y, w, h = self.rect
+            frame = self._manager._capture(x, y, w, h)
+            if frame:
+                self.ring.push(frame)
+                self._manager._store(self.hwnd, frame)
+            
+            remaining = self.interval - (time.time() - tick_start)
+            if remaining > 0:
+                self._stop_event.wait(remaining)
+        log(f"[CAPTURE] Producer stopped for hwnd={self.hwnd}")
+
+
+class _BatchCapturer(threading.Thread):
+    """Background thread that drives CaptureManager.capture_batch() every interval"""
+    
+    def __init__(self, manager: 'CaptureManager', interval: float):
+        super().__init__(name="CaptureBatch", daemon=True)
+        self._manager = manager
+        self.interval = interval
+        self._stop_event = threading.Event()
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def run(self):
+        log(f"[CAPTURE] Batch capture started ({self.interval * 1000:.0f}ms)")
+        while not self._stop_event.is_set():
+            tick_start = time.time()
+            try:
+                self._manager.capture_batch()
+            except Exception as e:
+                log(f"[CAPTURE] Batch tick error: {e}")
+            
+            remaining = self.interval - (time.time() - tick_start)
+            if remaining > 0:
+                self._stop_event.wait(remaining)
+        log(f"[CAPTURE] Batch capture stopped")
+
+
+def _size_bucket(w: int, h: int) -> str:
+    """Group grab sizes so latency is compared like-for-like"""
+    area = w * h
+    if area <= 320 * 240:
+        return "small"
+    if area <= 1280 * 720:
+        return "medium"
+    return "large"
+
+
+class ProviderStats:
+    """
+    Rolling grab latency and failure statistics for one provider,
+    kept per region-size bucket (see _size_bucket).
+    """
+    
+    WINDOW = 50  # latency samples kept per bucket
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.grabs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_probe = 0.0  # time.time() of last (re)probe grab
+        self._latencies: dict[str, deque] = {}  # bucket -> deque of ms
+        self._lock = threading.Lock()
+    
+    def record(self, bucket: str, latency_ms: float, ok: bool):
+        with self._lock:
+            self.grabs += 1
+            if ok:
+                self.consecutive_failures = 0
+                samples = self._latencies.get(bucket)
+                if samples is None:
+                    samples = self._latencies[bucket] = deque(maxlen=self.WINDOW)
+                samples.append(latency_ms)
+            else:
+                self.failures += 1
+                self.consecutive_failures += 1
+    
+    def sample_count(self, bucket: str) -> int:
+        samples = self._latencies.get(bucket)
+        return len(samples) if samples else 0
+    
+    def percentile(self, bucket: str, pct: float) -> Optional[float]:
+        """Latency percentile (ms) over the rolling window, None if no samples"""
+        with self._lock:
+            samples = self._latencies.get(bucket)
+            if not samples:
+                return None
+            ordered = sorted(samples)
+        idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[idx]
+    
+    def snapshot(self) -> dict:
+        buckets = {}
+        for bucket in list(self._latencies):
+            buckets[bucket] = {
+                "samples": self.sample_count(bucket),
+                "p50_ms": self.percentile(bucket, 50),
+                "p95_ms": self.percentile(bucket, 95),
+            }
+        return {
+            "grabs": self.grabs,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "buckets": buckets,
+        }
+
+
+class FramePool:
+    """
+    Reusable pixel buffers keyed by (height, width, channels).
+    
+    Providers copy each grab into a pooled buffer instead of allocating a
+    new full-size array. acquire() leases a free buffer: the returned
+    array and every view of it (Frame pixels, ring slots, cache entries,
+    crops) share one lease object, and a weakref finalizer puts the buffer
+    back on the free list when the last of them is gone. A frame still in
+    use is never overwritten.
+    """
+    
+    def __init__(self, max_per_shape: int = 16):
+        """
+        Args:
+            max_per_shape: Buffers kept per shape; beyond that, grabs fall
+                           back to plain (unpooled) allocations
+        """
+        self.max_per_shape = max_per_shape
+        self._free: dict = {}  # (h, w, c) -> [bytearray] not leased
+        self._owned: dict = {}  # (h, w, c) -> buffers created (free + leased)
+        # Reentrant: a finalizer can run (via gc) while acquire() holds it
+        self._lock = threading.RLock()
+        self.reused = 0
+        self.allocated = 0
+        self.unpooled = 0
+    
+    def acquire(self, h: int, w: int, channels: int = 3) -> np.ndarray:
+        """Free uint8 buffer of shape (h, w, channels); contents are undefined"""
+        key = (h, w, channels)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                raw = free.pop()
+                self.reused += 1
+            elif self._owned.get(key, 0) < self.max_per_shape:
+                raw = bytearray(h * w * channels)
+                self._owned[key] = self._owned.get(key, 0) + 1
+                self.allocated += 1
+            else:
+                self.unpooled += 1
+                return np.empty(key, dtype=np.uint8)
+        
+        # Views of the lease collapse their base onto it (its own base is a
+        # memoryview, not an ndarray), so it lives exactly as long as any
+        # view does
+        lease = np.frombuffer(raw, dtype=np.uint8)
+        weakref.finalize(lease, self._give_back, key, raw).atexit = False
+        return lease.reshape(key)
+    
+    def _give_back(self, key: Tuple[int, int, int], raw: bytearray):
+        with self._lock:
+            if key in self._owned:
+                self._free.setdefault(key, []).append(raw)
+    
+    def trim(self):
+        """Drop buffers not currently leased"""
+        with self._lock:
+            for key, free in list(self._free.items()):
+                self._owned[key] -= len(free)
+                del self._free[key]
+                if not self._owned[key]:
+                    del self._owned[key]
+    
+    def stats(self) -> dict:
+        with self._lock:
+            free = sum(len(f) for f in self._free.values())
+            return {
+                "shapes": len(self._owned),
+                "buffers": sum(self._owned.values()),
+                "leased": sum(self._owned.values()) - free,
+                "bytes": sum(n * key[0] * key[1] * key[2] for key, n in self._owned.items()),
+                "reused": self.reused,
+                "allocated": self.allocated,
+                "unpooled": self.unpooled,
+            }
+
+
+_frame_pool = FramePool()
+
+
+def get_frame_pool() -> FramePool:
+    """Buffer pool shared by the built-in providers"""
+    return _frame_pool
 
 
 class ICaptureProvider(ABC):
@@ -57,6 +474,7 @@ class BetterCamProvider(ICaptureProvider):
     def __init__(self):
         self._camera = None
         self._available = None
+        self._grab_lock = threading.Lock()  # camera is not thread-safe
     
     @property
     def name(self) -> str:
@@ -87,7 +505,8 @@ class BetterCamProvider(ICaptureProvider):
         try:
             # BetterCam region format: (left, top, right, bottom)
             region = (x, y, x + w, y + h)
-            img = self._camera.grab(region=region)
+            with self._grab_lock:
+                img = self._camera.grab(region=region)
             
             if img is None:
                 return None
@@ -119,9 +538,11 @@ class BetterCamProvider(ICaptureProvider):
 class DXCamProvider(ICaptureProvider):
     """DXCam capture provider (fallback)"""
     
-    def __init__(self):
+    def __init__(self, pool: FramePool = None):
+        self._pool = pool or get_frame_pool()
         self._camera = None
         self._available = None
+        self._grab_lock = threading.Lock()  # camera is not thread-safe
     
     @property
     def name(self) -> str:
@@ -152,19 +573,25 @@ class DXCamProvider(ICaptureProvider):
         try:
             # DXCam region format: (left, top, right, bottom)
             region = (x, y, x + w, y + h)
-            img = self._camera.grab(region=region)
+            with self._grab_lock:
+                img = self._camera.grab(region=region)
             
             if img is None:
                 return None
             
-            # DXCam returns RGB, convert to BGR for consistency
-            if len(img.shape) == 3 and img.shape[2] == 3:
-                img = img[:, :, ::-1].copy()
-            
             # Ensure correct size
             if img.shape[1] != w or img.shape[0] != h:
                 img = img[:h, :w]
             
+            # DXCam returns RGB, convert to BGR into a pooled buffer
+            if len(img.shape) == 3 and img.shape[2] == 3:
+                buf = self._pool.acquire(img.shape[0], img.shape[1], 3)
+                if cv2 is not None:
+                    cv2.cvtColor(np.ascontiguousarray(img), cv2.COLOR_RGB2BGR, dst=buf)
+                else:
+                    np.copyto(buf, img[:, :, ::-1])
+                img = buf
+            
             return Frame(
                 pixels=img,
                 width=img.shape[1],
@@ -188,7 +615,8 @@ class DXCamProvider(ICaptureProvider):
 class MSSProvider(ICaptureProvider):
     """MSS capture provider (final fallback, always works)"""
     
-    def __init__(self):
+    def __init__(self, pool: FramePool = None):
+        self._pool = pool or get_frame_pool()
         self._sct = None
         self._available = None
     
@@ -222,12 +650,14 @@ class MSSProvider(ICaptureProvider):
             monitor = {"left": x, "top": y, "width": w, "height": h}
             sct_img = self._sct.grab(monitor)
             
-            # Convert to numpy array (BGRA)
-            img = np.array(sct_img)
-            
-            # Convert BGRA to BGR
-            if img.shape[2] == 4:
-                img = img[:, :, :3]
+            # Zero-copy BGRA view over mss's buffer, then BGR into a pooled buffer
+            bgra = np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(
+                sct_img.height, sct_img.width, 4)
+            img = self._pool.acquire(sct_img.height, sct_img.width, 3)
+            if cv2 is not None:
+                cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=img)
+            else:
+                np.copyto(img, bgra[:, :, :3])
             
             return Frame(
                 pixels=img,
@@ -249,6 +679,90 @@ class MSSProvider(ICaptureProvider):
             self._sct = None
 
 
+# screencap raw pixel formats (android.graphics.PixelFormat)
+_SCREENCAP_RGBA_8888 = 1
+_SCREENCAP_RGBX_8888 = 2
+
+
+def parse_raw_screencap(data: bytes) -> Optional[np.ndarray]:
+    """
+    Parse `adb exec-out screencap` (no -p) output into an RGBA array.
+    
+    Layout: little-endian uint32 width, height, format, [colorspace on
+    Android 9+], followed by width*height*4 bytes of RGBA/RGBX pixels.
+    
+    Returns:
+        (h, w, 4) uint8 RGBA view over data, or None if unsupported
+    """
+    if not data or len(data) < 12:
+        return None
+    
+    w, h, fmt = np.frombuffer(data, dtype='<u4', count=3)
+    w, h, fmt = int(w), int(h), int(fmt)
+    if fmt not in (_SCREENCAP_RGBA_8888, _SCREENCAP_RGBX_8888):
+        log(f"[CAPTURE] Unsupported screencap pixel format: {fmt}")
+        return None
+    
+    payload = w * h * 4
+    header = len(data) - payload
+    if header not in (12, 16):
+        log(f"[CAPTURE] Unexpected screencap size: {len(data)} bytes for {w}x{h}")
+        return None
+    
+    return np.frombuffer(data, dtype=np.uint8, count=payload, offset=header).reshape(h, w, 4)
+
+
+class ADBCaptureProvider:
+    """
+    ADB raw-framebuffer capture, keyed by device serial instead of hwnd.
+    
+    Uses `screencap` without -p: the device skips PNG encoding and the
+    output is parsed straight into NumPy (no Pillow decode / convert).
+    Plugged into CaptureManager via get_adb_frame / get_adb_region.
+    """
+    
+    def __init__(self, adb_path: str = "adb", timeout: float = 5.0):
+        self.adb_path = adb_path
+        self.timeout = timeout
+    
+    @property
+    def name(self) -> str:
+        return "ADB"
+    
+    def grab_serial(self, serial: str) -> Optional[Frame]:
+        """Capture the full device screen as a BGR Frame"""
+        import subprocess
+        from utils.subprocess_helper import run_hidden
+        
+        try:
+            p = run_hidden(
+                [self.adb_path, "-s", serial, "exec-out", "screencap"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout
+            )
+            if p.returncode != 0 or not p.stdout:
+                log(f"[CAPTURE] ADB screencap failed ({serial}): {p.stderr.decode(errors='ignore')}")
+                return None
+            
+            rgba = parse_raw_screencap(p.stdout)
+            if rgba is None:
+                return None
+            
+            # RGBA → BGR as a view (no copy)
+            bgr = rgba[:, :, 2::-1]
+            return Frame(
+                pixels=bgr,
+                width=bgr.shape[1],
+                height=bgr.shape[0],
+                timestamp=time.time(),
+                provider=self.name
+            )
+        except Exception as e:
+            log(f"[CAPTURE] ADB capture error ({serial}): {e}")
+            return None
+
+
 class CaptureManager:
     """
     Manages capture providers with fallback chain and per-worker cache.
@@ -261,27 +775,90 @@ class CaptureManager:
     Cache Policy (LOCKED):
     - Default TTL: 1.0s for most commands
     - Wait polling TTL: 0.1s or force_refresh=True
+    
+    Background capture (opt-in):
+    - start_producer(hwnd, ...) spawns a thread that grabs the window every
+      PRODUCER_INTERVAL and fills a FrameRing with sequence-numbered frames
+    - Consumers use get_latest / wait_for_frame / get_recent, and get_frame
+      is served from the ring instead of grabbing in the caller's thread
+    
+    Adaptive selection:
+    - Every grab is timed; per provider and region-size bucket the manager
+      keeps rolling p95 latency and failure counts (see stats())
+    - Each grab uses the provider with the best recent p95 for its size;
+      providers that keep failing are demoted, and demoted/slower providers
+      are re-probed every REPROBE_INTERVAL so a recovered backend can win back
+    
+    ADB capture:
+    - get_adb_frame / get_adb_region capture by device serial through
+      ADBCaptureProvider (raw screencap), cached per serial with ADB_TTL
+    
+    Batch capture (opt-in, for tiled emulators on one monitor):
+    - enable_batch_capture() grabs the union bounding box of all registered
+      client rects once per tick and publishes per-window views into the
+      cache, so N windows cost 1 provider call per tick instead of N
     """
     
     DEFAULT_TTL = 1.0  # seconds
     WAIT_TTL = 0.1  # seconds for Wait polling
+    PRODUCER_INTERVAL = 0.05  # seconds between background grabs (20 FPS)
+    RING_SIZE = 4  # frames kept per hwnd in background mode
+    CAPTURE_WAIT_TIMEOUT = 2.0  # seconds a request waits on another thread's capture
+    REPROBE_INTERVAL = 30.0  # seconds between probes of non-selected providers
+    MIN_SAMPLES = 5  # latency samples needed before a provider competes on p95
+    DEMOTE_AFTER_FAILURES = 3  # consecutive failures before a provider is demoted
+    ADB_TTL = 0.15  # seconds a per-serial ADB frame is shared between actions
+    CACHE_BUDGET_BYTES = 256 * 1024 * 1024  # frames + derived views kept in the cache
     
-    def __init__(self):
+    def __init__(self, providers: Optional[list] = None, cache_budget: int = None):
+        """
+        Args:
+            providers: Explicit provider chain (e.g. [ReplayCaptureProvider(...)]).
+                       None = BetterCam → DXCam → MSS.
+            cache_budget: Byte budget of the frame cache (default: CACHE_BUDGET_BYTES)
+        """
         self._providers: list[ICaptureProvider] = []
         self._active_provider: Optional[ICaptureProvider] = None
-        self._cache: dict[int, Frame] = {}  # hwnd -> Frame
-        self._cache_lock = threading.Lock()
+        self._provider_stats: dict[str, ProviderStats] = {}  # provider name -> stats
+        self._preferred: dict[str, ICaptureProvider] = {}  # size bucket -> fastest provider
+        self._cache: OrderedDict = OrderedDict()  # hwnd -> Frame, least recently used first
+        self.cache_budget = cache_budget if cache_budget is not None else self.CACHE_BUDGET_BYTES
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._rects: dict[int, Tuple[int, int, int, int]] = {}  # hwnd -> client rect of cached frame
+        self._cache_lock = threading.Lock()  # guards dicts only, never held across a grab
+        self._inflight: dict[int, _InFlightCapture] = {}  # hwnd -> capture in progress
+        
+        # Background producers (hwnd -> producer)
+        self._producers: dict[int, _CaptureProducer] = {}
+        self._producers_lock = threading.Lock()
+    
+        # Batch capture (one union grab fanned out to all registered windows)
+        self._batch: Optional[_BatchCapturer] = None
+        self._batch_cond = threading.Condition()
+        self._batch_tick = 0
+        self._batch_grabs = 0
+        self._batch_missed: dict[int, int] = {}  # hwnd -> ticks without a published frame
+        self._batch_windows: set = set()  # hwnds registered via register_window
+        
+        # ADB raw screencap (cache key: "adb:<serial>")
+        self._adb_provider = ADBCaptureProvider()
         
-        self._init_providers()
+        # Callbacks (hwnd, frame) for every newly cached frame (e.g. FrameRecorder)
+        self._listeners: list = []
+        
+        self._init_providers(providers)
     
-    def _init_providers(self):
+    def _init_providers(self, providers: Optional[list] = None):
         """Initialize providers in fallback order"""
         # Order matters! BetterCam → DXCam → MSS
-        self._providers = [
+        self._providers = list(providers) if providers else [
             BetterCamProvider(),
             DXCamProvider(),
             MSSProvider()
         ]
+        self._provider_stats = {p.name: ProviderStats(p.name) for p in self._providers}
         
         # Find first available provider
         for provider in self._providers:
@@ -310,68 +887,652 @@ class CaptureManager:
         if ttl is None:
             ttl = self.DEFAULT_TTL
         
+        # Background mode: never grab in the caller's thread
+        producer = self._producers.get(hwnd)
+        if producer is not None:
+            frame = self._get_from_producer(producer, force_refresh, ttl)
+            if frame:
+                return frame
+        
+        # Batch mode: frames arrive from the shared union grab
+        if (self._batch is not None and hwnd in self._batch_windows
+                and self._rects.get(hwnd) == (x, y, w, h)):
+            frame = self._get_from_batch(hwnd, force_refresh, ttl)
+            if frame:
+                return frame
+        
+        with self._cache_lock:
+            # Window moved/resized - cached frame no longer matches
+            if self._rects.get(hwnd) != (x, y, w, h):
+                self._rects[hwnd] = (x, y, w, h)
+                force_refresh = True
+        
+        return self._cached_capture(hwnd, force_refresh, ttl,
+                                    lambda: self._capture(x, y, w, h))
+    
+    def _cached_capture(self, key, force_refresh: bool, ttl: float, capture_fn) -> Optional[Frame]:
+        """
+        Cache lookup + single-flight capture for one cache key (hwnd or ADB serial).
+        
+        _cache_lock only guards dict access, never a capture: cache hits
+        never wait behind a slow grab for this or any other key.
+        """
         with self._cache_lock:
             # Check cache
-            if not force_refresh and hwnd in self._cache:
-                cached = self._cache[hwnd]
-                if cached.age < ttl:
-                    return cached
+            cached = self._cache_lookup(key)
+            if not force_refresh and cached is not None and cached.age < ttl:
+                self._cache_hits += 1
+                return cached
             
-            # Capture new frame
-            frame = self._capture(x, y, w, h)
+            # Single-flight: join an in-progress capture for this key
+            flight = self._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                # Only the capturing request is a miss; followers share its grab
+                self._cache_misses += 1
+                flight = _InFlightCapture()
+                self._inflight[key] = flight
             
+        if is_leader:
+            frame = None
+            try:
+                frame = capture_fn()
+            finally:
+                with self._cache_lock:
+                    self._inflight.pop(key, None)
+                flight.frame = frame
+                flight.done.set()
             if frame:
-                self._cache[hwnd] = frame
-                return frame
+                self._publish({key: frame})
+        else:
+            flight.done.wait(timeout=self.CAPTURE_WAIT_TIMEOUT)
+            frame = flight.frame
             
-            # Return stale cache if capture failed
-            if hwnd in self._cache:
-                log(f"[CAPTURE] Using stale cache for hwnd={hwnd}")
-                return self._cache[hwnd]
+        if frame:
+            return frame
             
+        # Return stale cache if capture failed
+        if cached is not None:
+            log(f"[CAPTURE] Using stale cache for {key}")
+            return cached
+        
+        return None
+    
+    def _get_from_producer(self, producer: _CaptureProducer,
+                           force_refresh: bool, ttl: float) -> Optional[Frame]:
+        """Serve get_frame from a running producer's ring"""
+        ring = producer.ring
+        if force_refresh:
+            # Fresh frame = next one the producer publishes
+            return ring.wait_newer(ring.last_seq, timeout=producer.interval * 2 + self.WAIT_TTL)
+        
+        latest = ring.latest()
+        if latest is not None and latest.age < ttl:
+            return latest
+        return ring.wait_newer(ring.last_seq, timeout=producer.interval * 2 + self.WAIT_TTL)
+    
+    def _get_from_batch(self, hwnd: int, force_refresh: bool, ttl: float) -> Optional[Frame]:
+        """Serve get_frame from the batch cache, waiting for the next tick if needed"""
+        batch = self._batch
+        if batch is None:
             return None
     
+        with self._batch_cond:
+            with self._cache_lock:
+                cached = self._cache_lookup(hwnd)
+                if not force_refresh and cached is not None and cached.age < ttl:
+                    self._cache_hits += 1
+                    return cached
+                self._cache_misses += 1
+            
+            tick = self._batch_tick
+            if not self._batch_cond.wait_for(lambda: self._batch_tick > tick,
+                                             timeout=batch.interval * 2 + self.WAIT_TTL):
+                return None
+        
+        return self._cache.get(hwnd)
+    
+    def _cache_lookup(self, key) -> Optional[Frame]:
+        """Cached frame for key, marked most recently used (hold _cache_lock)"""
+        frame = self._cache.get(key)
+        if frame is not None:
+            self._cache.move_to_end(key)
+        return frame
+    
+    def _evict_locked(self, keep) -> int:
+        """
+        Drop least recently used frames until the cache fits cache_budget
+        (hold _cache_lock). Keys in keep (just published) are never evicted.
+        
+        Bytes are pixels.nbytes + derived views; batch frames are views of
+        one union grab, so their shared base is counted per window.
+        """
+        sizes = {key: frame.pixels.nbytes + frame.derived_nbytes
+                 for key, frame in self._cache.items()}
+        total = sum(sizes.values())
+        evicted = 0
+        for key in list(self._cache):
+            if total <= self.cache_budget:
+                break
+            if key in keep:
+                continue
+            self._cache.pop(key).release_derived()
+            total -= sizes[key]
+            evicted += 1
+        
+        if evicted:
+            self._cache_evictions += evicted
+            log(f"[CAPTURE] Evicted {evicted} cached frame(s), {total / 1e6:.1f} MB held")
+        return evicted
+    
+    def _store(self, hwnd: int, frame: Frame):
+        """Publish frame into the per-hwnd cache"""
+        self._publish({hwnd: frame})
+    
+    def _publish(self, frames: dict, expected_rects: dict = None) -> int:
+        """
+        Put newly captured frames into the cache and notify listeners.
+        
+        Args:
+            frames: hwnd -> Frame
+            expected_rects: If given, skip hwnds whose rect changed meanwhile
+        
+        Returns:
+            Number of frames published
+        """
+        published = {}
+        with self._cache_lock:
+            for hwnd, frame in frames.items():
+                if expected_rects is not None and self._rects.get(hwnd) != expected_rects.get(hwnd):
+                    continue
+                old = self._cache.get(hwnd)
+                if old is not None and old is not frame:
+                    old.release_derived()
+                self._cache[hwnd] = frame
+                self._cache.move_to_end(hwnd)
+                published[hwnd] = frame
+            self._evict_locked(published)
+        
+        for listener in list(self._listeners):
+            for hwnd, frame in published.items():
+                try:
+                    listener(hwnd, frame)
+                except Exception as e:
+                    log(f"[CAPTURE] Frame listener error: {e}")
+        
+        return len(published)
+    
+    def add_listener(self, callback):
+        """Register callback(hwnd, frame) invoked for every newly cached frame"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def register_window(self, hwnd: int, x: int, y: int, w: int, h: int):
+        """
+        Remember client rect for hwnd so region lookups need no Win32 query,
+        and include the window in batched capture.
+        """
+        with self._cache_lock:
+            self._batch_windows.add(hwnd)
+            if self._rects.get(hwnd) != (x, y, w, h):
+                self._rects[hwnd] = (x, y, w, h)
+                frame = self._cache.pop(hwnd, None)
+                if frame is not None:
+                    frame.release_derived()
+    
+    def get_adb_frame(self, serial: str, max_age_ms: float = None,
+                      force_refresh: bool = False) -> Optional[Frame]:
+        """
+        Full device frame for an ADB serial, shared by all actions on it.
+        
+        Args:
+            serial: ADB device serial (e.g. "emulator-5554")
+            max_age_ms: Maximum acceptable frame age (default: ADB_TTL)
+            force_refresh: Skip cache
+        """
+        if max_age_ms is None:
+            max_age_ms = self.ADB_TTL * 1000
+        return self._cached_capture(f"adb:{serial}", force_refresh, max_age_ms / 1000.0,
+                                    lambda: self._adb_provider.grab_serial(serial))
+    
+    def get_adb_region(self, serial: str, x1: int, y1: int, x2: int, y2: int,
+                       max_age_ms: float = None) -> Optional[np.ndarray]:
+        """Region (device coordinates) of the cached ADB frame as a NumPy view"""
+        frame = self.get_adb_frame(serial, max_age_ms)
+        if frame is None:
+            return None
+        
+        x1 = max(0, min(x1, frame.width))
+        x2 = max(0, min(x2, frame.width))
+        y1 = max(0, min(y1, frame.height))
+        y2 = max(0, min(y2, frame.height))
+        if x1 >= x2 or y1 >= y2:
+            return None
+        
+        return frame.pixels[y1:y2, x1:x2]
+    
+    def set_adb_path(self, adb_path: str):
+        """Use a specific adb executable (e.g. ADBManager.adb_path)"""
+        self._adb_provider.adb_path = adb_path
+    
+    def window_rect(self, hwnd: int) -> Optional[Tuple[int, int, int, int]]:
+        """Live client rect from Win32, else the last registered rect (replay/off-Windows)"""
+        return get_client_rect(hwnd) or self._rects.get(hwnd)
+    
+    def get_region(self, hwnd: int, x1: int, y1: int, x2: int, y2: int,
+                   max_age_ms: float = None) -> Optional[np.ndarray]:
+        """
+        Sub-region of the cached full client-area frame as a NumPy view.
+        
+        One grab per tick serves every region check for a window: the
+        region is sliced out of the cached frame without copying, and a
+        real grab only happens when the cached frame is older than max_age_ms.
+        
+        Args:
+            hwnd: Window handle (cache key)
+            x1, y1, x2, y2: Region in client coordinates
+            max_age_ms: Maximum acceptable frame age (default: WAIT_TTL)
+        
+        Returns:
+            View into Frame.pixels (do not modify) or None
+        """
+        if max_age_ms is None:
+            max_age_ms = self.WAIT_TTL * 1000
+        
+        rect = self.window_rect(hwnd)
+        if rect is None:
+            log(f"[CAPTURE] No client rect for hwnd={hwnd}")
+            return None
+        
+        frame = self.get_frame(hwnd, *rect, ttl=max_age_ms / 1000.0)
+        if frame is None:
+            return None
+        
+        # Clip to frame bounds
+        x1 = max(0, min(x1, frame.width))
+        x2 = max(0, min(x2, frame.width))
+        y1 = max(0, min(y1, frame.height))
+        y2 = max(0, min(y2, frame.height))
+        if x1 >= x2 or y1 >= y2:
+            return None
+        
+        return frame.pixels[y1:y2, x1:x2]
+    
     def _capture(self, x: int, y: int, w: int, h: int) -> Optional[Frame]:
-        """Capture using active provider with fallback"""
-        if self._active_provider:
-            frame = self._active_provider.grab(x, y, w, h)
+        """Capture using the selected provider with fallback"""
+        bucket = _size_bucket(w, h)
+        selected = self._select_provider(bucket)
+        
+        if selected:
+            frame = self._timed_grab(selected, bucket, x, y, w, h)
             if frame:
                 return frame
         
         # Fallback chain
         for provider in self._providers:
-            if provider == self._active_provider:
+            if provider == selected:
                 continue
             
             if provider.is_available():
-                frame = provider.grab(x, y, w, h)
+                frame = self._timed_grab(provider, bucket, x, y, w, h)
                 if frame:
                     # Switch to this provider
                     log(f"[CAPTURE] Switching to fallback: {provider.name}")
                     self._active_provider = provider
+                    self._preferred[bucket] = provider
                     return frame
         
         return None
     
+    def _timed_grab(self, provider: ICaptureProvider, bucket: str,
+                    x: int, y: int, w: int, h: int) -> Optional[Frame]:
+        """Grab and record latency/failure for the provider"""
+        start = time.perf_counter()
+        frame = provider.grab(x, y, w, h)
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        stats = self._provider_stats.get(provider.name)
+        if stats is not None:
+            stats.record(bucket, latency_ms, frame is not None)
+        return frame
+    
+    def _select_provider(self, bucket: str) -> Optional[ICaptureProvider]:
+        """
+        Pick the provider for one grab of the given size bucket:
+        1. Periodically re-probe a provider that is not currently preferred
+        2. Otherwise the provider with the lowest recent p95 latency
+           (needs MIN_SAMPLES, skips providers with repeated failures)
+        3. Otherwise the current preferred/active provider (fallback order)
+        """
+        current = self._preferred.get(bucket) or self._active_provider
+        now = time.time()
+        
+        candidates = [p for p in self._providers if p.is_available()]
+        if not candidates:
+            return current
+        
+        # 1. Re-probe demoted / slower providers
+        for provider in candidates:
+            if provider is current:
+                continue
+            stats = self._provider_stats[provider.name]
+            if now - stats.last_probe >= self.REPROBE_INTERVAL:
+                stats.last_probe = now
+                if stats.grabs:
+                    log(f"[CAPTURE] Re-probing {provider.name} ({bucket})")
+                return provider
+        
+        # 2. Best recent p95
+        best, best_p95 = None, None
+        for provider in candidates:
+            stats = self._provider_stats[provider.name]
+            if stats.consecutive_failures >= self.DEMOTE_AFTER_FAILURES:
+                continue
+            if stats.sample_count(bucket) < self.MIN_SAMPLES:
+                continue
+            p95 = stats.percentile(bucket, 95)
+            if best_p95 is None or p95 < best_p95:
+                best, best_p95 = provider, p95
+        
+        if best is None:
+            return current
+        
+        if best is not current:
+            log(f"[CAPTURE] Selecting {best.name} for {bucket} grabs (p95={best_p95:.1f}ms)")
+            self._preferred[bucket] = best
+            self._active_provider = best
+        return best
+    
+    def stats(self) -> dict:
+        """
+        Per-provider capture statistics.
+        
+        Returns:
+            {"active": name, "preferred": {bucket: name},
+             "providers": {name: {"available", "grabs", "failures",
+                                  "consecutive_failures", "buckets": {bucket: {samples, p50_ms, p95_ms}}}},
+             "derived_bytes": memory held by derived views of cached frames,
+             "pool": FramePool.stats(), "cache": cache_stats()}
+        """
+        providers = {}
+        for provider in self._providers:
+            snapshot = self._provider_stats[provider.name].snapshot()
+            snapshot["available"] = getattr(provider, "_available", None)
+            providers[provider.name] = snapshot
+        
+        return {
+            "active": self.active_provider_name,
+            "preferred": {bucket: p.name for bucket, p in self._preferred.items()},
+            "providers": providers,
+            "derived_bytes": self.derived_bytes(),
+            "pool": get_frame_pool().stats(),
+            "cache": self.cache_stats(),
+        }
+    
+    def cache_stats(self) -> dict:
+        """
+        Frame cache counters.
+        
+        Returns:
+            {"entries", "bytes", "budget", "hits", "misses", "evictions"}
+        """
+        with self._cache_lock:
+            frames = list(self._cache.values())
+            counters = {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "evictions": self._cache_evictions,
+            }
+        return {
+            "entries": len(frames),
+            "bytes": sum(f.pixels.nbytes + f.derived_nbytes for f in frames),
+            "budget": self.cache_budget,
+            **counters,
+        }
+    
+    def derived_bytes(self) -> int:
+        """Memory held by derived views (gray, pyramid, ...) of cached frames"""
+        with self._cache_lock:
+            frames = list(self._cache.values())
+        return sum(frame.derived_nbytes for frame in frames)
+    
     def get_frame_for_wait(self, hwnd: int, x: int, y: int, w: int, h: int) -> Optional[Frame]:
         """Get fresh frame for Wait polling (short TTL or force refresh)"""
         return self.get_frame(hwnd, x, y, w, h, force_refresh=True)
     
+    # ==================== BACKGROUND CAPTURE ====================
+    def start_producer(self, hwnd: int, x: int, y: int, w: int, h: int,
+                       interval: float = None) -> FrameRing:
+        """
+        Start (or retarget) a background producer for hwnd.
+        
+        Args:
+            hwnd: Window handle (cache key)
+            x, y, w, h: Screen coordinates of client area
+            interval: Seconds between grabs (default: PRODUCER_INTERVAL)
+        
+        Returns:
+            FrameRing filled by the producer
+        """
+        if interval is None:
+            interval = self.PRODUCER_INTERVAL
+        
+        with self._producers_lock:
+            producer = self._producers.get(hwnd)
+            if producer is not None and producer.is_alive():
+                # Window moved/resized or cadence changed - retarget in place
+                producer.rect = (x, y, w, h)
+                producer.interval = interval
+                return producer.ring
+            
+            ring = FrameRing(self.RING_SIZE)
+            producer = _CaptureProducer(self, hwnd, (x, y, w, h), interval, ring)
+            self._producers[hwnd] = producer
+            producer.start()
+            return ring
+    
+    def stop_producer(self, hwnd: int = None):
+        """Stop background producer for specific hwnd or all"""
+        with self._producers_lock:
+            if hwnd is not None:
+                producers = [self._producers.pop(hwnd)] if hwnd in self._producers else []
+            else:
+                producers = list(self._producers.values())
+                self._producers.clear()
+        
+        for producer in producers:
+            producer.stop()
+        for producer in producers:
+            if producer is not threading.current_thread():
+                producer.join(timeout=1.0)
+    
+    def has_producer(self, hwnd: int) -> bool:
+        return hwnd in self._producers
+    
+    def get_latest(self, hwnd: int) -> Optional[Frame]:
+        """Newest frame for hwnd (from producer ring or cache), no capture"""
+        producer = self._producers.get(hwnd)
+        if producer is not None:
+            frame = producer.ring.latest()
+            if frame:
+                return frame
+        with self._cache_lock:
+            return self._cache.get(hwnd)
+    
+    def wait_for_frame(self, hwnd: int, after_seq: int, timeout: float) -> Optional[Frame]:
+        """
+        Block until a frame newer than after_seq is produced for hwnd.
+        
+        Requires a running producer (see start_producer).
+        
+        Returns:
+            Frame with seq > after_seq, or None on timeout / no producer
+        """
+        producer = self._producers.get(hwnd)
+        if producer is None:
+            return None
+        return producer.ring.wait_newer(after_seq, timeout)
+    
+    def get_recent(self, hwnd: int, max_age_ms: float) -> Optional[Frame]:
+        """Newest frame for hwnd if it is at most max_age_ms old, no capture"""
+        frame = self.get_latest(hwnd)
+        if frame is not None and frame.age * 1000 <= max_age_ms:
+            return frame
+        return None
+    
+    # ==================== BATCH CAPTURE ====================
+    def enable_batch_capture(self, interval: float = None):
+        """
+        Start batched capture: one provider grab per tick covering the union
+        of all registered client rects (see register_window / get_frame).
+        """
+        if interval is None:
+            interval = self.PRODUCER_INTERVAL
+        
+        if self._batch is not None and self._batch.is_alive():
+            self._batch.interval = interval
+            return
+        
+        self._batch = _BatchCapturer(self, interval)
+        self._batch.start()
+    
+    def disable_batch_capture(self):
+        """Stop batched capture; get_frame falls back to per-window grabs"""
+        batch = self._batch
+        self._batch = None
+        if batch is not None:
+            batch.stop()
+            if batch is not threading.current_thread():
+                batch.join(timeout=1.0)
+        
+        # Release anyone waiting for a tick that will not come
+        with self._batch_cond:
+            self._batch_cond.notify_all()
+    
+    @property
+    def batch_enabled(self) -> bool:
+        return self._batch is not None
+    
+    def capture_batch(self, hwnds=None) -> int:
+        """
+        Perform one batched tick: grab the union bounding box of the batch
+        windows once and publish a per-window Frame view.
+        
+        Args:
+            hwnds: Windows to capture (default: all registered via
+                   register_window; rects merely seen by get_frame never
+                   widen the union)
+        
+        Returns:
+            Number of windows that received a fresh frame
+        """
+        with self._cache_lock:
+            members = self._batch_windows if hwnds is None else hwnds
+            rects = {hwnd: self._rects[hwnd] for hwnd in members
+                     if hwnd in self._rects and self._rects[hwnd][2] > 0 and self._rects[hwnd][3] > 0}
+        
+        published = 0
+        if rects:
+            left = min(r[0] for r in rects.values())
+            top = min(r[1] for r in rects.values())
+            right = max(r[0] + r[2] for r in rects.values())
+            bottom = max(r[1] + r[3] for r in rects.values())
+            
+            union = self._capture(left, top, right - left, bottom - top)
+            self._batch_grabs += 1
+            
+            frames = {}
+            for hwnd, (x, y, w, h) in rects.items():
+                view = None
+                if union is not None:
+                    ox, oy = x - left, y - top
+                    view = union.pixels[oy:oy + h, ox:ox + w]
+                
+                if view is None or view.shape[0] != h or view.shape[1] != w:
+                    # Grab failed or came back clipped - this window goes stale
+                    self._batch_missed[hwnd] = self._batch_missed.get(hwnd, 0) + 1
+                    continue
+                
+                frames[hwnd] = Frame(
+                    pixels=view,
+                    width=w,
+                    height=h,
+                    timestamp=union.timestamp,
+                    provider=f"{union.provider}/batch"
+                )
+                self._batch_missed[hwnd] = 0
+            
+            # Skip windows that moved while we were grabbing
+            published = self._publish(frames, expected_rects=rects)
+        
+        with self._batch_cond:
+            self._batch_tick += 1
+            self._batch_cond.notify_all()
+        
+        return published
+    
+    def batch_stats(self) -> dict:
+        """
+        Batch capture counters and per-window staleness.
+        
+        Returns:
+            {"ticks", "provider_calls", "windows": {hwnd: {"age_ms", "missed_ticks"}}}
+        """
+        with self._cache_lock:
+            windows = {}
+            for hwnd in self._batch_windows:
+                frame = self._cache.get(hwnd)
+                windows[hwnd] = {
+                    "age_ms": frame.age * 1000 if frame else None,
+                    "missed_ticks": self._batch_missed.get(hwnd, 0)
+                }
+        
+        return {
+            "ticks": self._batch_tick,
+            "provider_calls": self._batch_grabs,
+            "windows": windows
+        }
+    
+    def invalidate(self, hwnd: int):
+        """
+        Forget everything held for a window that closed or was reassigned:
+        background producer, cached frame, client rect, batch counters.
+        """
+        self.stop_producer(hwnd)
+        self.clear_cache(hwnd)
+        self._batch_missed.pop(hwnd, None)
+        log(f"[CAPTURE] Invalidated hwnd={hwnd}")
+    
     def clear_cache(self, hwnd: int = None):
         """Clear cache for specific hwnd or all"""
         with self._cache_lock:
             if hwnd:
-                self._cache.pop(hwnd, None)
+                frame = self._cache.pop(hwnd, None)
+                if frame is not None:
+                    frame.release_derived()
+                self._rects.pop(hwnd, None)
+                self._batch_windows.discard(hwnd)
             else:
+                for frame in self._cache.values():
+                    frame.release_derived()
                 self._cache.clear()
+                self._rects.clear()
+                self._batch_windows.clear()
     
     def release(self):
         """Release all providers"""
+        self.stop_producer()
+        self.disable_batch_capture()
         for provider in self._providers:
             provider.release()
         self._providers.clear()
         self._active_provider = None
         self._cache.clear()
+        get_frame_pool().trim()
     
     @property
     def active_provider_name(self) -> str:
@@ -388,3 +1549,14 @@ def get_capture_manager() -> CaptureManager:
     if _capture_manager is None:
         _capture_manager = CaptureManager()
     return _capture_manager
+
+
+def set_capture_manager(manager: Optional[CaptureManager]):
+    """
+    Replace global capture manager (e.g. one built on ReplayCaptureProvider).
+    The previous manager is released.
+    """
+    global _capture_manager
+    if _capture_manager is not None and _capture_manager is not manager:
+        _capture_manager.release()
+    _capture_manager = manager
@@ -0,0 +1,290 @@
+"""
+Replay capture provider + frame recorder
+Deterministic, emulator-free input for the vision pipeline (FindImage, Wait*, MotionDetector)
+
+On-disk format (one recording = two files sharing a base path):
+- <base>.frames : raw BGR uint8 frames, back to back, each height*width*3 bytes
+- <base>.json   : index {"version", "width", "height", "channels", "origin", "timestamps"}
+
+Frames are read through a NumPy memmap, so replay only touches the pages it uses.
+"""
+
+from typing import Optional, Tuple
+import bisect
+import json
+import os
+import threading
+import time
+import numpy as np
+
+from core.capture import ICaptureProvider, CaptureManager, Frame
+from utils.logger import log
+
+
+FORMAT_VERSION = 1
+FRAMES_EXT = ".frames"
+INDEX_EXT = ".json"
+
+
+def _paths(base_path: str) -> Tuple[str, str]:
+    """Strip a known extension and return (frames_path, index_path)"""
+    root, ext = os.path.splitext(base_path)
+    if ext not in (FRAMES_EXT, INDEX_EXT):
+        root = base_path
+    return root + FRAMES_EXT, root + INDEX_EXT
+
+
+class FrameRecorder:
+    """
+    Dump live Frames into the replay format.
+    
+    Usage:
+        recorder = FrameRecorder("recordings/login", hwnd=worker.hwnd)
+        recorder.attach(get_capture_manager())
+        ...  # run macro
+        recorder.close()
+    
+    Only frames with the size of the first recorded frame are kept;
+    frames of other sizes (window resized mid-recording) are skipped.
+    """
+    
+    def __init__(self, base_path: str, hwnd: Optional[int] = None,
+                 origin: Tuple[int, int] = (0, 0), max_frames: int = 0):
+        """
+        Args:
+            base_path: Output path without extension
+            hwnd: Record only frames for this window (None = first hwnd seen)
+            origin: Screen (x, y) of the recorded client area; grabs are
+                    replayed relative to it
+            max_frames: Stop recording after N frames (0 = unlimited)
+        """
+        self.frames_path, self.index_path = _paths(base_path)
+        self.hwnd = hwnd
+        self.origin = origin
+        self.max_frames = max_frames
+        
+        self._file = None
+        self._shape: Optional[Tuple[int, int]] = None
+        self._timestamps: list[float] = []
+        self._skipped = 0
+        self._lock = threading.Lock()
+        self._manager: Optional[CaptureManager] = None
+    
+    @property
+    def frame_count(self) -> int:
+        return len(self._timestamps)
+    
+    def attach(self, manager: CaptureManager):
+        """Record every frame the manager caches for self.hwnd"""
+        self._manager = manager
+        if self.hwnd is not None:
+            rect = manager.window_rect(self.hwnd)
+            if rect:
+                self.origin = (rect[0], rect[1])
+        manager.add_listener(self._on_frame)
+    
+    def detach(self):
+        if self._manager is not None:
+            self._manager.remove_listener(self._on_frame)
+            self._manager = None
+    
+    def _on_frame(self, hwnd: int, frame: Frame):
+        if self.hwnd is None:
+            self.hwnd = hwnd
+        if hwnd == self.hwnd:
+            self.write(frame)
+    
+    def write(self, frame: Frame) -> bool:
+        """Append one frame. Returns False if it was skipped."""
+        pixels = frame.pixels
+        if pixels.ndim != 3 or pixels.shape[2] < 3:
+            self._skipped += 1
+            return False
+        
+        with self._lock:
+            if self.max_frames and len(self._timestamps) >= self.max_frames:
+                return False
+            
+            h, w = pixels.shape[:2]
+            if self._shape is None:
+                self._shape = (h, w)
+                os.makedirs(os.path.dirname(os.path.abspath(self.frames_path)), exist_ok=True)
+                self._file = open(self.frames_path, "wb")
+                log(f"[REPLAY] Recording {w}x{h} frames to {self.frames_path}")
+            elif self._shape != (h, w):
+                self._skipped += 1
+                return False
+            
+            # BGR only, contiguous (drops alpha of BGRA grabs)
+            self._file.write(np.ascontiguousarray(pixels[:, :, :3]).tobytes())
+            self._timestamps.append(frame.timestamp)
+            return True
+    
+    def close(self):
+        """Detach, flush frames and write the timestamp index"""
+        self.detach()
+        with self._lock:
+            if self._file is None:
+                log(f"[REPLAY] Nothing recorded")
+                return
+            
+            self._file.close()
+            self._file = None
+            
+            h, w = self._shape
+            index = {
+                "version": FORMAT_VERSION,
+                "width": w,
+                "height": h,
+                "channels": 3,
+                "origin": list(self.origin),
+                "timestamps": self._timestamps,
+            }
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+        
+        log(f"[REPLAY] Saved {len(self._timestamps)} frames ({self._skipped} skipped) to {self.index_path}")
+
+
+class ReplayCaptureProvider(ICaptureProvider):
+    """
+    ICaptureProvider that plays back a FrameRecorder recording.
+    
+    - realtime=True: the frame shown is the one whose recorded timestamp
+      matches the time elapsed since the first grab (like the live screen)
+    - realtime=False: every grab advances one frame (as fast as possible,
+      fully deterministic)
+    
+    Grab coordinates are interpreted relative to the recording's origin,
+    so code that captures a window's client rect gets the recorded pixels.
+    After the last frame, playback either loops or holds the last frame.
+    """
+    
+    def __init__(self, base_path: str, realtime: bool = True, loop: bool = False):
+        self.frames_path, self.index_path = _paths(base_path)
+        self.realtime = realtime
+        self.loop = loop
+        
+        self._frames: Optional[np.memmap] = None
+        self._offsets: list[float] = []  # timestamps relative to first frame
+        self._origin = (0, 0)
+        self._available = None
+        
+        self._lock = threading.Lock()
+        self._position = 0
+        self._start_time: Optional[float] = None
+    
+    @property
+    def name(self) -> str:
+        return "Replay"
+    
+    @property
+    def frame_count(self) -> int:
+        return len(self._offsets)
+    
+    @property
+    def finished(self) -> bool:
+        """True once playback passed the last frame (never when looping)"""
+        if self.loop or not self._offsets:
+            return False
+        if self.realtime:
+            return self._start_time is not None and \
+                time.time() - self._start_time > self._offsets[-1]
+        return self._position >= len(self._offsets)
+    
+    def is_available(self) -> bool:
+        if self._available is not None:
+            return self._available
+        
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            
+            w, h = index["width"], index["height"]
+            channels = index.get("channels", 3)
+            timestamps = index["timestamps"]
+            if not timestamps:
+                raise ValueError("recording has no frames")
+            
+            self._frames = np.memmap(self.frames_path, dtype=np.uint8, mode="r",
+                                     shape=(len(timestamps), h, w, channels))
+            self._offsets = [t - timestamps[0] for t in timestamps]
+            self._origin = tuple(index.get("origin", (0, 0)))
+            self._available = True
+            log(f"[REPLAY] Loaded {len(timestamps)} frames {w}x{h} from {self.frames_path}")
+        except Exception as e:
+            log(f"[REPLAY] Cannot load recording {self.index_path}: {e}")
+            self._available = False
+        
+        return self._available
+    
+    def rewind(self):
+        """Restart playback from the first frame"""
+        with self._lock:
+            self._position = 0
+            self._start_time = None
+    
+    def _next_index(self) -> int:
+        count = len(self._offsets)
+        with self._lock:
+            if self.realtime:
+                now = time.time()
+                if self._start_time is None:
+                    self._start_time = now
+                elapsed = now - self._start_time
+                if self.loop and self._offsets[-1] > 0:
+                    elapsed %= self._offsets[-1]
+                return max(0, bisect.bisect_right(self._offsets, elapsed) - 1)
+            
+            idx = self._position
+            self._position += 1
+            if idx >= count:
+                idx = idx % count if self.loop else count - 1
+            return idx
+    
+    def grab(self, x: int, y: int, w: int, h: int) -> Optional[Frame]:
+        if not self.is_available():
+            return None
+        
+        frame = self._frames[self._next_index()]
+        fh, fw = frame.shape[:2]
+        
+        # Screen coords → recording coords, clipped to the recorded area
+        x1 = max(0, x - self._origin[0])
+        y1 = max(0, y - self._origin[1])
+        x2 = min(fw, x1 + w)
+        y2 = min(fh, y1 + h)
+        if x1 >= x2 or y1 >= y2:
+            return None
+        
+        img = frame[y1:y2, x1:x2]
+        return Frame(
+            pixels=img,
+            width=img.shape[1],
+            height=img.shape[0],
+            timestamp=time.time(),
+            provider=self.name
+        )
+    
+    def release(self):
+        self._frames = None
+        self._available = None
+
+
+def create_replay_manager(base_path: str, hwnd: int = 1, realtime: bool = True,
+                          loop: bool = False) -> CaptureManager:
+    """
+    Build a CaptureManager that plays back a recording.
+    
+    The recording's client rect is registered for hwnd (any non-zero
+    pseudo handle), so window-mode actions (target_hwnd=hwnd) work
+    without Win32. Install it globally
+    with core.capture.set_capture_manager().
+    """
+    provider = ReplayCaptureProvider(base_path, realtime=realtime, loop=loop)
+    manager = CaptureManager(providers=[provider])
+    if provider.is_available():
+        frames = provider._frames
+        manager.register_window(hwnd, provider._origin[0], provider._origin[1],
+                                frames.shape[2], frames.shape[1])
+    return manager
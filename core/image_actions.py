@@ -9,17 +9,33 @@ Implements: FindImage, CaptureImage with OpenCV template matching
 
 from __future__ import annotations
 import os
+import sys
 import time
 import threading
 from typing import Optional, Tuple, List
 from dataclasses import dataclass
+from collections import deque
 import ctypes
 from ctypes import wintypes
 from pathlib import Path
 
 from utils.logger import log
+from core.capture import get_capture_manager
+from core.polling import Poller, FrameChangeDetector, make_policy
+from core.template_cache import get_template_cache, Template
+from core.template_match import (
+    match_template, match_exact, top_k_nms, fingerprint_rejects, ScreenPyramid, ResponseCache,
+    ENGINE_FULL, ENGINE_PYRAMID
+)
 
-user32 = ctypes.windll.user32
+# Win32 only; off-Windows the pipeline runs on registered rects (e.g. replay)
+user32 = ctypes.windll.user32 if sys.platform == 'win32' else None
+
+# Max age of the shared per-window frame reused by find/capture actions
+FRAME_MAX_AGE_MS = 100
+
+# Hot-region search: pixels of slack around a remembered match rectangle
+HOT_REGION_PAD = 32
 
 # Optional OpenCV import
 try:
@@ -54,21 +70,176 @@ class CaptureImageResult:
     message: str = ""
 
 
+class HotRegionMemory:
+    """
+    Recent match rectangles per (target_hwnd, template path).
+    
+    Game UIs put a button in the same place almost every time, so FindImage
+    first searches a padded window around these rectangles and scans the
+    full frame only when that misses. Hit/miss counters show the saving.
+    """
+    
+    MAX_RECTS = 3  # rectangles remembered per key (most recent first)
+    
+    def __init__(self):
+        self._rects: dict = {}  # (hwnd, path) -> deque[(x, y, w, h)]
+        self._counts: dict = {}  # (hwnd, path) -> [hits, misses]
+        self._lock = threading.Lock()
+    
+    def candidates(self, hwnd: int, path: str) -> List[Tuple[int, int, int, int]]:
+        with self._lock:
+            return list(self._rects.get((hwnd, path), ()))
+    
+    def remember(self, hwnd: int, path: str, rect: Tuple[int, int, int, int]):
+        """Store a match rectangle (window/screen coords), most recent first"""
+        with self._lock:
+            rects = self._rects.setdefault((hwnd, path), deque(maxlen=self.MAX_RECTS))
+            if rect in rects:
+                rects.remove(rect)
+            rects.appendleft(rect)
+    
+    def record(self, hwnd: int, path: str, hit: bool):
+        with self._lock:
+            counts = self._counts.setdefault((hwnd, path), [0, 0])
+            counts[0 if hit else 1] += 1
+    
+    def forget(self, hwnd: int):
+        """Drop everything remembered for a window (closed or reassigned)"""
+        with self._lock:
+            for key in [k for k in self._rects if k[0] == hwnd]:
+                del self._rects[key]
+            for key in [k for k in self._counts if k[0] == hwnd]:
+                del self._counts[key]
+    
+    def stats(self) -> dict:
+        """
+        Returns:
+            {"hits", "misses", "hit_rate",
+             "templates": {(hwnd, path): {"hits", "misses", "rects"}}}
+        """
+        with self._lock:
+            templates = {
+                key: {"hits": h, "misses": m, "rects": len(self._rects.get(key, ()))}
+                for key, (h, m) in self._counts.items()
+            }
+        hits = sum(t["hits"] for t in templates.values())
+        misses = sum(t["misses"] for t in templates.values())
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "templates": templates,
+        }
+
+
+_hot_regions = HotRegionMemory()
+
+
+def get_hot_regions() -> HotRegionMemory:
+    """Shared hot-region memory used by FindImage"""
+    return _hot_regions
+
+
+class ScaleMemory:
+    """
+    Winning template scale per (target_hwnd, template path).
+    
+    Multi-scale FindImage starts at the learned scale and only widens to
+    the whole scale range when that misses.
+    """
+    
+    def __init__(self):
+        self._scales: dict = {}  # (hwnd, path) -> scale
+        self._lock = threading.Lock()
+        self.learned_hits = 0
+        self.widened = 0
+    
+    def get(self, hwnd: int, path: str) -> Optional[float]:
+        with self._lock:
+            return self._scales.get((hwnd, path))
+    
+    def remember(self, hwnd: int, path: str, scale: float):
+        with self._lock:
+            self._scales[(hwnd, path)] = scale
+    
+    def forget(self, hwnd: int):
+        """Drop learned scales of a window (closed or reassigned)"""
+        with self._lock:
+            for key in [k for k in self._scales if k[0] == hwnd]:
+                del self._scales[key]
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "learned": dict(self._scales),
+                "learned_hits": self.learned_hits,
+                "widened": self.widened,
+            }
+
+
+_scale_memory = ScaleMemory()
+
+
+def get_scale_memory() -> ScaleMemory:
+    """Shared learned-scale memory used by multi-scale FindImage"""
+    return _scale_memory
+
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    """Shared incremental-match state used by polling FindImage"""
+    return _response_cache
+
+
+# Fingerprint precheck counters (conclusive checks / full matches skipped / area too large)
+_fingerprint_stats = {"checks": 0, "rejects": 0, "inconclusive": 0}
+
+
+def fingerprint_stats() -> dict:
+    """How often the sparse fingerprint precheck skipped cv2.matchTemplate (per conclusive check)"""
+    stats = dict(_fingerprint_stats)
+    stats["reject_rate"] = stats["rejects"] / stats["checks"] if stats["checks"] else 0.0
+    return stats
+
+
+def _fingerprint_rejects(screen: 'np.ndarray', entry: Template, max_gray_diff: float) -> bool:
+    rejected = fingerprint_rejects(screen, entry.fingerprint, max_gray_diff)
+    if rejected is None:
+        _fingerprint_stats["inconclusive"] += 1
+        return False
+    _fingerprint_stats["checks"] += 1
+    if rejected:
+        _fingerprint_stats["rejects"] += 1
+    return rejected
+
+
 def _capture_screen_region(region: Optional[Tuple[int, int, int, int]] = None,
                            target_hwnd: int = 0) -> Optional['np.ndarray']:
     """
     Capture screen region as numpy array
     
+    With target_hwnd, the region (client coords) is sliced from the shared
+    per-window frame in CaptureManager, so every find/wait on the same
+    emulator reuses one grab per tick.
+    
     Args:
         region: (x1, y1, x2, y2) or None for full screen
         target_hwnd: Target window handle for coord conversion
         
     Returns:
-        numpy array (BGR format) or None
+        numpy array (BGR format) or None. May be a read-only view.
     """
     if not HAS_OPENCV:
         return None
     
+    if target_hwnd and region:
+        x1, y1, x2, y2 = region
+        return get_capture_manager().get_region(target_hwnd, x1, y1, x2, y2,
+                                                max_age_ms=FRAME_MAX_AGE_MS)
+    
     try:
         import mss
         
@@ -121,19 +292,14 @@ def _capture_window(hwnd: int) -> Optional['np.ndarray']:
         return None
     
     try:
-        # Get window rect
-        rect = wintypes.RECT()
-        user32.GetClientRect(hwnd, ctypes.byref(rect))
+        manager = get_capture_manager()
+        rect = manager.window_rect(hwnd)
+        if rect is None:
+            return None
         
-        # Get window position
-        pt = wintypes.POINT(0, 0)
-        user32.ClientToScreen(hwnd, ctypes.byref(pt))
-        
-        x1, y1 = pt.x, pt.y
-        x2 = x1 + rect.right
-        y2 = y1 + rect.bottom
-        
-        return _capture_screen_region((x1, y1, x2, y2), target_hwnd=0)
+        # Shared cached frame for this window (grabbed at most once per tick)
+        frame = manager.get_frame(hwnd, *rect, ttl=FRAME_MAX_AGE_MS / 1000.0)
+        return frame.pixels if frame else None
         
     except Exception as e:
         log(f"[IMAGE] Window capture error: {e}")
@@ -149,13 +315,24 @@ class FindImage:
     METHOD_TM_CCOEFF_NORMED = cv2.TM_CCOEFF_NORMED if HAS_OPENCV else 5
     METHOD_TM_SQDIFF_NORMED = cv2.TM_SQDIFF_NORMED if HAS_OPENCV else 1
     
+    MAX_POLL_INTERVAL_MS = 800  # Slowest find() poll while the search area is static
+    
     def __init__(self,
                  template_path: str,
                  region: Optional[Tuple[int, int, int, int]] = None,
                  threshold: float = 0.8,
                  timeout_ms: int = 5000,
                  target_hwnd: int = 0,
-                 method: int = 5):  # TM_CCOEFF_NORMED
+                 method: int = 5,  # TM_CCOEFF_NORMED
+                 engine: str = ENGINE_FULL,
+                 pyramid_tolerance: float = 0.1,
+                 hot_regions: bool = True,
+                 multi_scale: bool = False,
+                 scale_range: Tuple[float, float] = (0.8, 1.2),
+                 scale_step: float = 0.05,
+                 fingerprint: Optional[bool] = None,
+                 exact_cutoff: Optional[float] = 0.95,
+                 incremental: bool = True):
         """
         Args:
             template_path: Path to template image file
@@ -164,6 +341,29 @@ class FindImage:
             timeout_ms: Search timeout in milliseconds
             target_hwnd: Target window handle (0 for screen)
             method: OpenCV matching method
+            engine: "full" (full-res match) or "pyramid" (coarse-to-fine,
+                    TM_CCOEFF_NORMED only; other methods use "full")
+            pyramid_tolerance: Max coarse-vs-full score drift for "pyramid"
+            hot_regions: Try recent match locations before the full scan
+            multi_scale: Also search template scales in scale_range (for
+                         workers whose resolution differs from the one the
+                         template was cropped on); the winning scale is
+                         learned per (target_hwnd, template)
+            scale_range: (min, max) template scale for multi_scale
+            scale_step: Scale increment for multi_scale
+            fingerprint: With a fixed region, check a few distinctive
+                         template pixels first and skip the full match
+                         when they differ more than any match at
+                         threshold can. None = on whenever region is
+                         set; False for templates whose few distinctive
+                         pixels vary (a sample cannot bound the whole
+                         template exactly)
+            exact_cutoff: From this threshold up, first look for a
+                          pixel-perfect copy with rolling hashes (None
+                          disables); a miss runs the normal engine
+            incremental: With engine "full", keep the last frame and
+                         response map and only re-match tiles that
+                         changed since the previous poll
         """
         self.template_path = template_path
         self.region = region
@@ -171,11 +371,26 @@ class FindImage:
         self.timeout_ms = timeout_ms
         self.target_hwnd = target_hwnd
         self.method = method
+        self.engine = engine
+        self.pyramid_tolerance = pyramid_tolerance
+        self.hot_regions = hot_regions
+        self.multi_scale = multi_scale
+        self.scale_range = scale_range
+        self.scale_step = scale_step
+        self.fingerprint = bool(region) if fingerprint is None else fingerprint
+        self.exact_cutoff = exact_cutoff
+        self.incremental = incremental
         
         self._template: Optional['np.ndarray'] = None
+        self._entry: Optional[Template] = None  # shared TemplateCache entry
+        
+        # find() pacing, kept across calls so retry loops continue the backoff
+        self._poller: Optional[Poller] = None
+        self._change: Optional[FrameChangeDetector] = None
+        self.screen_changed = False  # search area changed during the last find()
     
     def _load_template(self) -> bool:
-        """Load template image"""
+        """Load template image (decoded once per file version, see TemplateCache)"""
         if not HAS_OPENCV:
             log("[IMAGE] OpenCV not available")
             return False
@@ -184,20 +399,76 @@ class FindImage:
             log(f"[IMAGE] Template not found: {self.template_path}")
             return False
         
-        try:
-            self._template = cv2.imread(self.template_path)
-            if self._template is None:
-                log(f"[IMAGE] Failed to load template: {self.template_path}")
-                return False
-            return True
-        except Exception as e:
-            log(f"[IMAGE] Template load error: {e}")
+        entry = get_template_cache().get(self.template_path)
+        if entry is None:
+            log(f"[IMAGE] Failed to load template: {self.template_path}")
             return False
     
-    def _verify_match(self, screen: 'np.ndarray', top_left: Tuple[int, int]) -> float:
+        self._entry = entry
+        self._template = entry.bgr
+        return True
+    
+    def _accept_score(self) -> Optional[float]:
+        """
+        Lowest raw match score that can still pass verification.
+        Verified = 0.7 * ncc + 0.3 * similarity with similarity <= 1, so
+        ncc must reach (threshold - 0.3) / 0.7. Only defined for
+        TM_CCOEFF_NORMED, whose score is that same ncc.
+        """
+        if self.method != cv2.TM_CCOEFF_NORMED:
+            return None
+        return (self.threshold - 0.3) / 0.7
+    
+    def _use_exact(self) -> bool:
+        """
+        Near-1.0 thresholds only pass on (practically) the exact pixels, so
+        a hash hit is the likely outcome and costs a fraction of a
+        matchTemplate over the same area. Scaled variants are resampled and
+        never pixel-perfect.
+        """
+        return (self.exact_cutoff is not None and self.threshold >= self.exact_cutoff
+                and self._entry is not None and self._entry.scale == 1.0)
+    
+    def _reusable_ncc(self, best) -> Optional[float]:
+        """Match score usable as the verification ncc (same TM_CCOEFF_NORMED value)"""
+        if self.method == cv2.TM_CCOEFF_NORMED and best.exact:
+            return best.score
+        return None
+    
+    # cv2 BGR2GRAY weights (B, G, R); gray is rounded per pixel, hence the slack
+    _GRAY_WEIGHTS = (0.114, 0.587, 0.299)
+    _GRAY_SLACK = 0.5 / 255.0
+    
+    def _fingerprint_max_diff(self) -> Optional[float]:
+        """
+        Largest mean gray |diff| a match at self.threshold can have.
+        
+        confidence = 0.7 * ncc + 0.3 * similarity with ncc <= 1, so a
+        match needs similarity >= (threshold - 0.7) / 0.3, i.e. a mean
+        difference of at most 255 * (1 - that). None when any difference
+        can still pass (threshold <= 0.7): nothing to reject.
+        """
+        min_similarity = (self.threshold - 0.7) / 0.3
+        if min_similarity <= 0:
+            return None
+        return 255.0 * (1.0 - min(1.0, min_similarity))
+    
+    def _verify_match(self, screen: 'np.ndarray', top_left: Tuple[int, int],
+                      ncc: Optional[float] = None) -> float:
         """
         Verify match by extracting the matched region and comparing with template.
-        Returns verified confidence score.
+        Returns verified confidence score: 0.7 * ncc + 0.3 * similarity.
+        
+        Banded evaluation (decision identical to computing both terms):
+        - ncc is reused from the match response when given (TM_CCOEFF_NORMED)
+        - reject if even a perfect similarity cannot reach threshold
+        - reject if the similarity upper bound from channel means (template
+          means are precomputed) cannot reach threshold
+        - otherwise pay for absdiff/cvtColor/mean
+        
+        A rejected match reports the bound (still below threshold); any
+        score >= threshold is the exact confidence, so multi-scale ranking
+        compares real scores.
         """
         if self._template is None:
             return 0.0
@@ -215,8 +486,25 @@ class FindImage:
         # Compare using multiple methods for robust verification
         try:
             # Method 1: Normalized cross-correlation
-            result = cv2.matchTemplate(matched_region, self._template, cv2.TM_CCOEFF_NORMED)
-            ncc_score = result[0, 0] if result.size > 0 else 0.0
+            if ncc is None:
+                result = cv2.matchTemplate(matched_region, self._template, cv2.TM_CCOEFF_NORMED)
+                ncc = result[0, 0] if result.size > 0 else 0.0
+            ncc_score = float(ncc)
+            
+            # Reject band: similarity <= 1
+            upper = 0.7 * ncc_score + 0.3
+            if upper < self.threshold:
+                return max(0.0, min(1.0, upper))
+            
+            # Similarity upper bound: mean|gray diff| >= sum_c w_c * |mean_c(region) - mean_c(template)|
+            if self._entry is not None and matched_region.ndim == 3:
+                region_mean = cv2.mean(matched_region)
+                mean_gap = sum(wc * abs(region_mean[c] - self._entry.mean[c])
+                               for c, wc in enumerate(self._GRAY_WEIGHTS))
+                sim_bound = min(1.0, 1.0 - mean_gap / 255.0 + self._GRAY_SLACK)
+                upper = 0.7 * ncc_score + 0.3 * sim_bound
+                if upper < self.threshold:
+                    return max(0.0, min(1.0, upper))
             
             # Method 2: Structural similarity (pixel difference)
             diff = cv2.absdiff(matched_region, self._template)
@@ -232,6 +520,51 @@ class FindImage:
             log(f"[IMAGE] Verify match error: {e}")
             return 0.0
     
+    def _search_hot_regions(self, screen: 'np.ndarray', offset_x: int, offset_y: int) -> Optional[ImageMatch]:
+        """
+        Match only inside padded windows around remembered match rectangles.
+        
+        Returns:
+            Verified ImageMatch, or None to continue with the full scan
+        """
+        memory = get_hot_regions()
+        rects = memory.candidates(self.target_hwnd, self._entry.path)
+        if not rects:
+            return None
+        
+        th, tw = self._template.shape[:2]
+        sh, sw = screen.shape[:2]
+        for rx, ry, rw, rh in rects:
+            # Window/screen coords -> search-area coords, padded and clipped
+            x1 = max(0, rx - offset_x - HOT_REGION_PAD)
+            y1 = max(0, ry - offset_y - HOT_REGION_PAD)
+            x2 = min(sw, rx - offset_x + rw + HOT_REGION_PAD)
+            y2 = min(sh, ry - offset_y + rh + HOT_REGION_PAD)
+            if x2 - x1 < tw or y2 - y1 < th:
+                continue
+            
+            best = match_template(screen[y1:y2, x1:x2], self._entry, self.method)
+            top_left = (x1 + best.top_left[0], y1 + best.top_left[1])
+            verified_confidence = self._verify_match(screen, top_left, self._reusable_ncc(best))
+            if verified_confidence >= self.threshold:
+                memory.record(self.target_hwnd, self._entry.path, hit=True)
+                x = top_left[0] + offset_x
+                y = top_left[1] + offset_y
+                log(f"[IMAGE] Hot-region hit at ({x},{y}) conf={verified_confidence:.3f}")
+                return ImageMatch(
+                    found=True,
+                    x=x,
+                    y=y,
+                    width=tw,
+                    height=th,
+                    confidence=verified_confidence,
+                    center_x=x + tw // 2,
+                    center_y=y + th // 2
+                )
+        
+        memory.record(self.target_hwnd, self._entry.path, hit=False)
+        return None
+    
     def find_once(self) -> ImageMatch:
         """
         Search for template once (no timeout)
@@ -247,6 +580,21 @@ class FindImage:
             if not self._load_template():
                 return ImageMatch(found=False)
         
+        area = self._grab_search_area()
+        if area is None:
+            return ImageMatch(found=False)
+        
+        screen, offset_x, offset_y = area
+        return self.match_in(screen, offset_x, offset_y)
+    
+    def _grab_search_area(self) -> Optional[Tuple['np.ndarray', int, int]]:
+        """
+        Capture the search area (window or screen, cropped to region).
+        
+        Returns:
+            (screen, offset_x, offset_y) or None; offsets map screen pixels
+            back to window/screen coords
+        """
         # Capture screen/region
         offset_x = 0
         offset_y = 0
@@ -266,7 +614,7 @@ class FindImage:
                     x2 = screen.shape[1]
                 if x1 >= x2 or y1 >= y2:
                     log(f"[IMAGE] Invalid region: ({x1},{y1},{x2},{y2})")
-                    return ImageMatch(found=False)
+                    return None
                     
                 # Region is in client coords, crop from full window screenshot
                 screen = screen[y1:y2, x1:x2]
@@ -283,8 +631,83 @@ class FindImage:
                 offset_y = self.region[1]
         
         if screen is None:
+            return None
+        return screen, offset_x, offset_y
+    
+    def match_in(self, screen: 'np.ndarray', offset_x: int = 0, offset_y: int = 0,
+                 pyramid: Optional[ScreenPyramid] = None) -> ImageMatch:
+        """
+        Match + verify the (loaded) template against an already captured area.
+        
+        Args:
+            screen: Search area (BGR)
+            offset_x, offset_y: Position of screen in window/screen coords
+            pyramid: Downscaled levels of screen shared between templates
+        
+        Returns:
+            ImageMatch in window/screen coords
+        """
+        if self.multi_scale and self._entry is not None:
+            return self._match_multi_scale(screen, offset_x, offset_y, pyramid)
+        return self._match_entry(screen, offset_x, offset_y, pyramid)
+    
+    def _scale_candidates(self, start: float) -> List[float]:
+        """Scales in scale_range, nearest to start first (start itself first)"""
+        lo, hi = self.scale_range
+        count = int(round((hi - lo) / self.scale_step)) + 1 if self.scale_step > 0 else 1
+        scales = {round(lo + i * self.scale_step, 3) for i in range(count)}
+        scales.discard(round(start, 3))
+        return [round(start, 3)] + sorted(scales, key=lambda s: (abs(s - start), s))
+    
+    def _match_multi_scale(self, screen: 'np.ndarray', offset_x: int, offset_y: int,
+                           pyramid: Optional[ScreenPyramid]) -> ImageMatch:
+        """
+        Try the learned scale first; on a miss, search the whole range and
+        keep the best verified scale. Scaled templates are memoized on the
+        TemplateCache entry.
+        """
+        base = self._entry
+        memory = get_scale_memory()
+        learned = memory.get(self.target_hwnd, base.path)
+        scales = self._scale_candidates(learned if learned is not None else 1.0)
+        
+        best_scale, best = None, None
+        try:
+            for i, scale in enumerate(scales):
+                entry = base.scaled(scale)
+                if entry is None or entry.width > screen.shape[1] or entry.height > screen.shape[0]:
+                    continue
+                
+                self._entry, self._template = entry, entry.bgr
+                match = self._match_entry(screen, offset_x, offset_y, pyramid)
+                if not match.found:
+                    if i == 0 and learned is not None:
+                        memory.widened += 1
+                    continue
+                
+                if i == 0:
+                    # Learned (or 1:1) scale still matches: no need to widen
+                    if learned is not None:
+                        memory.learned_hits += 1
+                    else:
+                        memory.remember(self.target_hwnd, base.path, scale)
+                    return match
+                
+                if best is None or match.confidence > best.confidence:
+                    best_scale, best = scale, match
+        finally:
+            self._entry, self._template = base, base.bgr
+        
+        if best is None:
             return ImageMatch(found=False)
         
+        log(f"[IMAGE] Learned scale {best_scale:.2f} for {base.path} (hwnd={self.target_hwnd})")
+        memory.remember(self.target_hwnd, base.path, best_scale)
+        return best
+    
+    def _match_entry(self, screen: 'np.ndarray', offset_x: int, offset_y: int,
+                     pyramid: Optional[ScreenPyramid] = None) -> ImageMatch:
+        """match_in for the current template (self._entry / self._template)"""
         # Check if template fits in search area
         th, tw = self._template.shape[:2]
         sh, sw = screen.shape[:2]
@@ -292,25 +715,49 @@ class FindImage:
             log(f"[IMAGE] Template ({tw}x{th}) larger than search area ({sw}x{sh})")
             return ImageMatch(found=False)
         
-        # Template matching
+        # Fixed region: skip matching entirely when the fingerprint clearly mismatches
+        # (inconclusive for areas much larger than the template -> full match)
+        max_diff = self._fingerprint_max_diff() if self.fingerprint else None
+        if max_diff is not None and self.region and self._entry is not None:
+            try:
+                if _fingerprint_rejects(screen, self._entry, max_diff):
+                    return ImageMatch(found=False)
+            except Exception as e:
+                log(f"[IMAGE] Fingerprint precheck error: {e}")
+        
+        # Fast path: where this template was found last time
+        if self.hot_regions:
+            try:
+                match = self._search_hot_regions(screen, offset_x, offset_y)
+                if match is not None:
+                    get_hot_regions().remember(self.target_hwnd, self._entry.path,
+                                               (match.x, match.y, match.width, match.height))
+                    return match
+            except Exception as e:
+                log(f"[IMAGE] Hot-region search error: {e}")
+        
+        # Template matching (for TM_SQDIFF methods the score is 1 - min)
         try:
-            result = cv2.matchTemplate(screen, self._template, self.method)
-            
-            # Find best match
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            # For TM_SQDIFF methods, minimum is best match
-            if self.method in (cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED):
-                initial_confidence = 1.0 - min_val
-                top_left = min_loc
-            else:
-                initial_confidence = max_val
-                top_left = max_loc
+            best = None
+            if self._use_exact():
+                best = match_exact(screen, self._entry, pyramid=pyramid)
+            if best is None and self.incremental and self.engine == ENGINE_FULL:
+                key = (self.target_hwnd, self._entry.path, self._entry.stamp, self._entry.scale,
+                       self.method, offset_x, offset_y)
+                best = get_response_cache().match(key, screen, self._entry.bgr, self.method)
+            if best is None:
+                best = match_template(screen, self._entry, self.method,
+                                      engine=self.engine,
+                                      accept_score=self._accept_score(),
+                                      tolerance=self.pyramid_tolerance,
+                                      pyramid=pyramid)
+            initial_confidence = best.score
+            top_left = best.top_left
             
             log(f"[IMAGE] Template match at ({top_left[0]},{top_left[1]}) initial_conf={initial_confidence:.3f}")
             
             # VERIFY: Extract matched region and compare with template
-            verified_confidence = self._verify_match(screen, top_left)
+            verified_confidence = self._verify_match(screen, top_left, self._reusable_ncc(best))
             log(f"[IMAGE] Verified confidence: {verified_confidence:.3f} (threshold={self.threshold})")
             
             # Use verified confidence for final decision
@@ -324,6 +771,9 @@ class FindImage:
                 
                 log(f"[IMAGE] MATCH VERIFIED at ({x},{y}) conf={verified_confidence:.3f}")
                 
+                if self.hot_regions:
+                    get_hot_regions().remember(self.target_hwnd, self._entry.path, (x, y, w, h))
+                
                 return ImageMatch(
                     found=True,
                     x=x,
@@ -358,7 +808,14 @@ class FindImage:
             return ImageMatch(found=False)
         
         start_time = time.time()
-        check_interval = 100  # Check every 100ms
+        check_interval = 100  # Check every 100ms, backing off while the area is static
+        if self._poller is None:
+            self._poller = Poller(make_policy(check_interval, min_ms=50,
+                                              max_ms=self.MAX_POLL_INTERVAL_MS))
+            self._change = FrameChangeDetector()
+        else:
+            self._poller.pause()
+        self.screen_changed = False
         
         while True:
             if stop_event and stop_event.is_set():
@@ -371,22 +828,32 @@ class FindImage:
                 return ImageMatch(found=False)
             
             # Search
-            match = self.find_once()
-            if match.found:
-                log(f"[IMAGE] Found at ({match.x}, {match.y}) confidence={match.confidence:.2f}")
-                return match
+            area = self._grab_search_area()
+            if area is not None:
+                screen, offset_x, offset_y = area
+                changed = self._change.changed(screen)
+                self.screen_changed = self.screen_changed or changed
+                self._poller.observe(changed)
             
-            time.sleep(check_interval / 1000.0)
+                match = self.match_in(screen, offset_x, offset_y)
+                if match.found:
+                    log(f"[IMAGE] Found at ({match.x}, {match.y}) confidence={match.confidence:.2f}")
+                    return match
+            
+            self._poller.sleep(stop_event, limit_ms=self.timeout_ms - (time.time() - start_time) * 1000)
     
-    def find_all(self, max_results: int = 10) -> List[ImageMatch]:
+    def find_all(self, max_results: int = 10, iou_threshold: float = 0.3) -> List[ImageMatch]:
         """
         Find all occurrences of template
         
         Args:
             max_results: Maximum number of results
+            iou_threshold: Matches overlapping a better one by more than
+                           this IoU are treated as duplicates of it
             
         Returns:
-            List of ImageMatch results
+            List of ImageMatch results, best first (the best max_results
+            distinct matches above threshold)
         """
         if not HAS_OPENCV:
             return []
@@ -395,56 +862,29 @@ class FindImage:
             if not self._load_template():
                 return []
         
-        # Capture screen/region
-        offset_x = 0
-        offset_y = 0
-        
-        if self.target_hwnd:
-            # Capture full window
-            screen = _capture_window(self.target_hwnd)
-            
-            # If region specified, crop the screenshot to region
-            if screen is not None and self.region:
-                x1, y1, x2, y2 = self.region
-                # Region is in client coords, crop from full window screenshot
-                screen = screen[y1:y2, x1:x2]
-                # Save offset for later coordinate adjustment
-                offset_x = x1
-                offset_y = y1
-        else:
-            # Screen capture mode
-            screen = _capture_screen_region(self.region, self.target_hwnd)
-            # If region specified, offset is already in region coords
-            if self.region:
-                offset_x = self.region[0]
-                offset_y = self.region[1]
+        area = self._grab_search_area()
+        if area is None:
+            return []
+        screen, offset_x, offset_y = area
         
-        if screen is None:
+        h, w = self._template.shape[:2]
+        if w > screen.shape[1] or h > screen.shape[0]:
             return []
         
         try:
             result = cv2.matchTemplate(screen, self._template, self.method)
-            h, w = self._template.shape[:2]
             
-            matches = []
-            
-            # Find locations above threshold
+            # For TM_SQDIFF methods, lower is better: flip so higher is better
             if self.method in (cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED):
-                locations = np.where(result <= (1 - self.threshold))
-            else:
-                locations = np.where(result >= self.threshold)
+                result = 1.0 - result
             
-            for pt in zip(*locations[::-1]):
-                x, y = pt
-                
-                # Get confidence at this location
-                confidence = result[y, x]
-                if self.method in (cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED):
-                    confidence = 1.0 - confidence
-                
-                # Calculate absolute position in window/screen coords
-                # x, y are relative to cropped screenshot, add offset to get absolute coords
-                match = ImageMatch(
+            picks = top_k_nms(result, max_results, w, h,
+                              min_score=self.threshold, iou_threshold=iou_threshold)
+            
+            # Calculate absolute position in window/screen coords
+            # x, y are relative to cropped screenshot, add offset to get absolute coords
+            return [
+                ImageMatch(
                     found=True,
                     x=x + offset_x,
                     y=y + offset_y,
@@ -454,21 +894,85 @@ class FindImage:
                     center_x=x + offset_x + w // 2,
                     center_y=y + offset_y + h // 2
                 )
-                matches.append(match)
-                
-                if len(matches) >= max_results:
-                    break
-            
-            # Sort by confidence (descending)
-            matches.sort(key=lambda m: m.confidence, reverse=True)
-            
-            return matches
+                for confidence, (x, y) in picks
+            ]
             
         except Exception as e:
             log(f"[IMAGE] Find all error: {e}")
             return []
 
 
+def find_many(templates: List, frame=None,
+              region: Optional[Tuple[int, int, int, int]] = None,
+              threshold: float = 0.8,
+              target_hwnd: int = 0,
+              engine: str = ENGINE_FULL,
+              first_only: bool = False,
+              offset: Tuple[int, int] = (0, 0)) -> List[ImageMatch]:
+    """
+    Match several templates against one frame in a single pass.
+    
+    The search area is captured (or taken from frame) and cropped once, and
+    its frame-level conversions (pyramid levels, exact-hash rows per
+    template width) are computed once for all templates; each template
+    still gets FindImage's hot-region + verification logic.
+    
+    Args:
+        templates: Template paths or configured FindImage objects (with
+                   frame=None, the area of the first one is captured for all)
+        frame: core.capture.Frame or BGR ndarray of the window/screen
+               (None = capture target_hwnd / screen now)
+        region: (x1, y1, x2, y2) search region within frame
+        threshold: Confidence threshold for templates given as paths
+        target_hwnd: Window handle (capture + hot-region memory key)
+        engine: Matching engine for templates given as paths
+        first_only: Stop at the first template found (rest stay not found)
+        offset: Window/screen coords of frame[0, 0] (e.g. a search area
+                from FindImage._grab_search_area)
+    
+    Returns:
+        One ImageMatch per template, in input order
+    """
+    results = [ImageMatch(found=False) for _ in templates]
+    if not HAS_OPENCV or not templates:
+        return results
+    
+    finders = [
+        t if isinstance(t, FindImage) else FindImage(
+            template_path=t, region=region, threshold=threshold,
+            target_hwnd=target_hwnd, engine=engine)
+        for t in templates
+    ]
+    
+    # Shared search area
+    if frame is None:
+        area = finders[0]._grab_search_area()
+        if area is None:
+            return results
+        screen, offset_x, offset_y = area
+    else:
+        screen = getattr(frame, "pixels", frame)
+        offset_x, offset_y = offset
+        if region:
+            x1, y1, x2, y2 = region
+            x2, y2 = min(x2, screen.shape[1]), min(y2, screen.shape[0])
+            if x1 >= x2 or y1 >= y2:
+                log(f"[IMAGE] find_many: invalid region {region}")
+                return results
+            screen = screen[y1:y2, x1:x2]
+            offset_x, offset_y = offset_x + x1, offset_y + y1
+    
+    pyramid = ScreenPyramid(screen)
+    for i, finder in enumerate(finders):
+        if finder._template is None and not finder._load_template():
+            continue
+        results[i] = finder.match_in(screen, offset_x, offset_y, pyramid)
+        if first_only and results[i].found:
+            break
+    
+    return results
+
+
 class CaptureImage:
     """
     Capture screen region and save to file
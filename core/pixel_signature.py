@@ -0,0 +1,219 @@
+"""
+Pixel signatures
+A set of (x, y, color, tolerance) probes checked together: a sturdier
+"is this screen showing?" test than one pixel.
+
+All probes are read with a single fancy-index gather on a captured frame,
+so a check costs one capture plus a few microseconds whatever the probe
+count, instead of one GetDC/GetPixel round trip per probe.
+
+Usage:
+    signature = PixelSignature([(120, 45, (255, 0, 0), 10),
+                                (300, 80, (20, 20, 20), 10)], mode="all")
+    matched, hits = signature.check(frame.pixels)
+"""
+
+from typing import Optional, Sequence, Tuple, List, Union
+import math
+import numpy as np
+from utils.logger import log
+
+
+# (x, y, (r, g, b), tolerance)
+Probe = Tuple[int, int, Tuple[int, int, int], int]
+
+MODES = ("all", "any", "k_of_n")
+
+
+def _parse_rgb(value) -> Tuple[int, int, int]:
+    """(r, g, b) from a sequence or a '#RRGGBB' string"""
+    if isinstance(value, str):
+        value = value.lstrip('#')
+        return tuple(int(value[i:i+2], 16) for i in (0, 2, 4))
+    r, g, b = value[:3]
+    return int(r), int(g), int(b)
+
+
+class PixelSignature:
+    """
+    Probe set with a match rule.
+    
+    - all: every probe matches
+    - any: at least one probe matches
+    - k_of_n: at least k probes match
+    
+    Probe coordinates are client coords (window mode) or screen coords.
+    A probe outside the checked pixels counts as a miss.
+    """
+    
+    def __init__(self, probes: Sequence[Probe], mode: str = "all", k: int = None):
+        """
+        Args:
+            probes: (x, y, (r, g, b), tolerance) per probe
+            mode: "all", "any" or "k_of_n"
+            k: Probes required for k_of_n (default all, clamped to 1..n)
+        """
+        if mode not in MODES:
+            log(f"[SIGNATURE] Unknown mode '{mode}', using 'all'")
+            mode = "all"
+        
+        self.probes: List[Probe] = [(int(x), int(y), _parse_rgb(rgb), int(tol))
+                                    for x, y, rgb, tol in probes]
+        self.mode = mode
+        self.k = k
+        
+        self.xs = np.array([p[0] for p in self.probes], dtype=np.intp)
+        self.ys = np.array([p[1] for p in self.probes], dtype=np.intp)
+        # BGR, to compare against frame pixels without converting them
+        self.colors = np.array([(b, g, r) for _, _, (r, g, b), _ in self.probes],
+                               dtype=np.int16).reshape(-1, 3)
+        self.tolerances = np.array([p[3] for p in self.probes], dtype=np.int16)
+        
+        n = len(self.probes)
+        if mode == "any":
+            self.required = min(1, n)
+        elif mode == "k_of_n" and k is not None:
+            self.required = max(1, min(int(k), n)) if n else 0
+        else:
+            self.required = n
+    
+    def __len__(self) -> int:
+        return len(self.probes)
+    
+    @property
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """(x1, y1, x2, y2) covering every probe (x2/y2 exclusive), None if empty"""
+        if not self.probes:
+            return None
+        return (int(self.xs.min()), int(self.ys.min()),
+                int(self.xs.max()) + 1, int(self.ys.max()) + 1)
+    
+    def hits(self, pixels: np.ndarray, origin: Tuple[int, int] = (0, 0)) -> np.ndarray:
+        """
+        Per-probe match flags.
+        
+        Args:
+            pixels: (h, w, C) BGR or BGRA array
+            origin: Coordinates of pixels[0, 0] in probe space
+        
+        Returns:
+            (n,) bool array
+        """
+        h, w = pixels.shape[:2]
+        xs = self.xs - origin[0]
+        ys = self.ys - origin[1]
+        inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        if not inside.all():
+            xs = np.where(inside, xs, 0)
+            ys = np.where(inside, ys, 0)
+        
+        sampled = pixels[ys, xs, :3].astype(np.int16)
+        ok = (np.abs(sampled - self.colors) <= self.tolerances[:, None]).all(axis=1)
+        return ok & inside
+    
+    def check(self, pixels: np.ndarray, origin: Tuple[int, int] = (0, 0)) -> Tuple[bool, int]:
+        """
+        Returns:
+            (matched under the mode, number of matching probes)
+        """
+        if not self.probes:
+            return False, 0
+        count = int(np.count_nonzero(self.hits(pixels, origin)))
+        return count >= self.required, count
+    
+    def to_params(self) -> list:
+        """Probes as JSON-friendly [x, y, [r, g, b], tolerance] lists"""
+        return [[x, y, list(rgb), tol] for x, y, rgb, tol in self.probes]
+    
+    @classmethod
+    def from_params(cls, probes: Sequence[Union[dict, Sequence]], mode: str = "all",
+                    k: int = None, tolerance: int = 10) -> 'PixelSignature':
+        """
+        Build from macro params.
+        
+        Args:
+            probes: [x, y, rgb, tolerance?] lists or {"x", "y", "rgb", "tolerance"}
+                    dicts; rgb may be a '#RRGGBB' string
+            tolerance: Default for probes without one
+        """
+        parsed = []
+        for probe in probes:
+            if isinstance(probe, dict):
+                rgb = probe.get("rgb", probe.get("expected_rgb", (0, 0, 0)))
+                parsed.append((probe.get("x", 0), probe.get("y", 0), rgb,
+                               probe.get("tolerance", tolerance)))
+            else:
+                x, y, rgb = probe[:3]
+                parsed.append((x, y, rgb, probe[3] if len(probe) > 3 else tolerance))
+        return cls(parsed, mode=mode, k=k)
+    
+    @classmethod
+    def sample(cls, pixels: np.ndarray, count: int = 16, tolerance: int = 10,
+               origin: Tuple[int, int] = (0, 0), mode: str = "all",
+               k: int = None) -> Optional['PixelSignature']:
+        """
+        Auto-pick probes from a reference image.
+        
+        Probes are flat, distinctive pixels spread over the image (the same
+        picking as the template fingerprint), so they survive small shifts
+        and resampling.
+        
+        Args:
+            pixels: (h, w, C) BGR or BGRA reference
+            count: Target number of probes (rounded to a square grid)
+            origin: Probe-space coordinates of pixels[0, 0]
+        
+        Returns:
+            PixelSignature or None if OpenCV is missing or the image is empty
+        """
+        from core.template_cache import Fingerprint, cv2
+        if cv2 is None:
+            log("[SIGNATURE] OpenCV not available, cannot sample probes")
+            return None
+        if pixels is None or pixels.size == 0:
+            return None
+        
+        bgr = np.ascontiguousarray(pixels[:, :, :3])
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        mean = tuple(float(v) for v in cv2.mean(bgr)[:3])
+        picked = Fingerprint(bgr, gray, mean, grid=max(1, math.ceil(math.sqrt(count))))
+        
+        probes = []
+        for y, x, (b, g, r) in zip(picked.ys, picked.xs, picked.colors):
+            probes.append((int(x) + origin[0], int(y) + origin[1], (int(r), int(g), int(b)), tolerance))
+        return cls(probes, mode=mode, k=k)
+
+
+def capture_signature(hwnd: int, region: Tuple[int, int, int, int], count: int = 16,
+                      tolerance: int = 10, mode: str = "all",
+                      k: int = None) -> Optional[PixelSignature]:
+    """
+    Sample a signature from what a window shows now.
+    
+    Args:
+        region: (x1, y1, x2, y2) client coords to sample from
+    """
+    from core.capture import get_capture_manager
+    x1, y1, x2, y2 = region
+    pixels = get_capture_manager().get_region(hwnd, x1, y1, x2, y2)
+    if pixels is None:
+        log(f"[SIGNATURE] Capture failed for hwnd {hwnd}")
+        return None
+    return PixelSignature.sample(pixels, count, tolerance, origin=(max(0, x1), max(0, y1)),
+                                 mode=mode, k=k)
+
+
+def load_signature(path: str, origin: Tuple[int, int] = (0, 0), count: int = 16,
+                   tolerance: int = 10, mode: str = "all",
+                   k: int = None) -> Optional[PixelSignature]:
+    """
+    Sample a signature from a reference image file.
+    
+    Args:
+        origin: Where the image's top-left sits (client or screen coords)
+    """
+    from core.template_cache import get_template_cache
+    template = get_template_cache().get(path)
+    if template is None:
+        return None
+    return PixelSignature.sample(template.bgr, count, tolerance, origin=origin, mode=mode, k=k)
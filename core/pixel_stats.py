@@ -0,0 +1,197 @@
+"""
+Pixel statistics kernel
+Vectorized replacements for the per-byte loops over raw BGRA region bytes
+(MSS .raw layout) used by the screen/color waits.
+
+Every function returns exactly what the original pure-Python loop did on
+the same input: same counts, same float arithmetic, and the same order for
+color histograms (Counter insertion order = first occurrence in the data,
+count ties keep that order).
+"""
+
+from typing import List, Sequence, Tuple, Union
+import numpy as np
+
+
+Pixels = Union[bytes, bytearray, memoryview, np.ndarray]
+RGB = Tuple[int, int, int]
+
+
+def as_bgra(data: Pixels) -> np.ndarray:
+    """
+    Zero-copy (N, 4) uint8 view of BGRA pixels.
+    
+    Accepts raw bytes (trailing partial pixel ignored) or an (h, w, C)
+    array (a frame region), viewed as (N, C).
+    """
+    if isinstance(data, np.ndarray):
+        return data.reshape(-1, data.shape[-1]) if data.ndim == 3 else data.reshape(-1, 4)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    return buf[:buf.size - buf.size % 4].reshape(-1, 4)
+
+
+def changed_ratio(data1: Pixels, data2: Pixels) -> float:
+    """
+    Fraction of pixels whose B, G or R differs (alpha ignored).
+    
+    Accepts raw BGRA bytes or (h, w, C) arrays (C = 3 or 4).
+    
+    Returns:
+        1.0 if either side is empty or the sizes differ
+    """
+    if data1 is None or data2 is None or len(data1) == 0 or len(data2) == 0:
+        return 1.0
+    a, b = as_bgra(data1), as_bgra(data2)
+    if a.shape != b.shape:
+        return 1.0
+    
+    if a.shape[1] == 4:
+        # Compare BGR as one 32-bit word per pixel with alpha masked off
+        words_a = np.ascontiguousarray(a).view(np.uint32).ravel()
+        words_b = np.ascontiguousarray(b).view(np.uint32).ravel()
+        mask = np.frombuffer(bytes((255, 255, 255, 0)), dtype=np.uint32)[0]
+        changed = (words_a ^ words_b) & mask
+    else:
+        changed = a[:, 0] != b[:, 0]
+        for c in range(1, min(3, a.shape[1])):
+            changed |= a[:, c] != b[:, c]
+    diff_count = int(np.count_nonzero(changed))
+    
+    # Raw bytes: the original loop divided by len / 4 (a trailing partial pixel included)
+    total = a.shape[0] if isinstance(data1, np.ndarray) else len(data1) / 4
+    return diff_count / total
+
+
+def match_ratio(data: Pixels, colors: Sequence[RGB], tolerance: float) -> float:
+    """
+    Fraction of pixels within tolerance (per channel) of any of colors.
+    
+    Args:
+        colors: (r, g, b) targets; a pixel matching several counts once
+    """
+    if data is None or len(data) == 0:
+        return 0.0
+    px = as_bgra(data)
+    total_pixels = px.shape[0]
+    if total_pixels == 0:
+        return 0.0
+    
+    channels = [px[:, c].astype(np.int16) for c in range(3)]  # B, G, R
+    matched = np.zeros(total_pixels, dtype=bool)
+    for r_target, g_target, b_target in colors:
+        hit = np.abs(channels[2] - r_target) <= tolerance
+        hit &= np.abs(channels[1] - g_target) <= tolerance
+        hit &= np.abs(channels[0] - b_target) <= tolerance
+        matched |= hit
+    return int(np.count_nonzero(matched)) / total_pixels
+
+
+def color_counts(data: Pixels, step: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Histogram of (r, g, b) colors, each channel rounded down to a multiple
+    of step.
+    
+    Returns:
+        (colors (K, 3) int RGB, counts (K,)) in first-occurrence order
+    """
+    px = as_bgra(data)
+    if px.shape[0] == 0:
+        return np.empty((0, 3), dtype=np.int64), np.empty(0, dtype=np.int64)
+    
+    b, g, r = (px[:, c].astype(np.int32) for c in range(3))
+    if step > 1:
+        b, g, r = (b // step) * step, (g // step) * step, (r // step) * step
+    codes = (r << 16) | (g << 8) | b
+    
+    # Group equal codes by sorting; first occurrence = smallest index per group
+    # (an unstable argsort is fine for that and much faster than np.unique's)
+    idx = np.argsort(codes)
+    ordered = codes[idx]
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    first = np.minimum.reduceat(idx, starts)
+    counts = np.diff(np.append(starts, ordered.size))
+    
+    order = np.argsort(first, kind="stable")
+    uniques, counts = ordered[starts][order], counts[order]
+    colors = np.stack(((uniques >> 16) & 255, (uniques >> 8) & 255, uniques & 255), axis=1)
+    return colors, counts
+
+
+def most_common(colors: np.ndarray, counts: np.ndarray, n: int = None,
+                exclude: Sequence[RGB] = ()) -> List[Tuple[RGB, int]]:
+    """
+    Counter.most_common over a color_counts histogram.
+    
+    Args:
+        n: Keep the first n (None = all)
+        exclude: Colors to drop first; ignored when that would drop all
+    """
+    if exclude and len(colors):
+        keep = np.ones(len(colors), dtype=bool)
+        for r, g, b in exclude:
+            keep &= ~((colors[:, 0] == r) & (colors[:, 1] == g) & (colors[:, 2] == b))
+        if keep.any():
+            colors, counts = colors[keep], counts[keep]
+    
+    order = np.argsort(-counts, kind="stable")
+    if n is not None:
+        order = order[:n]
+    return [((int(colors[i, 0]), int(colors[i, 1]), int(colors[i, 2])), int(counts[i]))
+            for i in order]
+
+
+def color_variance(samples: Sequence[Tuple[np.ndarray, np.ndarray, int]]
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Temporal stability of every color seen in a stack of samples.
+    
+    Per color: percentage of pixels in each sample (0 where absent), then
+    mean and population variance across samples, in one pass over the
+    (samples x colors) matrix. Sums run sample by sample, like Python's
+    sum(), so values are bit-identical to the per-color Python loop.
+    
+    Args:
+        samples: (colors, counts, total_pixels) per sample, colors/counts
+                 from color_counts
+    
+    Returns:
+        (colors (K, 3), avg_percentage (K,), variance (K,)) over the union
+        of colors, sorted by packed code
+    """
+    codes = [(c[:, 0] << 16) | (c[:, 1] << 8) | c[:, 2] for c, _, _ in samples]
+    union, inverse = np.unique(np.concatenate(codes), return_inverse=True)
+    
+    percentages = np.zeros((len(samples), union.size), dtype=np.float64)
+    start = 0
+    for row, (code, (_, counts, total_pixels)) in enumerate(zip(codes, samples)):
+        cols = inverse[start:start + code.size]
+        percentages[row, cols] = (counts / total_pixels) * 100
+        start += code.size
+    
+    n = len(samples)
+    total = percentages[0].copy()
+    for row in percentages[1:]:
+        total += row
+    avg = total / n
+    squares = (percentages[0] - avg) ** 2
+    for row in percentages[1:]:
+        squares += (row - avg) ** 2
+    variance = squares / n
+    
+    colors = np.stack(((union >> 16) & 255, (union >> 8) & 255, union & 255), axis=1)
+    return colors, avg, variance
+
+
+def union_order(samples: Sequence[Tuple[np.ndarray, np.ndarray, int]]) -> dict:
+    """
+    Rank of each color in iteration order of the Python set the original
+    auto-detect built (set().update(sample keys) per sample). Only needed
+    to break exact variance ties the same way.
+    
+    Returns:
+        {(r, g, b): rank}
+    """
+    seen = set()
+    for colors, _, _ in samples:
+        seen.update(map(tuple, colors.tolist()))
+    return {color: rank for rank, color in enumerate(seen)}
@@ -0,0 +1,313 @@
+"""
+Adaptive polling
+Pacing for wait/find loops: back off while nothing changes, snap back to
+fast polling when something does, and keep the aggregate check rate of
+all workers under a global cap.
+
+Usage (a loop that checks, then sleeps):
+    poller = Poller(make_policy(100, max_ms=800))
+    while True:
+        pixels = capture()
+        poller.observe(detector.changed(pixels))
+        if done(pixels):
+            break
+        if not poller.sleep(stop_event, limit_ms=remaining_ms):
+            break  # stopped
+
+Policies are pluggable: set_policy_factory() swaps what make_policy()
+builds (e.g. PollPolicy for the old fixed intervals).
+"""
+
+from typing import Optional, Callable
+import threading
+import time
+import numpy as np
+from utils.logger import log
+
+
+class PollPolicy:
+    """Fixed interval (the pre-adaptive behaviour); base class of policies"""
+    
+    def __init__(self, base_ms: float, min_ms: float = None, max_ms: float = None):
+        """
+        Args:
+            base_ms: Starting interval
+            min_ms: Fastest interval (default base_ms)
+            max_ms: Slowest interval (default base_ms)
+        """
+        self.base_ms = base_ms
+        self.min_ms = min(min_ms if min_ms is not None else base_ms, base_ms)
+        self.max_ms = max(max_ms if max_ms is not None else base_ms, base_ms)
+        self.current_ms = base_ms
+    
+    def observe(self, changed: bool):
+        """Feed the outcome of one check"""
+        pass
+    
+    def interval_ms(self) -> float:
+        """Delay before the next check"""
+        return self.current_ms
+    
+    def reset(self):
+        self.current_ms = self.base_ms
+
+
+class BackoffPolicy(PollPolicy):
+    """
+    Exponential backoff while static, burst on change.
+    
+    Each static check multiplies the interval by factor (up to max_ms). A
+    change snaps it to min_ms and holds it there for burst_checks checks
+    (changes tend to come in runs: animations, loading bars).
+    """
+    
+    def __init__(self, base_ms: float, min_ms: float = None, max_ms: float = None,
+                 factor: float = 1.5, burst_checks: int = 3):
+        super().__init__(base_ms, min_ms, max_ms)
+        self.factor = factor
+        self.burst_checks = burst_checks
+        self._burst_left = 0
+    
+    def observe(self, changed: bool):
+        if changed:
+            self.current_ms = self.min_ms
+            self._burst_left = self.burst_checks
+        elif self._burst_left > 0:
+            self._burst_left -= 1
+        else:
+            self.current_ms = min(self.current_ms * self.factor, self.max_ms)
+    
+    def reset(self):
+        super().reset()
+        self._burst_left = 0
+
+
+def _default_factory(base_ms: float, min_ms: float = None, max_ms: float = None) -> PollPolicy:
+    return BackoffPolicy(base_ms, min_ms, max_ms)
+
+
+_policy_factory: Callable[..., PollPolicy] = _default_factory
+
+
+def make_policy(base_ms: float, min_ms: float = None, max_ms: float = None) -> PollPolicy:
+    """Policy for one wait loop from the installed factory"""
+    return _policy_factory(base_ms, min_ms, max_ms)
+
+
+def set_policy_factory(factory: Optional[Callable[..., PollPolicy]]):
+    """
+    Install the policy factory used by make_policy (None = default backoff).
+    set_policy_factory(PollPolicy) restores fixed intervals everywhere.
+    """
+    global _policy_factory
+    _policy_factory = factory or _default_factory
+
+
+class CheckBudget:
+    """
+    Global cap on aggregate checks per second (token bucket, one second of
+    burst). max_per_sec <= 0 means unlimited.
+    """
+    
+    def __init__(self, max_per_sec: float = 0, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.set_rate(max_per_sec)
+    
+    def set_rate(self, max_per_sec: float):
+        with self._lock:
+            self.max_per_sec = max_per_sec
+            self._tokens = float(max_per_sec)
+            self._last = self.clock()
+    
+    def _refill_locked(self):
+        now = self.clock()
+        self._tokens = min(float(self.max_per_sec),
+                           self._tokens + (now - self._last) * self.max_per_sec)
+        self._last = now
+    
+    def try_acquire(self) -> bool:
+        """Take one check slot if available"""
+        with self._lock:
+            if self.max_per_sec <= 0:
+                return True
+            self._refill_locked()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+    
+    def retry_after(self) -> float:
+        """Seconds until the next slot frees up"""
+        with self._lock:
+            if self.max_per_sec <= 0:
+                return 0.0
+            self._refill_locked()
+            return max(0.0, (1.0 - self._tokens) / self.max_per_sec)
+
+
+class PollStats:
+    """
+    Check counters of one owner (a worker thread).
+    
+    expected is how many checks the fixed base interval would have made
+    over the same time; saved = expected - checks.
+    """
+    
+    def __init__(self):
+        self.checks = 0
+        self.expected = 0.0
+        self.throttled = 0  # sleeps extended by the global cap
+    
+    def snapshot(self) -> dict:
+        return {
+            "checks": self.checks,
+            "expected": round(self.expected),
+            "saved": max(0, round(self.expected - self.checks)),
+            "throttled": self.throttled,
+        }
+
+
+_budget = CheckBudget()
+_stats: dict = {}  # owner -> PollStats
+_stats_lock = threading.Lock()
+
+
+def get_check_budget() -> CheckBudget:
+    """Global check budget shared by every Poller"""
+    return _budget
+
+
+def set_max_checks_per_sec(max_per_sec: float):
+    """Cap aggregate checks/sec across all workers (0 = unlimited)"""
+    _budget.set_rate(max_per_sec)
+    log(f"[POLL] Global check cap: {max_per_sec or 'unlimited'}/s")
+
+
+def get_poll_stats() -> dict:
+    """
+    Returns:
+        {owner: {"checks", "expected", "saved", "throttled"}}
+    """
+    with _stats_lock:
+        return {owner: stats.snapshot() for owner, stats in _stats.items()}
+
+
+def reset_poll_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _stats_for(owner: str) -> PollStats:
+    with _stats_lock:
+        stats = _stats.get(owner)
+        if stats is None:
+            stats = _stats[owner] = PollStats()
+        return stats
+
+
+class Poller:
+    """
+    Pacing of one wait loop: policy + global budget + per-owner stats.
+    
+    Call observe() once per check, then sleep() (own loop) or let the
+    watch scheduler ask interval_ms() / acquire().
+    """
+    
+    def __init__(self, policy: PollPolicy, owner: str = None,
+                 budget: CheckBudget = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            policy: Interval policy (see make_policy)
+            owner: Stats key (default: current thread name, e.g. Worker-3-Playback)
+            budget: Check budget (default: the global one)
+        """
+        self.policy = policy
+        self.owner = owner or threading.current_thread().name
+        self.budget = budget or _budget
+        self.clock = clock
+        self.stats = _stats_for(self.owner)
+        self._last_check: Optional[float] = None
+    
+    def observe(self, changed: bool):
+        """Record one check and whether the watched content changed"""
+        now = self.clock()
+        if self._last_check is None:
+            self.stats.expected += 1
+        else:
+            self.stats.expected += (now - self._last_check) * 1000 / self.policy.base_ms
+        self._last_check = now
+        self.stats.checks += 1
+        self.policy.observe(changed)
+    
+    def interval_ms(self) -> float:
+        return self.policy.interval_ms()
+    
+    def pause(self):
+        """The loop stopped polling for a while; don't bill the gap as expected checks"""
+        self._last_check = None
+    
+    def acquire(self) -> bool:
+        """Take a slot from the global budget (False = over the cap)"""
+        if self.budget.try_acquire():
+            return True
+        self.stats.throttled += 1
+        return False
+    
+    def sleep(self, stop_event: Optional[threading.Event] = None,
+              limit_ms: float = None) -> bool:
+        """
+        Wait until the next check is due and the budget allows it.
+        
+        Args:
+            limit_ms: Never sleep past this (e.g. time left before timeout)
+        
+        Returns:
+            False if stop_event was set while sleeping
+        """
+        delay = self.policy.interval_ms()
+        if limit_ms is not None:
+            delay = max(0.0, min(delay, limit_ms))
+        if not self._wait(stop_event, delay / 1000.0):
+            return False
+        
+        while not self.acquire():
+            if not self._wait(stop_event, self.budget.retry_after()):
+                return False
+        return True
+    
+    @staticmethod
+    def _wait(stop_event: Optional[threading.Event], seconds: float) -> bool:
+        if stop_event is None:
+            time.sleep(seconds)
+            return True
+        return not stop_event.wait(seconds)
+
+
+class FrameChangeDetector:
+    """
+    Cheap "did the picture change" test for pollers: compares a strided
+    subsample (every step-th pixel in both directions) with the previous one.
+    """
+    
+    def __init__(self, step: int = 8, tolerance: int = 8):
+        """
+        Args:
+            step: Subsampling stride
+            tolerance: Per-channel difference still counted as static (noise)
+        """
+        self.step = step
+        self.tolerance = tolerance
+        self._previous: Optional[np.ndarray] = None
+    
+    def changed(self, pixels: np.ndarray) -> bool:
+        """True if pixels differ from the previous call (False on the first)"""
+        if pixels is None:
+            return False
+        sample = pixels[::self.step, ::self.step].astype(np.int16)
+        previous, self._previous = self._previous, sample
+        if previous is None:
+            return False
+        if previous.shape != sample.shape:
+            return True
+        return bool((np.abs(sample - previous) > self.tolerance).any())
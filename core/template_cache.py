@@ -0,0 +1,279 @@
+"""
+Process-wide template cache
+Decoded templates + precomputed matching data, shared by every matcher
+
+Entries are keyed by absolute path and re-validated against the file's
+mtime and size on every lookup, so an edited PNG is picked up on the next
+find while an unchanged one is decoded once per process.
+"""
+
+from typing import Optional, Tuple
+from collections import OrderedDict
+import os
+import threading
+import numpy as np
+from utils.logger import log
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+class Fingerprint:
+    """
+    A few distinctive template pixels for a cheap presence precheck.
+    
+    Pixels are taken from flat areas (robust to sub-pixel shifts and
+    resampling), one per grid cell so they spread across the template,
+    preferring colors far from the template's average.
+    """
+    
+    GRID = 4  # GRID x GRID cells -> up to GRID^2 pixels
+    
+    def __init__(self, bgr: np.ndarray, gray: np.ndarray, mean: Tuple[float, ...],
+                 grid: int = None):
+        h, w = bgr.shape[:2]
+        grid = grid or self.GRID
+        self.width, self.height = w, h
+        
+        deviation = np.abs(bgr[:, :, :3].astype(np.int16) - np.array(mean[:3], dtype=np.int16)).sum(axis=2)
+        grad = np.abs(cv2.Sobel(gray, cv2.CV_16S, 1, 0)).astype(np.int32) + \
+            np.abs(cv2.Sobel(gray, cv2.CV_16S, 0, 1)).astype(np.int32)
+        score = deviation.astype(np.int32) - grad
+        
+        # Stay off the 1px border (most sensitive to crop/scale differences)
+        border = 1 if min(h, w) > 4 else 0
+        ys, xs = [], []
+        row_edges = np.linspace(border, h - border, grid + 1).astype(int)
+        col_edges = np.linspace(border, w - border, grid + 1).astype(int)
+        for r in range(grid):
+            for c in range(grid):
+                y0, y1 = row_edges[r], row_edges[r + 1]
+                x0, x1 = col_edges[c], col_edges[c + 1]
+                if y1 <= y0 or x1 <= x0:
+                    continue
+                cell = score[y0:y1, x0:x1]
+                dy, dx = np.unravel_index(np.argmax(cell), cell.shape)
+                ys.append(y0 + dy)
+                xs.append(x0 + dx)
+        
+        self.ys = np.array(ys, dtype=np.intp)
+        self.xs = np.array(xs, dtype=np.intp)
+        self.colors = bgr[self.ys, self.xs, :3].astype(np.int16)  # (N, 3)
+    
+    def __len__(self) -> int:
+        return len(self.ys)
+
+
+class Template:
+    """
+    Decoded template with precomputed views (treat arrays as read-only).
+    
+    - bgr / gray: full-size template
+    - pyramid(level): pyrDown'ed copies, level 1 = 1/2, 2 = 1/4 ...
+    - mean / std: per-channel BGR statistics; gray_mean / gray_std for gray
+    - scaled(s): resized variants for multi-scale matching, memoized
+    """
+    
+    MAX_PYRAMID_LEVEL = 3
+    MIN_PYRAMID_SIDE = 8  # smaller levels carry too little detail to match on
+    MIN_SCALED_SIDE = 4
+    
+    def __init__(self, path: str, bgr: np.ndarray, stamp: Tuple[int, int], scale: float = 1.0):
+        self.path = path
+        self.stamp = stamp  # (mtime_ns, size) of the decoded file
+        self.scale = scale  # relative to the file on disk
+        self.bgr = bgr
+        self._variants: dict = {}  # rounded scale -> Template
+        self._fingerprint: Optional[Fingerprint] = None
+        self._exact_hash: Optional[int] = None
+        self.gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        
+        mean, std = cv2.meanStdDev(bgr)
+        self.mean = tuple(float(v) for v in mean.ravel())
+        self.std = tuple(float(v) for v in std.ravel())
+        gray_mean, gray_std = cv2.meanStdDev(self.gray)
+        self.gray_mean = float(gray_mean[0, 0])
+        self.gray_std = float(gray_std[0, 0])
+        
+        # level -> (bgr, gray); level 0 is the template itself
+        self._pyramid = {0: (self.bgr, self.gray)}
+        bgr_level, gray_level = self.bgr, self.gray
+        for level in range(1, self.MAX_PYRAMID_LEVEL + 1):
+            if min(bgr_level.shape[:2]) // 2 < self.MIN_PYRAMID_SIDE:
+                break
+            bgr_level = cv2.pyrDown(bgr_level)
+            gray_level = cv2.pyrDown(gray_level)
+            self._pyramid[level] = (bgr_level, gray_level)
+    
+    @property
+    def width(self) -> int:
+        return self.bgr.shape[1]
+    
+    @property
+    def height(self) -> int:
+        return self.bgr.shape[0]
+    
+    @property
+    def max_level(self) -> int:
+        """Deepest pyramid level still at least MIN_PYRAMID_SIDE pixels"""
+        return max(self._pyramid)
+    
+    def pyramid(self, level: int, gray: bool = False) -> Optional[np.ndarray]:
+        """Template at pyramid level, or None if it would be too small"""
+        entry = self._pyramid.get(level)
+        if entry is None:
+            return None
+        return entry[1] if gray else entry[0]
+    
+    @property
+    def fingerprint(self) -> Fingerprint:
+        """Distinctive-pixel fingerprint (built on first use)"""
+        if self._fingerprint is None:
+            self._fingerprint = Fingerprint(self.bgr, self.gray, self.mean)
+        return self._fingerprint
+    
+    @property
+    def exact_hash(self) -> int:
+        """2D rolling hash of the pixels (see template_match.match_exact)"""
+        if self._exact_hash is None:
+            from core.template_match import template_hash
+            self._exact_hash = template_hash(self.bgr)
+        return self._exact_hash
+    
+    def scaled(self, scale: float) -> Optional['Template']:
+        """
+        Template resized by scale (memoized, so polls never re-resize).
+        
+        Returns:
+            Template (self for 1.0) or None if it would be too small
+        """
+        key = round(scale, 3)
+        if key == 1.0:
+            return self
+        
+        variant = self._variants.get(key)
+        if variant is None:
+            w = int(round(self.width * key))
+            h = int(round(self.height * key))
+            if min(w, h) < self.MIN_SCALED_SIDE:
+                return None
+            interpolation = cv2.INTER_AREA if key < 1.0 else cv2.INTER_LINEAR
+            resized = cv2.resize(self.bgr, (w, h), interpolation=interpolation)
+            variant = self._variants.setdefault(key, Template(self.path, resized, self.stamp, scale=key))
+        return variant
+    
+    @property
+    def nbytes(self) -> int:
+        own = sum(b.nbytes + g.nbytes for b, g in self._pyramid.values())
+        return own + sum(v.nbytes for v in list(self._variants.values()))
+
+
+class TemplateCache:
+    """
+    LRU cache of decoded Templates, bounded by total bytes.
+    
+    Usage:
+        template = get_template_cache().get("templates/ok_button.png")
+        if template is not None:
+            cv2.matchTemplate(screen, template.bgr, cv2.TM_CCOEFF_NORMED)
+    """
+    
+    DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+    
+    def __init__(self, budget_bytes: int = None):
+        self.budget_bytes = budget_bytes if budget_bytes is not None else self.DEFAULT_BUDGET_BYTES
+        self._entries: OrderedDict = OrderedDict()  # abs path -> Template, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, path: str) -> Optional[Template]:
+        """
+        Template for path, decoded at most once per (path, mtime, size).
+        
+        Returns:
+            Template or None if the file is missing or cannot be decoded
+        """
+        if cv2 is None or not path:
+            return None
+        
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            log(f"[TEMPLATE] Not found: {path}")
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        
+        with self._lock:
+            template = self._entries.get(key)
+            if template is not None and template.stamp == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+        
+        # Decode outside the lock; two threads missing together both decode once
+        try:
+            bgr = cv2.imread(key, cv2.IMREAD_COLOR)
+            if bgr is None:
+                log(f"[TEMPLATE] Failed to decode: {path}")
+                return None
+            template = Template(key, bgr, stamp)
+        except Exception as e:
+            log(f"[TEMPLATE] Load error {path}: {e}")
+            return None
+        
+        with self._lock:
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            self._evict_locked(keep=key)
+        return template
+    
+    def _evict_locked(self, keep: str):
+        total = sum(t.nbytes for t in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entries.pop(key).nbytes
+            self.evictions += 1
+    
+    def invalidate(self, path: str = None):
+        """Drop one template (or all) so the next get() re-reads the file"""
+        with self._lock:
+            if path:
+                self._entries.pop(os.path.abspath(path), None)
+            else:
+                self._entries.clear()
+    
+    def stats(self) -> dict:
+        """
+        Returns:
+            {"entries", "bytes", "budget", "hits", "misses", "evictions"}
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(t.nbytes for t in self._entries.values()),
+                "budget": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global template cache singleton
+_template_cache: Optional[TemplateCache] = None
+
+
+def get_template_cache() -> TemplateCache:
+    """Get or create global template cache"""
+    global _template_cache
+    if _template_cache is None:
+        _template_cache = TemplateCache()
+    return _template_cache
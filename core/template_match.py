@@ -0,0 +1,559 @@
+"""
+Template matching engines
+- full: cv2.matchTemplate over the whole search area (reference path)
+- pyramid: match at a downscaled pyramid level first, then refine only the
+  top-k candidate neighbourhoods at full resolution
+- incremental: ResponseCache keeps the last frame + response map per
+  template/area and re-matches only tiles that changed between polls
+- exact: 2D rolling-hash search for pixel-perfect copies (FindImage uses it
+  automatically for thresholds above its exact_cutoff)
+
+Scores are normalized so that higher is better (1 - value for SQDIFF_NORMED).
+"""
+
+from typing import Optional, Tuple, List
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import numpy as np
+from utils.logger import log
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+from core.template_cache import Template, Fingerprint
+
+
+ENGINE_FULL = "full"
+ENGINE_PYRAMID = "pyramid"
+ENGINES = (ENGINE_FULL, ENGINE_PYRAMID)
+ENGINE_EXACT = "exact"  # hash fast path, picked by threshold rather than configured
+
+# Methods whose scores live in a fixed range and survive downscaling
+_NORMED_METHODS = (5, 3, 1)  # TM_CCOEFF_NORMED, TM_CCORR_NORMED, TM_SQDIFF_NORMED
+
+
+@dataclass
+class MatchResult:
+    """Best match of one engine run"""
+    score: float  # higher is better
+    top_left: Tuple[int, int]
+    engine: str = ENGINE_FULL
+    fallback: bool = False  # pyramid engine had to run the full-res path
+    exact: bool = True  # score is the full-res response at top_left (not a coarse estimate)
+
+
+class ScreenPyramid:
+    """
+    pyrDown levels (and the exact-match row hashes) of one search area,
+    built on demand and shared by every template matched against it (see
+    image_actions.find_many).
+    """
+    
+    def __init__(self, screen: np.ndarray):
+        self._levels = {0: screen}
+        self._packed: Optional[np.ndarray] = None
+        self._row_hashes: dict = {}  # template width -> (h, nx) hashes
+    
+    @property
+    def screen(self) -> np.ndarray:
+        return self._levels[0]
+    
+    def level(self, n: int) -> np.ndarray:
+        img = self._levels.get(n)
+        if img is None:
+            img = cv2.pyrDown(self.level(n - 1))
+            self._levels[n] = img
+        return img
+    
+    def row_hashes(self, width: int) -> np.ndarray:
+        """match_exact row hashes of level 0 for templates of this width"""
+        rows = self._row_hashes.get(width)
+        if rows is None:
+            if self._packed is None:
+                self._packed = _pack_bgr(self.screen)
+            rows = _window_hashes(self._packed, width, _HASH_BASE_X, axis=1)
+            self._row_hashes[width] = rows
+        return rows
+
+
+def _is_sqdiff(method: int) -> bool:
+    return method in (cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED)
+
+
+def match_full(screen: np.ndarray, template: np.ndarray, method: int) -> MatchResult:
+    """Today's path: one full-resolution matchTemplate + minMaxLoc"""
+    return _best_response(cv2.matchTemplate(screen, template, method), method)
+
+
+def _best_response(result: np.ndarray, method: int) -> MatchResult:
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    if _is_sqdiff(method):
+        return MatchResult(score=1.0 - min_val, top_left=min_loc)
+    return MatchResult(score=max_val, top_left=max_loc)
+
+
+def _top_k(scores: np.ndarray, k: int, radius: Tuple[int, int]) -> List[Tuple[float, Tuple[int, int]]]:
+    """k best local maxima of a response map, suppressing radius around each pick"""
+    scores = scores.copy()
+    rx, ry = radius
+    picks = []
+    for _ in range(k):
+        _, max_val, _, max_loc = cv2.minMaxLoc(scores)
+        if max_val == -np.inf:
+            break
+        picks.append((max_val, max_loc))
+        x, y = max_loc
+        scores[max(0, y - ry):y + ry + 1, max(0, x - rx):x + rx + 1] = -np.inf
+    return picks
+
+
+def fingerprint_rejects(screen: np.ndarray, fingerprint: Fingerprint, max_gray_diff: float,
+                        max_offsets: int = 2048) -> Optional[bool]:
+    """
+    Sparse precheck: does the template clearly NOT appear anywhere in screen?
+    
+    Gathers the fingerprint pixels at every template position inside
+    screen in one vectorized fancy-index. A position is a clear mismatch
+    when the mean gray-weighted |difference| of its samples (the per-pixel
+    term of FindImage's similarity score) exceeds max_gray_diff. Only if
+    every position is a clear mismatch is the full match skipped.
+    
+    Args:
+        screen: Search area (BGR); meant for fixed regions / expected
+                positions barely larger than the template
+        max_gray_diff: Largest mean difference a match can still have
+                       (see FindImage._fingerprint_max_diff)
+        max_offsets: Larger areas are inconclusive
+    
+    Returns:
+        True to skip the full match, False if some position may match,
+        None if inconclusive (no fingerprint, area too large)
+    """
+    if len(fingerprint) == 0 or screen.ndim != 3:
+        return None
+    
+    ny = screen.shape[0] - fingerprint.height + 1
+    nx = screen.shape[1] - fingerprint.width + 1
+    if nx <= 0 or ny <= 0 or nx * ny > max_offsets:
+        return None
+    
+    # Broadcast (ny, 1, N) x (1, nx, N) index grids -> samples (ny, nx, N, 3)
+    rows = np.arange(ny)[:, None, None] + fingerprint.ys[None, None, :]
+    cols = np.arange(nx)[None, :, None] + fingerprint.xs[None, None, :]
+    diff = screen[rows, cols].astype(np.int16)[..., :3] - fingerprint.colors
+    np.abs(diff, out=diff)
+    
+    # BGR2GRAY weights, like cv2.cvtColor(absdiff) in the similarity score
+    gray = diff[..., 0] * 0.114 + diff[..., 1] * 0.587 + diff[..., 2] * 0.299
+    return bool((gray.mean(axis=2) > max_gray_diff).all())
+
+
+def changed_tiles(previous: np.ndarray, current: np.ndarray, tile: int) -> np.ndarray:
+    """
+    Tile-level change mask of two same-shaped frames.
+    
+    Returns:
+        bool array (ceil(h / tile), ceil(w / tile)), True where any byte differs
+    """
+    h, w = current.shape[:2]
+    diff = cv2.absdiff(previous, current).reshape(h, -1)
+    channels = diff.shape[1] // w
+    cols = np.maximum.reduceat(diff, np.arange(0, diff.shape[1], tile * channels), axis=1)
+    return np.maximum.reduceat(cols, np.arange(0, h, tile), axis=0) > 0
+
+
+class _ResponseState:
+    """Frame and full response map one ResponseCache key was last matched on"""
+    
+    def __init__(self, screen: np.ndarray, template: np.ndarray, response: np.ndarray,
+                 best: MatchResult):
+        self.screen = screen.copy()  # capture buffers are pooled and reused
+        self.template_shape = template.shape
+        self.response = response
+        self.best = best
+        self.lock = threading.Lock()
+    
+    @property
+    def nbytes(self) -> int:
+        return self.screen.nbytes + self.response.nbytes
+
+
+class ResponseCache:
+    """
+    Incremental full-resolution matching between polls.
+    
+    Per key (window, template, method, search area) the last frame and
+    its matchTemplate response map are kept. A new frame is compared
+    tile by tile; a response cell depends on the template-sized window
+    below-right of it, so only cells within one template size up/left of
+    a changed tile are recomputed. An unchanged frame returns the cached
+    best match without touching the response map.
+    
+    Recomputed cells come from matchTemplate on a sub-area, which agrees
+    with the full-frame response up to float rounding.
+    """
+    
+    TILE = 32
+    FULL_RECOMPUTE_FRACTION = 0.5  # beyond this many changed tiles one full pass is cheaper
+    DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+    
+    def __init__(self, budget_bytes: int = None):
+        self.budget_bytes = budget_bytes if budget_bytes is not None else self.DEFAULT_BUDGET_BYTES
+        self._states: OrderedDict = OrderedDict()  # key -> _ResponseState, least recently used first
+        self._lock = threading.Lock()
+        self.tiles_skipped = 0
+        self.tiles_recomputed = 0
+        self.unchanged = 0  # polls answered from the cached result
+        self.full = 0  # polls that ran a full-frame matchTemplate
+    
+    def match(self, key: tuple, screen: np.ndarray, template: np.ndarray, method: int) -> MatchResult:
+        """
+        Best match of template in screen, reusing the previous poll of key.
+        
+        Args:
+            key: Identifies the poll series, e.g. (hwnd, template path,
+                 template stamp, scale, method, search area origin); frames
+                 or templates of a different shape start the series over
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+        
+        if (state is None or state.screen.shape != screen.shape or state.screen.dtype != screen.dtype
+                or state.template_shape != template.shape):
+            response = cv2.matchTemplate(screen, template, method)
+            best = _best_response(response, method)
+            self._store(key, _ResponseState(screen, template, response, best))
+            with self._lock:
+                self.full += 1
+            return best
+        
+        with state.lock:
+            changed = changed_tiles(state.screen, screen, self.TILE)
+            count = int(np.count_nonzero(changed))
+            full = count > changed.size * self.FULL_RECOMPUTE_FRACTION
+            with self._lock:
+                self.tiles_recomputed += count
+                self.tiles_skipped += changed.size - count
+                self.unchanged += count == 0
+                self.full += full
+            
+            if count == 0:
+                return state.best
+            
+            if full:
+                state.response = cv2.matchTemplate(screen, template, method)
+            else:
+                self._update(state.response, screen, template, method, changed)
+            
+            np.copyto(state.screen, screen)
+            state.best = _best_response(state.response, method)
+            return state.best
+    
+    def _update(self, response: np.ndarray, screen: np.ndarray, template: np.ndarray,
+                method: int, changed: np.ndarray):
+        """Recompute the response cells whose windows overlap changed tiles"""
+        th, tw = template.shape[:2]
+        rh, rw = response.shape[:2]
+        tile = self.TILE
+        
+        # One sub-match per connected group of changed tiles
+        count, _, boxes, _ = cv2.connectedComponentsWithStats(changed.astype(np.uint8), connectivity=8)
+        for cx, cy, cw, ch, _ in boxes[1:count]:
+            x0, y0 = cx * tile, cy * tile
+            x1, y1 = (cx + cw) * tile, (cy + ch) * tile
+            rx0, ry0 = max(0, x0 - tw + 1), max(0, y0 - th + 1)
+            rx1, ry1 = min(rw, x1), min(rh, y1)
+            if rx1 <= rx0 or ry1 <= ry0:
+                continue
+            area = screen[ry0:ry1 + th - 1, rx0:rx1 + tw - 1]
+            response[ry0:ry1, rx0:rx1] = cv2.matchTemplate(area, template, method)
+    
+    def _store(self, key: tuple, state: _ResponseState):
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            total = sum(s.nbytes for s in self._states.values())
+            for old in list(self._states):
+                if total <= self.budget_bytes:
+                    break
+                if old != key:
+                    total -= self._states.pop(old).nbytes
+    
+    def forget(self, hwnd: int):
+        """Drop every series of a window (keys start with the hwnd)"""
+        with self._lock:
+            for key in [k for k in self._states if k[0] == hwnd]:
+                del self._states[key]
+    
+    def stats(self) -> dict:
+        """
+        Returns:
+            {"entries", "bytes", "tiles_skipped", "tiles_recomputed",
+             "skip_rate", "unchanged", "full"}
+        """
+        with self._lock:
+            entries = len(self._states)
+            nbytes = sum(s.nbytes for s in self._states.values())
+        tiles = self.tiles_skipped + self.tiles_recomputed
+        return {
+            "entries": entries,
+            "bytes": nbytes,
+            "tiles_skipped": self.tiles_skipped,
+            "tiles_recomputed": self.tiles_recomputed,
+            "skip_rate": self.tiles_skipped / tiles if tiles else 0.0,
+            "unchanged": self.unchanged,
+            "full": self.full,
+        }
+
+
+# Odd bases are invertible mod 2^32, so window hashes come straight from prefix sums
+_HASH_BASE_X = 0x9E3779B1
+_HASH_BASE_Y = 0x85EBCA77
+
+
+def _pack_bgr(img: np.ndarray) -> np.ndarray:
+    """BGR(A) uint8 -> uint32 0xRRGGBB per pixel (gray passes through)"""
+    if img.ndim == 2:
+        return img.astype(np.uint32)
+    packed = img[:, :, 2].astype(np.uint32) << 16
+    packed |= img[:, :, 1].astype(np.uint32) << 8
+    packed |= img[:, :, 0]
+    return packed
+
+
+def _window_hashes(values: np.ndarray, size: int, base: int, axis: int) -> np.ndarray:
+    """
+    Polynomial hash of every length-size window along axis, mod 2^32.
+    
+    With inv = base^-1: hash(x) = sum_k v[x + k] * inv^k
+                                = base^x * (prefix[x + size] - prefix[x])
+    where prefix accumulates v[j] * inv^j. One multiply, one cumsum and
+    one subtract per element, independent of size.
+    """
+    n = values.shape[axis]
+    inv = pow(base, -1, 1 << 32)
+    inv_pow = np.full(n, inv, dtype=np.uint32)
+    inv_pow[0] = 1
+    inv_pow = np.cumprod(inv_pow, dtype=np.uint32)
+    base_pow = np.full(n - size + 1, base, dtype=np.uint32)
+    base_pow[0] = 1
+    base_pow = np.cumprod(base_pow, dtype=np.uint32)
+    
+    shape = [1, 1]
+    shape[axis] = -1
+    prefix = np.cumsum(values * inv_pow.reshape(shape), axis=axis, dtype=np.uint32)
+    
+    if axis == 1:
+        head = np.zeros((prefix.shape[0], 1), dtype=np.uint32)
+        prefix = np.concatenate((head, prefix), axis=1)
+        windows = prefix[:, size:] - prefix[:, :-size]
+    else:
+        head = np.zeros((1, prefix.shape[1]), dtype=np.uint32)
+        prefix = np.concatenate((head, prefix), axis=0)
+        windows = prefix[size:, :] - prefix[:-size, :]
+    return windows * base_pow.reshape(shape)
+
+
+def template_hash(template: np.ndarray) -> int:
+    """2D rolling hash of a whole template (same function as match_exact)"""
+    th, tw = template.shape[:2]
+    rows = _window_hashes(_pack_bgr(template), tw, _HASH_BASE_X, axis=1)  # (th, 1)
+    return int(_window_hashes(rows, th, _HASH_BASE_Y, axis=0)[0, 0])
+
+
+def match_exact(screen: np.ndarray, template: Template, max_candidates: int = 64,
+                pyramid: Optional[ScreenPyramid] = None) -> Optional[MatchResult]:
+    """
+    Pixel-perfect match via 2D rolling hashes.
+    
+    Every template-sized window of screen is hashed in O(pixels): row
+    hashes of width tw, then column hashes of those over th rows. Windows
+    whose hash equals the template's are confirmed with SAD == 0 (rules
+    out hash collisions), first in scan order wins.
+    
+    Args:
+        pyramid: Shared levels of screen; its row hashes are reused
+    
+    Returns:
+        MatchResult(score=1.0) at the exact copy, or None if the template's
+        pixels do not appear verbatim (caller falls back to a scored match)
+    """
+    tmpl = template.bgr
+    th, tw = tmpl.shape[:2]
+    sh, sw = screen.shape[:2]
+    if tw > sw or th > sh or screen.ndim != tmpl.ndim:
+        return None
+    if pyramid is not None and pyramid.screen is screen:
+        rows = pyramid.row_hashes(tw)  # (sh, nx)
+    else:
+        rows = _window_hashes(_pack_bgr(screen), tw, _HASH_BASE_X, axis=1)
+    if screen.ndim == 3 and screen.shape[2] != tmpl.shape[2]:
+        screen = screen[:, :, :tmpl.shape[2]]
+    
+    target = template.exact_hash
+    hashes = _window_hashes(rows, th, _HASH_BASE_Y, axis=0)  # (ny, nx)
+    
+    candidates = np.flatnonzero(hashes == target)[:max_candidates]
+    nx = hashes.shape[1]
+    for idx in candidates:
+        y, x = divmod(int(idx), nx)
+        if cv2.norm(screen[y:y + th, x:x + tw], tmpl, cv2.NORM_L1) == 0:
+            # score is not a matchTemplate response: callers re-verify
+            return MatchResult(score=1.0, top_left=(x, y), engine=ENGINE_EXACT, exact=False)
+    return None
+
+
+def top_k_nms(scores: np.ndarray, k: int, box_w: int, box_h: int,
+              min_score: float, iou_threshold: float = 0.3) -> List[Tuple[float, Tuple[int, int]]]:
+    """
+    Best k distinct matches of a response map (higher is better).
+    
+    1. Keep only local maxima (3x3) scoring >= min_score, which collapses
+       the plateau of near-duplicate hits around each icon to one peak
+    2. argpartition the peaks down to a bounded candidate set, sort it
+    3. Greedy IoU non-maximum suppression over template-sized boxes:
+       each pick drops every remaining candidate overlapping it by more
+       than iou_threshold (one vectorized pass per pick)
+    
+    Returns:
+        [(score, (x, y))] sorted by score, at most k entries
+    """
+    if k <= 0 or scores.size == 0:
+        return []
+    
+    peaks = (scores >= min_score) & (scores >= cv2.dilate(scores, np.ones((3, 3), np.uint8)))
+    idx = np.flatnonzero(peaks)
+    if idx.size == 0:
+        return []
+    
+    values = scores.ravel()[idx]
+    limit = max(k * 32, 256)  # enough to refill k slots after suppression
+    if idx.size > limit:
+        part = np.argpartition(values, -limit)[-limit:]
+        idx, values = idx[part], values[part]
+    order = np.argsort(-values, kind="stable")
+    idx, values = idx[order], values[order]
+    ys, xs = np.divmod(idx, scores.shape[1])
+    
+    area = float(box_w * box_h)
+    picks = []
+    while xs.size and len(picks) < k:
+        x, y = int(xs[0]), int(ys[0])
+        picks.append((float(values[0]), (x, y)))
+        
+        # IoU of equal-sized boxes depends only on the offset
+        inter = (np.clip(box_w - np.abs(xs - x), 0, None) *
+                 np.clip(box_h - np.abs(ys - y), 0, None)).astype(np.float64)
+        iou = inter / (2.0 * area - inter)
+        keep = iou <= iou_threshold
+        xs, ys, values = xs[keep], ys[keep], values[keep]
+    
+    return picks
+
+
+def match_pyramid(screen: np.ndarray, template: Template, method: int,
+                  accept_score: float, tolerance: float = 0.1,
+                  top_k: int = 4, max_level: int = 2,
+                  pyramid: Optional[ScreenPyramid] = None) -> MatchResult:
+    """
+    Coarse-to-fine match.
+    
+    The found/not-found decision matches match_full as long as the coarse
+    score under-estimates the full-res score at the true location by no
+    more than tolerance:
+    - a refined candidate scoring >= accept_score is a hit (full-res max
+      can only be higher)
+    - otherwise, if the coarse best is within tolerance of accept_score,
+      the full-res path decides
+    - otherwise nothing can reach accept_score: reported as the best miss
+    
+    Args:
+        screen: Search area (BGR)
+        template: TemplateCache entry (its pyramid levels are reused)
+        method: Normalized OpenCV method (others run match_full)
+        accept_score: Score the caller treats as found
+        tolerance: Allowed coarse-vs-full score drift
+        top_k: Coarse candidates refined at full resolution
+        max_level: Deepest pyramid level to match on (1 = 1/2, 2 = 1/4)
+        pyramid: Prepared levels of screen (built here if None)
+    """
+    if method not in _NORMED_METHODS:
+        return match_full(screen, template.bgr, method)
+    
+    th, tw = template.bgr.shape[:2]
+    sh, sw = screen.shape[:2]
+    
+    # Deepest level where template and screen both still have usable size
+    level = min(max_level, template.max_level)
+    while level > 0:
+        small = template.pyramid(level)
+        if small is not None and (sw >> level) >= small.shape[1] and (sh >> level) >= small.shape[0]:
+            break
+        level -= 1
+    if level == 0:
+        return match_full(screen, template.bgr, method)
+    
+    if pyramid is None or pyramid.screen is not screen:
+        pyramid = ScreenPyramid(screen)
+    screen_small = pyramid.level(level)
+    template_small = template.pyramid(level)
+    
+    coarse = cv2.matchTemplate(screen_small, template_small, method)
+    if _is_sqdiff(method):
+        coarse = 1.0 - coarse
+    radius = (max(1, template_small.shape[1] // 2), max(1, template_small.shape[0] // 2))
+    candidates = _top_k(coarse, top_k, radius)
+    
+    # Refine each candidate in its full-res neighbourhood (pyrDown shifts by < 1 coarse px)
+    scale = 1 << level
+    pad = scale + 1
+    best: Optional[MatchResult] = None
+    for _, (cx, cy) in candidates:
+        x0, y0 = max(0, cx * scale - pad), max(0, cy * scale - pad)
+        x1, y1 = min(sw - tw, cx * scale + pad), min(sh - th, cy * scale + pad)
+        if x1 < x0 or y1 < y0:
+            continue
+        local = match_full(screen[y0:y1 + th, x0:x1 + tw], template.bgr, method)
+        if best is None or local.score > best.score:
+            best = MatchResult(score=local.score,
+                               top_left=(x0 + local.top_left[0], y0 + local.top_left[1]),
+                               engine=ENGINE_PYRAMID)
+    
+    if best is not None and best.score >= accept_score:
+        return best
+    
+    coarse_best = candidates[0][0] if candidates else -1.0
+    if coarse_best >= accept_score - tolerance:
+        full = match_full(screen, template.bgr, method)
+        full.engine = ENGINE_PYRAMID
+        full.fallback = True
+        return full
+    
+    if best is None:
+        cx, cy = candidates[0][1] if candidates else (0, 0)
+        best = MatchResult(score=coarse_best, top_left=(cx * scale, cy * scale),
+                           engine=ENGINE_PYRAMID, exact=False)
+    return best
+
+
+def match_template(screen: np.ndarray, template: Template, method: int,
+                   engine: str = ENGINE_FULL, accept_score: float = None,
+                   tolerance: float = 0.1,
+                   pyramid: Optional[ScreenPyramid] = None) -> MatchResult:
+    """
+    Run the selected engine.
+    
+    Pyramid needs accept_score (the raw score the caller treats as found);
+    without it the full-res path is used.
+    """
+    if engine == ENGINE_PYRAMID and accept_score is not None:
+        return match_pyramid(screen, template, method, accept_score,
+                             tolerance=tolerance, pyramid=pyramid)
+    if engine not in ENGINES:
+        log(f"[MATCH] Unknown engine '{engine}', using {ENGINE_FULL}")
+    return match_full(screen, template.bgr, method)
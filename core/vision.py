@@ -1,6 +1,10 @@
 # core/vision.py
 
-from core.tech import cv2, np, time
+# Imported directly (not via core.tech) so MotionDetector also runs off-Windows
+import time
+
+import cv2
+import numpy as np
 
 
 class MotionDetector:
@@ -15,19 +19,33 @@ class MotionDetector:
         self.resize_width = resize_width
 
         self.last_frame = None
+        self.last_source = None
         self.stable_count = 0
 
     def _preprocess(self, frame):
-        h, w = frame.shape[:2]
-        scale = self.resize_width / w
-        frame = cv2.resize(frame, (self.resize_width, int(h * scale)))
+        # core.capture.Frame: reuse its memoized gray, memoize the resize too
+        if hasattr(frame, "derived"):
+            return frame.derived(("motion", self.resize_width),
+                                 lambda f: self._resize(f.gray))
+
+        frame = self._resize(frame)
         frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         return frame
 
+    def _resize(self, img):
+        h, w = img.shape[:2]
+        scale = self.resize_width / w
+        return cv2.resize(img, (self.resize_width, int(h * scale)))
+
     def update(self, frame) -> bool:
         """
         Trả về True nếu màn hình đã ổn định
         """
+        # Same cached Frame again (no new capture yet): nothing to compare
+        if frame is self.last_source:
+            return self.stable_count >= self.stable_frames
+        self.last_source = frame
+
         frame = self._preprocess(frame)
 
         if self.last_frame is None:
@@ -4,7 +4,8 @@
 
 """
 Wait Actions Module — per UPGRADE_PLAN_V2 spec B1
-Implements: WaitTime, WaitPixelColor, WaitScreenChange, WaitHotkey, WaitFile
+Implements: WaitTime, WaitPixelColor, WaitPixelSignature, WaitScreenChange,
+WaitHotkey, WaitFile, WaitAnyImage
 """
 
 from __future__ import annotations
@@ -12,14 +13,12 @@ import time
 import os
 import sys
 import threading
-import subprocess
-import io
 from abc import ABC, abstractmethod
 from typing import Optional, Tuple, Callable, Any
 from dataclasses import dataclass
 import ctypes
 from ctypes import wintypes
-from utils.subprocess_helper import run_hidden
+import numpy as np
 
 # Windows CREATE_NO_WINDOW flag
 if sys.platform == 'win32':
@@ -28,16 +27,25 @@ else:
     CREATE_NO_WINDOW = 0
 
 from utils.logger import log
+from core.capture import get_capture_manager, region_to_bgra_bytes
+from core import pixel_stats
+from core.pixel_signature import PixelSignature, load_signature
+from core.polling import Poller, FrameChangeDetector, make_policy
+from core.watch_scheduler import (get_watch_scheduler, pixel_color, signature_matches,
+                                  template_present, wait_for, crop)
 
-user32 = ctypes.windll.user32
+# Win32 only; off-Windows the window-mode waits run on registered rects (e.g. replay)
+user32 = ctypes.windll.user32 if sys.platform == 'win32' else None
 
 
 class WaitResult:
     """Result of a wait operation"""
-    def __init__(self, success: bool, timeout: bool = False, message: str = ""):
+    def __init__(self, success: bool, timeout: bool = False, message: str = "",
+                 data: Any = None):
         self.success = success
         self.timeout = timeout
         self.message = message
+        self.data = data  # action-specific payload (e.g. which image appeared)
 
 
 class WaitAction(ABC):
@@ -57,6 +65,35 @@ class WaitAction(ABC):
         pass
 
 
+def _watch_region(hwnd: int, region: Tuple[int, int, int, int],
+                  check: Callable[[bytes], Optional[WaitResult]], timeout_ms: int,
+                  interval_ms: int, stop_event: threading.Event,
+                  timeout_result: WaitResult, name: str,
+                  poller: Optional[Poller] = None) -> WaitResult:
+    """
+    Run a region wait on the window's watch scheduler.
+    
+    check gets the region as BGRA bytes (same as _capture_region) on every
+    evaluation and returns a WaitResult to finish the wait. With a poller,
+    its adaptive interval replaces interval_ms.
+    """
+    def predicate(frame):
+        region_pixels = crop(frame, region)
+        if region_pixels is None:
+            return None
+        return check(region_to_bgra_bytes(region_pixels))
+    
+    future = get_watch_scheduler(hwnd).watch(predicate, timeout_ms=timeout_ms,
+                                             interval_ms=interval_ms, name=name, poller=poller)
+    result = wait_for(future, stop_event)
+    if result.fired:
+        return result.value
+    if result.timeout:
+        log(f"[WAIT] {name} ✗ TIMEOUT after {result.elapsed_ms:.0f}ms ({result.checks} checks)")
+        return timeout_result
+    return WaitResult(success=False, message="Stopped by user")
+
+
 class WaitTime(WaitAction):
     """
     Wait for specified duration
@@ -135,6 +172,22 @@ class WaitPixelColor(WaitAction):
         start_time = time.time()
         check_interval = 100  # Check every 100ms
         
+        # Window mode: one shared frame per tick from the window's watch scheduler
+        if self.target_hwnd:
+            future = get_watch_scheduler(self.target_hwnd).watch(
+                pixel_color(self.x, self.y, self.expected_rgb, self.tolerance),
+                timeout_ms=self.timeout_ms, interval_ms=check_interval, name="WaitPixelColor"
+            )
+            result = wait_for(future, stop_event)
+            if result.fired:
+                r, g, b = result.value
+                return WaitResult(success=True, 
+                                  message=f"Pixel matched: ({r}, {g}, {b})")
+            if result.timeout:
+                return WaitResult(success=False, timeout=True, 
+                                  message=f"Timeout after {self.timeout_ms}ms")
+            return WaitResult(success=False, message="Stopped by user")
+        
         while True:
             if stop_event.is_set():
                 return WaitResult(success=False, message="Stopped by user")
@@ -145,18 +198,9 @@ class WaitPixelColor(WaitAction):
                 return WaitResult(success=False, timeout=True, 
                                   message=f"Timeout after {self.timeout_ms}ms")
             
-            # Get current pixel color
-            screen_x, screen_y = self.x, self.y
-            
-            # Convert client to screen coords if needed
-            if self.target_hwnd:
-                pt = wintypes.POINT(self.x, self.y)
-                user32.ClientToScreen(self.target_hwnd, ctypes.byref(pt))
-                screen_x, screen_y = pt.x, pt.y
-            
-            # Get pixel color
+            # Get current pixel color (screen coords)
             hdc = user32.GetDC(0)
-            pixel = ctypes.windll.gdi32.GetPixel(hdc, screen_x, screen_y)
+            pixel = ctypes.windll.gdi32.GetPixel(hdc, self.x, self.y)
             user32.ReleaseDC(0, hdc)
             
             r = pixel & 0xFF
@@ -173,12 +217,101 @@ class WaitPixelColor(WaitAction):
             time.sleep(check_interval / 1000.0)
 
 
+class WaitPixelSignature(WaitAction):
+    """
+    Wait until a multi-pixel signature matches (all / any / k-of-n probes).
+    Every check reads all probes from one captured frame (pixel_signature).
+    
+    On success, result.data = {"hits": matching probes, "total": probe count}
+    """
+    
+    def __init__(self,
+                 signature: PixelSignature,
+                 timeout_ms: int = 30000,
+                 target_hwnd: int = 0,
+                 interval_ms: int = 100):
+        """
+        Args:
+            signature: Probes + match rule (client coords if target_hwnd set)
+            timeout_ms: Timeout in milliseconds
+            target_hwnd: Target window handle (0 for screen coords)
+            interval_ms: Delay between checks
+        """
+        self.signature = signature
+        self.timeout_ms = timeout_ms
+        self.target_hwnd = target_hwnd
+        self.interval_ms = interval_ms
+    
+    def _matched(self, hits: int) -> WaitResult:
+        total = len(self.signature)
+        return WaitResult(success=True,
+                          message=f"Signature matched: {hits}/{total} probes",
+                          data={"hits": hits, "total": total})
+    
+    def _capture_bounds(self, sct) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+        """Screen pixels covering every probe (one grab) and their origin"""
+        x1, y1, x2, y2 = self.signature.bounds
+        try:
+            img = sct.grab({"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1})
+        except Exception as e:
+            log(f"[WAIT] Screen capture error: {e}")
+            return None
+        pixels = np.frombuffer(img.raw, dtype=np.uint8).reshape(img.height, img.width, 4)
+        return pixels, (x1, y1)
+    
+    def wait(self, stop_event: threading.Event) -> WaitResult:
+        """Wait until the signature matches"""
+        signature = self.signature
+        log(f"[WAIT] WaitPixelSignature: {len(signature)} probes, mode={signature.mode} "
+            f"(need {signature.required})")
+        
+        if not len(signature):
+            return WaitResult(success=False, message="No probes")
+        
+        # Window mode: one shared frame per tick from the window's watch scheduler
+        if self.target_hwnd:
+            future = get_watch_scheduler(self.target_hwnd).watch(
+                signature_matches(signature), timeout_ms=self.timeout_ms,
+                interval_ms=self.interval_ms, name="WaitPixelSignature"
+            )
+            result = wait_for(future, stop_event)
+            if result.fired:
+                return self._matched(result.value)
+            if result.timeout:
+                return WaitResult(success=False, timeout=True,
+                                  message=f"Timeout after {self.timeout_ms}ms")
+            return WaitResult(success=False, message="Stopped by user")
+        
+        import mss
+        start_time = time.time()
+        with mss.mss() as sct:
+            while True:
+                if stop_event.is_set():
+                    return WaitResult(success=False, message="Stopped by user")
+                
+                # Check timeout
+                elapsed = (time.time() - start_time) * 1000
+                if elapsed >= self.timeout_ms:
+                    return WaitResult(success=False, timeout=True,
+                                      message=f"Timeout after {self.timeout_ms}ms")
+                
+                captured = self._capture_bounds(sct)
+                if captured is not None:
+                    matched, hits = signature.check(*captured)
+                    if matched:
+                        return self._matched(hits)
+                
+                time.sleep(self.interval_ms / 1000.0)
+
+
 class WaitScreenChange(WaitAction):
     """
     Wait until region on screen changes
     Per spec B1-3: WaitScreenChange(region: Tuple[x1, y1, x2, y2], threshold, timeout_ms)
     """
     
+    FRAME_MAX_AGE_MS = 50  # Reuse shared window frame up to one poll old
+    
     def __init__(self,
                  region: Tuple[int, int, int, int],
                  threshold: float = 0.235,
@@ -200,39 +333,19 @@ class WaitScreenChange(WaitAction):
         self.adb_serial = adb_serial
     
     def _capture_region_adb(self) -> Optional[bytes]:
-        """Capture region using ADB screencap (region is in emulator coordinates)."""
-        try:
-            from PIL import Image
-        except ImportError:
-            log("[WAIT] Pillow not installed; cannot use ADB capture. Install: pip install pillow")
-            return None
-        
-        x1, y1, x2, y2 = self.region
+        """Capture region using ADB raw screencap (region is in emulator coordinates)."""
         if not self.adb_serial:
             return None
         
-        try:
-            # exec-out returns raw PNG bytes
-            p = run_hidden(
-                ["adb", "-s", self.adb_serial, "exec-out", "screencap", "-p"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=5
-            )
-            if p.returncode != 0 or not p.stdout:
-                log(f"[WAIT] ADB screencap failed ({self.adb_serial}): {p.stderr.decode(errors='ignore')}")
-                return None
-            
-            # Create BytesIO and ensure it's at start
-            img_buffer = io.BytesIO(p.stdout)
-            img_buffer.seek(0)
-            img = Image.open(img_buffer).convert("RGBA")
-            crop = img.crop((x1, y1, x2, y2))
-            # Return BGRA bytes to match existing pixel loops
-            return crop.tobytes("raw", "BGRA")
-        except Exception as e:
-            log(f"[WAIT] ADB capture error ({self.adb_serial}): {e}")
+        x1, y1, x2, y2 = self.region
+        # Per-serial frame is shared with every other wait/find on this device
+        region = get_capture_manager().get_adb_region(self.adb_serial, x1, y1, x2, y2,
+                                                      max_age_ms=self.FRAME_MAX_AGE_MS)
+        if region is None:
+            log(f"[WAIT] ADB capture failed ({self.adb_serial})")
             return None
+        # Return BGRA bytes to match existing pixel loops
+        return region_to_bgra_bytes(region)
     
     def _capture_region(self) -> Optional[bytes]:
         """Capture region as raw pixel data"""
@@ -247,17 +360,14 @@ class WaitScreenChange(WaitAction):
                 log(f"[WAIT_SCREEN_CHANGE] Debug: Region coords (Android): ({x1},{y1})-({x2},{y2}), size: {x2-x1}x{y2-y1}")
                 return self._capture_region_adb()
             
-            # Convert client to screen coords if needed
+            # Window mode: slice from the shared per-window frame
             if self.target_hwnd:
-                pt1 = wintypes.POINT(x1, y1)
-                pt2 = wintypes.POINT(x2, y2)
-                user32.ClientToScreen(self.target_hwnd, ctypes.byref(pt1))
-                user32.ClientToScreen(self.target_hwnd, ctypes.byref(pt2))
-                log(f"[WAIT_SCREEN_CHANGE] Debug: Capture via MSS, client({x1},{y1})-({x2},{y2}) -> screen({pt1.x},{pt1.y})-({pt2.x},{pt2.y})")
-                x1, y1 = pt1.x, pt1.y
-                x2, y2 = pt2.x, pt2.y
-            else:
-                log(f"[WAIT_SCREEN_CHANGE] Debug: Capture via MSS, screen coords ({x1},{y1})-({x2},{y2})")
+                region = get_capture_manager().get_region(
+                    self.target_hwnd, x1, y1, x2, y2, max_age_ms=self.FRAME_MAX_AGE_MS
+                )
+                return region_to_bgra_bytes(region) if region is not None else None
+            
+            log(f"[WAIT_SCREEN_CHANGE] Debug: Capture via MSS, screen coords ({x1},{y1})-({x2},{y2})")
             
             with mss.mss() as sct:
                 monitor = {"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1}
@@ -275,26 +385,17 @@ class WaitScreenChange(WaitAction):
         if not data:
             return {}
         
-        from collections import Counter
-        
-        color_counts = Counter()
         total_pixels = len(data) // 4
         
-        # Sample every pixel (BGRA format)
-        for i in range(0, len(data), 4):
-            b, g, r = data[i], data[i+1], data[i+2]
-            # Group similar colors (round to reduce noise)
-            r_rounded = (r // 10) * 10
-            g_rounded = (g // 10) * 10
-            b_rounded = (b // 10) * 10
-            color_counts[(r_rounded, g_rounded, b_rounded)] += 1
+        # Every pixel (BGRA format), similar colors grouped (rounded down to 10s)
+        colors, counts = pixel_stats.color_counts(data, step=10)
         
         # Get top 5 colors
-        top_colors = color_counts.most_common(5)
+        top_colors = pixel_stats.most_common(colors, counts, 5)
         
         result = {
             "total_pixels": total_pixels,
-            "unique_colors": len(color_counts),
+            "unique_colors": len(counts),
             "top_colors": [
                 {
                     "rgb": color,
@@ -312,35 +413,15 @@ class WaitScreenChange(WaitAction):
         if not data:
             return 0.0
         
-        match_count = 0
-        total_pixels = len(data) // 4
-        r_target, g_target, b_target = target_rgb
-        
-        for i in range(0, len(data), 4):
-            b, g, r = data[i], data[i+1], data[i+2]
-            
-            if (abs(r - r_target) <= tolerance and
-                abs(g - g_target) <= tolerance and
-                abs(b - b_target) <= tolerance):
-                match_count += 1
-        
-        return (match_count / total_pixels) if total_pixels > 0 else 0.0
+        return pixel_stats.match_ratio(data, [target_rgb], tolerance)
     
     def _calculate_difference(self, data1: bytes, data2: bytes) -> float:
         """Calculate difference ratio between two images"""
         if not data1 or not data2 or len(data1) != len(data2):
             return 1.0
         
-        diff_count = 0
-        total = len(data1)
-        
-        for i in range(0, total, 4):  # BGRA format
-            if (data1[i] != data2[i] or 
-                data1[i+1] != data2[i+1] or 
-                data1[i+2] != data2[i+2]):
-                diff_count += 1
-        
-        return diff_count / (total / 4)
+        # Fraction of BGRA pixels whose B, G or R changed
+        return pixel_stats.changed_ratio(data1, data2)
     
     def wait(self, stop_event: threading.Event) -> WaitResult:
         """Wait until screen region changes"""
@@ -371,27 +452,21 @@ class WaitScreenChange(WaitAction):
         start_time = time.time()
         check_interval = 50  # Check every 50ms (faster detection)
         check_count = 0
-        
-        while True:
-            if stop_event.is_set():
-                return WaitResult(success=False, message="Stopped by user")
-            
-            # Check timeout
+        last_diff = None
+        # Fixed cadence: a change shorter than a backed-off interval would be
+        # missed. The poller still applies the global check cap.
+        poller = Poller(make_policy(check_interval))
+        
+        def check(current_data: bytes) -> Optional[WaitResult]:
+            """One poll of the region; a WaitResult ends the wait"""
+            nonlocal check_count, last_diff
             elapsed = (time.time() - start_time) * 1000
-            if elapsed >= self.timeout_ms:
-                log(f"[WAIT_SCREEN_CHANGE] ✗ TIMEOUT after {elapsed:.0f}ms ({check_count} checks)")
-                return WaitResult(success=False, timeout=True,
-                                  message=f"No change detected within {self.timeout_ms}ms")
-            
-            # Capture current state
-            current_data = self._capture_region()
-            if not current_data:
-                time.sleep(check_interval / 1000.0)
-                continue
             
             # Calculate difference
             diff = self._calculate_difference(initial_data, current_data)
             check_count += 1
+            poller.observe(last_diff is not None and diff != last_diff)
+            last_diff = diff
             
             # Check if changed - IMMEDIATELY return on detection
             if diff >= self.threshold:
@@ -407,8 +482,38 @@ class WaitScreenChange(WaitAction):
                     rgb = top_color.get('rgb', (0,0,0))
                     pct = top_color.get('percentage', 0)
                     log(f"[WAIT_SCREEN_CHANGE] Check #{check_count}: {diff*100:.2f}% changed | Top: RGB{rgb} ({pct:.0f}%)")
+            return None
             
-            time.sleep(check_interval / 1000.0)
+        timeout_result = WaitResult(success=False, timeout=True,
+                                    message=f"No change detected within {self.timeout_ms}ms")
+        
+        # Window mode: the window's watch scheduler owns the capture cadence
+        if self.target_hwnd and not self.adb_serial:
+            return _watch_region(self.target_hwnd, self.region, check, self.timeout_ms,
+                                 check_interval, stop_event, timeout_result, "WaitScreenChange",
+                                 poller)
+        
+        while True:
+            if stop_event.is_set():
+                return WaitResult(success=False, message="Stopped by user")
+            
+            # Check timeout
+            elapsed = (time.time() - start_time) * 1000
+            if elapsed >= self.timeout_ms:
+                log(f"[WAIT_SCREEN_CHANGE] ✗ TIMEOUT after {elapsed:.0f}ms ({check_count} checks)")
+                return timeout_result
+            
+            # Capture current state
+            current_data = self._capture_region()
+            if not current_data:
+                time.sleep(check_interval / 1000.0)
+                continue
+            
+            result = check(current_data)
+            if result is not None:
+                return result
+            
+            poller.sleep(stop_event, limit_ms=self.timeout_ms - (time.time() - start_time) * 1000)
 
 
 class WaitColorDisappear(WaitAction):
@@ -417,6 +522,9 @@ class WaitColorDisappear(WaitAction):
     Supports auto-detect mode to track multiple top colors automatically
     """
     
+    FRAME_MAX_AGE_MS = 100  # Reuse shared window frame up to half a poll old
+    MAX_INTERVAL_MS = 1000  # Slowest poll while the tracked percentage holds still
+    
     def __init__(self,
                  region: Tuple[int, int, int, int],
                  target_rgb: Tuple[int, int, int] = None,
@@ -456,38 +564,31 @@ class WaitColorDisappear(WaitAction):
         self.adb_serial = adb_serial
         self.tracked_colors = []  # Will be populated if auto_detect=True
     
+    def _make_poller(self, check_interval: int) -> Poller:
+        """
+        Pacing of the color checks. A stable-count exit counts checks, so it
+        keeps the fixed cadence: backing off (or bursting) would change how
+        long N identical checks take and skip short reappearances.
+        """
+        if self.stable_count_exit > 0:
+            return Poller(make_policy(check_interval))
+        # Backs off to MAX_INTERVAL_MS while the tracked percentage holds still
+        return Poller(make_policy(check_interval, min_ms=100, max_ms=self.MAX_INTERVAL_MS))
+    
     def _capture_region_adb(self) -> Optional[bytes]:
-        """Capture region using ADB screencap (region is in emulator coordinates)."""
-        try:
-            from PIL import Image
-        except ImportError:
-            log("[WAIT_COLOR] Pillow not installed; cannot use ADB capture. Install: pip install pillow")
-            return None
-        
-        x1, y1, x2, y2 = self.region
+        """Capture region using ADB raw screencap (region is in emulator coordinates)."""
         if not self.adb_serial:
             return None
         
-        try:
-            p = run_hidden(
-                ["adb", "-s", self.adb_serial, "exec-out", "screencap", "-p"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=5
-            )
-            if p.returncode != 0 or not p.stdout:
-                log(f"[WAIT_COLOR] ADB screencap failed ({self.adb_serial}): {p.stderr.decode(errors='ignore')}")
-                return None
-            
-            # Create BytesIO and ensure it's at start
-            img_buffer = io.BytesIO(p.stdout)
-            img_buffer.seek(0)
-            img = Image.open(img_buffer).convert("RGBA")
-            crop = img.crop((x1, y1, x2, y2))
-            return crop.tobytes("raw", "BGRA")
-        except Exception as e:
-            log(f"[WAIT_COLOR] ADB capture error ({self.adb_serial}): {e}")
+        x1, y1, x2, y2 = self.region
+        # Per-serial frame is shared with every other wait/find on this device
+        region = get_capture_manager().get_adb_region(self.adb_serial, x1, y1, x2, y2,
+                                                      max_age_ms=self.FRAME_MAX_AGE_MS)
+        if region is None:
+            log(f"[WAIT_COLOR] ADB capture failed ({self.adb_serial})")
             return None
+        # Return BGRA bytes to match existing pixel loops
+        return region_to_bgra_bytes(region)
     
     def _capture_region(self) -> Optional[bytes]:
         """Capture region as raw pixel data"""
@@ -501,14 +602,12 @@ class WaitColorDisappear(WaitAction):
                 log(f"[WAIT_COLOR_DISAPPEAR] Debug: Capture source: ADB ({self.adb_serial}), region: {self.region}")
                 return self._capture_region_adb()
             
-            # Convert client to screen coords if needed
+            # Window mode: slice from the shared per-window frame
             if self.target_hwnd:
-                pt1 = wintypes.POINT(x1, y1)
-                pt2 = wintypes.POINT(x2, y2)
-                user32.ClientToScreen(self.target_hwnd, ctypes.byref(pt1))
-                user32.ClientToScreen(self.target_hwnd, ctypes.byref(pt2))
-                x1, y1 = pt1.x, pt1.y
-                x2, y2 = pt2.x, pt2.y
+                region = get_capture_manager().get_region(
+                    self.target_hwnd, x1, y1, x2, y2, max_age_ms=self.FRAME_MAX_AGE_MS
+                )
+                return region_to_bgra_bytes(region) if region is not None else None
             
             log(f"[WAIT_COLOR_DISAPPEAR] Debug: Capture coords: ({x1}, {y1}) → ({x2}, {y2}), size: {x2-x1}x{y2-y1}")
             
@@ -525,26 +624,14 @@ class WaitColorDisappear(WaitAction):
         if not data:
             return []
         
-        from collections import Counter
-        
-        color_counts = Counter()
-        
-        # Sample every pixel (BGRA format)
-        for i in range(0, len(data), 4):
-            b, g, r = data[i], data[i+1], data[i+2]
-            # Don't round - use exact colors to avoid everything becoming (0,0,0)
-            color_counts[(r, g, b)] += 1
-        
-        # Filter out pure black/white (likely background)
-        filtered_colors = [(color, cnt) for color, cnt in color_counts.items() 
-                          if color != (0, 0, 0) and color != (255, 255, 255)]
-        
-        # If all colors filtered, use original
-        if not filtered_colors:
-            filtered_colors = list(color_counts.items())
+        # Every pixel (BGRA format); don't round - use exact colors to avoid
+        # everything becoming (0,0,0)
+        colors, counts = pixel_stats.color_counts(data)
         
-        # Get top N colors
-        top_colors = sorted(filtered_colors, key=lambda x: x[1], reverse=True)[:count]
+        # Get top N colors, filtering out pure black/white (likely background)
+        # unless that would filter everything
+        top_colors = pixel_stats.most_common(colors, counts, count,
+                                             exclude=((0, 0, 0), (255, 255, 255)))
         total_pixels = len(data) // 4
         
         result = []
@@ -557,10 +644,10 @@ class WaitColorDisappear(WaitAction):
             })
         
         # Log all unique colors for debugging
-        log(f"[WAIT_COLOR_DISAPPEAR] Debug: Total unique colors in region: {len(color_counts)}")
-        if len(color_counts) <= 20:
+        log(f"[WAIT_COLOR_DISAPPEAR] Debug: Total unique colors in region: {len(counts)}")
+        if len(counts) <= 20:
             log(f"[WAIT_COLOR_DISAPPEAR] Debug: All colors found:")
-            for idx, (color, cnt) in enumerate(sorted(color_counts.items(), key=lambda x: x[1], reverse=True)[:20], 1):
+            for idx, (color, cnt) in enumerate(pixel_stats.most_common(colors, counts, 20), 1):
                 pct = (cnt / total_pixels) * 100
                 log(f"    {idx}. RGB{color} → {pct:.2f}%")
         
@@ -571,42 +658,17 @@ class WaitColorDisappear(WaitAction):
         if not data:
             return 0.0
         
-        # If auto-detect mode, count all tracked colors
+        # If auto-detect mode, count all tracked colors (a pixel matching
+        # several counts once)
         if self.auto_detect and self.tracked_colors:
-            match_count = 0
-            total_pixels = len(data) // 4
-            
-            for i in range(0, len(data), 4):
-                b, g, r = data[i], data[i+1], data[i+2]
-                
-                # Check if pixel matches any tracked color
-                for color_info in self.tracked_colors:
-                    r_target, g_target, b_target = color_info["rgb"]
-                    if (abs(r - r_target) <= self.tolerance and
-                        abs(g - g_target) <= self.tolerance and
-                        abs(b - b_target) <= self.tolerance):
-                        match_count += 1
-                        break  # Don't double-count same pixel
-            
-            return (match_count / total_pixels) if total_pixels > 0 else 0.0
+            tracked = [color_info["rgb"] for color_info in self.tracked_colors]
+            return pixel_stats.match_ratio(data, tracked, self.tolerance)
         
         # Manual mode - count single color
         if target_rgb is None:
             target_rgb = self.target_rgb
         
-        match_count = 0
-        total_pixels = len(data) // 4
-        r_target, g_target, b_target = target_rgb
-        
-        for i in range(0, len(data), 4):
-            b, g, r = data[i], data[i+1], data[i+2]
-            
-            if (abs(r - r_target) <= self.tolerance and
-                abs(g - g_target) <= self.tolerance and
-                abs(b - b_target) <= self.tolerance):
-                match_count += 1
-        
-        return (match_count / total_pixels) if total_pixels > 0 else 0.0
+        return pixel_stats.match_ratio(data, [target_rgb], self.tolerance)
     
     def wait(self, stop_event: threading.Event) -> WaitResult:
         """Wait until target color(s) disappear"""
@@ -633,52 +695,44 @@ class WaitColorDisappear(WaitAction):
                 if not data:
                     return WaitResult(success=False, message="Failed to capture sample")
                 
-                # Count percentage for each unique color
-                from collections import Counter
-                color_counts = Counter()
-                for j in range(0, len(data), 4):
-                    b, g, r = data[j], data[j+1], data[j+2]
-                    color_counts[(r, g, b)] += 1
+                # Color histogram of this sample (packed 24-bit codes, one pass)
+                colors, counts = pixel_stats.color_counts(data)
+                samples.append((colors, counts, len(data) // 4))
                 
-                total_pixels = len(data) // 4
-                color_percentages = {color: (count / total_pixels) * 100 
-                                   for color, count in color_counts.items()}
-                samples.append(color_percentages)
-                
-                log(f"[WAIT_COLOR_DISAPPEAR] Sample {i+1}/{self.sample_count}: {len(color_counts)} unique colors")
+                log(f"[WAIT_COLOR_DISAPPEAR] Sample {i+1}/{self.sample_count}: {len(counts)} unique colors")
                 
                 if i < self.sample_count - 1:  # Don't sleep after last sample
                     time.sleep(sample_interval)
             
-            # Calculate variance for each color
-            all_colors = set()
-            for sample in samples:
-                all_colors.update(sample.keys())
-            
-            color_variances = {}
-            for color in all_colors:
-                # Get percentages across all 5 samples (0 if color not present)
-                percentages = [sample.get(color, 0.0) for sample in samples]
-                avg = sum(percentages) / len(percentages)
-                variance = sum((p - avg) ** 2 for p in percentages) / len(percentages)
-                color_variances[color] = {
-                    'variance': variance,
-                    'avg_percentage': avg,
-                    'percentages': percentages
-                }
+            # Variance of each color's percentage across all samples (0 where absent)
+            colors, avg_percentages, variances = pixel_stats.color_variance(samples)
             
             # Filter: Only keep colors with HIGH variance (animated = spin arc)
-            # Static colors (background) have variance ~0
+            # Static colors (background) have variance ~0; also drop black/white
             variance_threshold = 1.0  # Colors with variance > 1.0% are animated
-            animated_colors = [(color, data) for color, data in color_variances.items() 
-                             if data['variance'] > variance_threshold]
+            keep = variances > variance_threshold
+            for excluded in ((0, 0, 0), (255, 255, 255)):
+                keep &= ~np.all(colors == excluded, axis=1)
+            candidates = np.flatnonzero(keep)
             
             # Sort by variance (most animated first)
-            animated_colors.sort(key=lambda x: x[1]['variance'], reverse=True)
+            candidates = candidates[np.argsort(-variances[candidates], kind="stable")]
+            head = variances[candidates[:self.auto_detect_count + 1]]
+            if np.any(head[1:] == head[:-1]):
+                # Exact ties: order them like the original set-based pass did
+                rank = pixel_stats.union_order(samples)
+                candidates = np.array(sorted(
+                    candidates.tolist(),
+                    key=lambda k: (-variances[k], rank[tuple(colors[k].tolist())])
+                ), dtype=np.intp)
             
-            # Filter out black/white
-            animated_colors = [(color, data) for color, data in animated_colors
-                             if color != (0, 0, 0) and color != (255, 255, 255)]
+            animated_colors = [
+                (tuple(colors[k].tolist()), {
+                    'variance': float(variances[k]),
+                    'avg_percentage': float(avg_percentages[k]),
+                })
+                for k in candidates[:self.auto_detect_count]
+            ]
             
             if not animated_colors:
                 log(f"[WAIT_COLOR_DISAPPEAR] ⚠️ No animated colors found (all colors static)")
@@ -730,26 +784,19 @@ class WaitColorDisappear(WaitAction):
         last_pct = None
         identical_count = 0
         
-        while True:
-            if stop_event.is_set():
-                return WaitResult(success=False, message="Stopped by user")
+        previous_pct = None
+        poller = self._make_poller(check_interval)
             
-            # Check timeout
+        def check(current_data: bytes) -> Optional[WaitResult]:
+            """One poll of the region; a WaitResult ends the wait"""
+            nonlocal check_count, last_pct, identical_count, previous_pct
             elapsed = (time.time() - start_time) * 1000
-            if elapsed >= self.timeout_ms:
-                log(f"[WAIT_COLOR_DISAPPEAR] ✗ TIMEOUT after {elapsed:.0f}ms")
-                return WaitResult(success=False, timeout=True,
-                                  message=f"Color did not disappear within {self.timeout_ms}ms")
-            
-            # Capture and check color percentage
-            current_data = self._capture_region()
-            if not current_data:
-                time.sleep(check_interval / 1000.0)
-                continue
             
             color_pct = self._count_color_pixels(current_data)
             check_count += 1
             recent_pcts.append(color_pct)
+            poller.observe(previous_pct is not None and color_pct != previous_pct)
+            previous_pct = color_pct
             
             # Track identical consecutive values
             if self.stable_count_exit > 0:
@@ -796,8 +843,38 @@ class WaitColorDisappear(WaitAction):
                 log(f"[WAIT_COLOR_DISAPPEAR] ✓ COLOR DISAPPEARED! {color_pct*100:.2f}% after {elapsed:.0f}ms")
                 return WaitResult(success=True,
                                   message=f"Color disappeared: {color_pct:.2%} remaining")
+            return None
             
-            time.sleep(check_interval / 1000.0)
+        timeout_result = WaitResult(success=False, timeout=True,
+                                    message=f"Color did not disappear within {self.timeout_ms}ms")
+        
+        # Window mode: the window's watch scheduler owns the capture cadence
+        if self.target_hwnd and not self.adb_serial:
+            return _watch_region(self.target_hwnd, self.region, check, self.timeout_ms,
+                                 check_interval, stop_event, timeout_result, "WaitColorDisappear",
+                                 poller)
+        
+        while True:
+            if stop_event.is_set():
+                return WaitResult(success=False, message="Stopped by user")
+            
+            # Check timeout
+            elapsed = (time.time() - start_time) * 1000
+            if elapsed >= self.timeout_ms:
+                log(f"[WAIT_COLOR_DISAPPEAR] ✗ TIMEOUT after {elapsed:.0f}ms")
+                return timeout_result
+            
+            # Capture and check color percentage
+            current_data = self._capture_region()
+            if not current_data:
+                time.sleep(check_interval / 1000.0)
+                continue
+            
+            result = check(current_data)
+            if result is not None:
+                return result
+            
+            poller.sleep(stop_event, limit_ms=self.timeout_ms - (time.time() - start_time) * 1000)
 
 
 class WaitHotkey(WaitAction):
@@ -942,6 +1019,16 @@ class WaitFile(WaitAction):
         self.condition = condition
         self.timeout_ms = timeout_ms
     
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the file or of its folder (activity signal for polling)"""
+        for path in (self.path, os.path.dirname(os.path.abspath(self.path))):
+            try:
+                st = os.stat(path)
+                return st.st_mtime_ns, st.st_size
+            except OSError:
+                continue
+        return None
+    
     def wait(self, stop_event: threading.Event) -> WaitResult:
         """Wait for file condition"""
         log(f"[WAIT] WaitFile: {self.path} condition={self.condition}")
@@ -956,7 +1043,9 @@ class WaitFile(WaitAction):
                                   message=f"File does not exist: {self.path}")
         
         start_time = time.time()
-        check_interval = 500  # Check every 500ms
+        check_interval = 500  # Check every 500ms, backing off to 2s while nothing happens
+        poller = Poller(make_policy(check_interval, min_ms=250, max_ms=2000))
+        last_state = None
         
         while True:
             if stop_event.is_set():
@@ -969,6 +1058,9 @@ class WaitFile(WaitAction):
                                   message=f"Timeout after {self.timeout_ms}ms")
             
             file_exists = os.path.exists(self.path)
+            state = self._file_state()
+            poller.observe(last_state is not None and state != last_state)
+            last_state = state
             
             if self.condition == self.CONDITION_EXISTS:
                 if file_exists:
@@ -987,7 +1079,144 @@ class WaitFile(WaitAction):
                         return WaitResult(success=True,
                                           message=f"File modified: {self.path}")
             
-            time.sleep(check_interval / 1000.0)
+            poller.sleep(stop_event, limit_ms=self.timeout_ms - (time.time() - start_time) * 1000)
+
+
+class WaitAnyImage(WaitAction):
+    """
+    Wait until the first of N templates appears.
+    Replaces chains of FIND_IMAGE + goto polling the same screen: every
+    tick captures once and matches all templates against that frame
+    (image_actions.find_many). In window mode the checks run on the
+    window's watch scheduler, sharing its frame with other waits.
+    
+    On success, result.data = {"index": i, "template_path": path, "match": ImageMatch}
+    """
+    
+    MAX_INTERVAL_MS = 800
+    
+    def __init__(self,
+                 template_paths: list,
+                 threshold: float = 0.8,
+                 timeout_ms: int = 30000,
+                 target_hwnd: int = 0,
+                 region: Optional[Tuple[int, int, int, int]] = None,
+                 engine: str = "full",
+                 interval_ms: int = 100):
+        """
+        Args:
+            template_paths: Templates in priority order (earlier wins a tie)
+            threshold: Confidence threshold (0.0 - 1.0)
+            timeout_ms: Timeout in milliseconds
+            target_hwnd: Target window handle (0 for screen)
+            region: (x1, y1, x2, y2) search region or None for the full window
+            engine: Matching engine ("full" or "pyramid")
+            interval_ms: Delay between checks (backs off while the area is static)
+        """
+        self.template_paths = list(template_paths)
+        self.threshold = threshold
+        self.timeout_ms = timeout_ms
+        self.target_hwnd = target_hwnd
+        self.region = region
+        self.engine = engine
+        self.interval_ms = interval_ms
+    
+    def wait(self, stop_event: threading.Event) -> WaitResult:
+        """Wait for any template to appear"""
+        from core.image_actions import FindImage, find_many
+        
+        log(f"[WAIT] WaitAnyImage: {len(self.template_paths)} templates, threshold={self.threshold}")
+        
+        if not self.template_paths:
+            return WaitResult(success=False, message="No templates")
+        
+        finders = [
+            FindImage(template_path=path, region=self.region, threshold=self.threshold,
+                      target_hwnd=self.target_hwnd, engine=self.engine)
+            for path in self.template_paths
+        ]
+        
+        start_time = time.time()
+        # Backs off to MAX_INTERVAL_MS while the search area is static
+        poller = Poller(make_policy(self.interval_ms, min_ms=50, max_ms=self.MAX_INTERVAL_MS))
+        
+        # Window mode: one shared frame per tick from the window's watch scheduler
+        if self.target_hwnd:
+            future = get_watch_scheduler(self.target_hwnd).watch(
+                template_present(self.target_hwnd, finders, self.region, poller=poller),
+                timeout_ms=self.timeout_ms, interval_ms=self.interval_ms,
+                name="WaitAnyImage", poller=poller
+            )
+            result = wait_for(future, stop_event)
+            if result.fired:
+                i, match = result.value
+                return self._found(i, match)
+            if result.timeout:
+                return WaitResult(success=False, timeout=True,
+                                  message=f"Timeout after {self.timeout_ms}ms")
+            return WaitResult(success=False, message="Stopped by user")
+        
+        change = FrameChangeDetector()
+        while True:
+            if stop_event and stop_event.is_set():
+                return WaitResult(success=False, message="Stopped by user")
+            
+            # Check timeout
+            elapsed = (time.time() - start_time) * 1000
+            if elapsed >= self.timeout_ms:
+                return WaitResult(success=False, timeout=True,
+                                  message=f"Timeout after {self.timeout_ms}ms")
+            
+            # One grab per poll, shared by every template
+            area = finders[0]._grab_search_area()
+            if area is not None:
+                screen, offset_x, offset_y = area
+                poller.observe(change.changed(screen))
+                
+                matches = find_many(finders, frame=screen, offset=(offset_x, offset_y),
+                                    first_only=True)
+                for i, match in enumerate(matches):
+                    if match.found:
+                        return self._found(i, match)
+            
+            poller.sleep(stop_event, limit_ms=self.timeout_ms - (time.time() - start_time) * 1000)
+    
+    def _found(self, i: int, match) -> WaitResult:
+        path = self.template_paths[i]
+        log(f"[WAIT] WaitAnyImage: #{i} {path} at ({match.x}, {match.y})")
+        return WaitResult(
+            success=True,
+            message=f"Found #{i}: {path}",
+            data={"index": i, "template_path": path, "match": match}
+        )
+
+
+def signature_from_params(params: dict) -> Optional[PixelSignature]:
+    """
+    PixelSignature from WaitPixelSignature params.
+    
+    Either explicit "probes" ([x, y, rgb, tolerance?] or dicts), or a
+    "reference_path" image to auto-sample "sample_count" probes from, placed
+    at "origin" (x, y). "mode" / "k" / "tolerance" apply to both.
+    """
+    mode = params.get("mode", "all")
+    k = params.get("k")
+    tolerance = params.get("tolerance", 10)
+    
+    if params.get("probes"):
+        return PixelSignature.from_params(params["probes"], mode=mode, k=k, tolerance=tolerance)
+    
+    reference = params.get("reference_path")
+    if reference:
+        origin = tuple(params.get("origin", (0, 0)))
+        signature = load_signature(reference, origin=origin, count=params.get("sample_count", 16),
+                                   tolerance=tolerance, mode=mode, k=k)
+        if signature is None:
+            log(f"[WAIT] Could not sample signature from {reference}")
+        return signature
+    
+    log("[WAIT] WaitPixelSignature needs probes or reference_path")
+    return None
 
 
 def create_wait_action(action_type: str, params: dict) -> Optional[WaitAction]:
@@ -1023,6 +1252,17 @@ def create_wait_action(action_type: str, params: dict) -> Optional[WaitAction]:
                 target_hwnd=params.get("target_hwnd", 0)
             )
         
+        elif action_type == "WaitPixelSignature":
+            signature = signature_from_params(params)
+            if signature is None:
+                return None
+            return WaitPixelSignature(
+                signature=signature,
+                timeout_ms=params.get("timeout_ms", 30000),
+                target_hwnd=params.get("target_hwnd", 0),
+                interval_ms=params.get("interval_ms", 100)
+            )
+        
         elif action_type == "WaitScreenChange":
             region = params.get("region", (0, 0, 100, 100))
             if isinstance(region, list):
@@ -1047,6 +1287,20 @@ def create_wait_action(action_type: str, params: dict) -> Optional[WaitAction]:
                 timeout_ms=params.get("timeout_ms", 30000)
             )
         
+        elif action_type == "WaitAnyImage":
+            region = params.get("region")
+            if isinstance(region, list):
+                region = tuple(region)
+            return WaitAnyImage(
+                template_paths=params.get("template_paths", []),
+                threshold=params.get("threshold", 0.8),
+                timeout_ms=params.get("timeout_ms", 30000),
+                target_hwnd=params.get("target_hwnd", 0),
+                region=region,
+                engine=params.get("engine", "full"),
+                interval_ms=params.get("interval_ms", 100)
+            )
+        
         else:
             log(f"[WAIT] Unknown wait action type: {action_type}")
             return None
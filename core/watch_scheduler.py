@@ -0,0 +1,419 @@
+"""
+Watch scheduler
+One capture cadence per window, shared by every wait polling it.
+
+Instead of each wait running its own sleep/capture/check loop, waits
+register a predicate. Each tick the scheduler grabs ONE frame and
+evaluates every watch that is due against it, then resolves the watches
+whose predicate fired or whose timeout passed. Waiters block on their
+WatchFuture.
+
+Usage:
+    scheduler = get_watch_scheduler(hwnd)
+    future = scheduler.watch(pixel_color(120, 45, (255, 0, 0), 10), timeout_ms=5000)
+    result = future.result()
+    if result.fired:
+        r, g, b = result.value
+
+The frame source and the clock are injectable, so a scheduler can be
+driven deterministically by calling tick() with a fake frame source and
+a virtual clock (no background thread needed).
+"""
+
+from typing import Optional, Callable, Any, Tuple, List
+from dataclasses import dataclass
+import threading
+import time
+import numpy as np
+
+from core.capture import Frame, get_capture_manager
+from core.polling import Poller
+from utils.logger import log
+
+
+# A predicate returns None while waiting; anything else fires the watch
+# and becomes WatchResult.value
+Predicate = Callable[[Frame], Any]
+
+DEFAULT_TICK_MS = 50
+
+
+@dataclass
+class WatchResult:
+    """Outcome of one watch"""
+    fired: bool
+    timeout: bool = False
+    cancelled: bool = False
+    value: Any = None  # predicate result when fired
+    elapsed_ms: float = 0.0
+    checks: int = 0  # frames the predicate was evaluated on
+
+
+class WatchFuture:
+    """Handle of a registered watch; resolved exactly once by the scheduler"""
+    
+    def __init__(self, scheduler: 'WatchScheduler', predicate: Predicate,
+                 start: float, deadline: Optional[float], interval: float, name: str,
+                 poller: Optional[Poller] = None):
+        self.name = name
+        self._scheduler = scheduler
+        self._predicate = predicate
+        self._start = start
+        self._deadline = deadline  # scheduler clock; None = no timeout
+        self._interval = interval
+        self._poller = poller  # adaptive spacing instead of the fixed interval
+        self._next_check = start
+        self._checks = 0
+        self._result: Optional[WatchResult] = None
+        self._done = threading.Event()
+    
+    def done(self) -> bool:
+        return self._done.is_set()
+    
+    def wait(self, timeout: float = None) -> bool:
+        """Block until resolved (timeout in real seconds). Returns done()."""
+        return self._done.wait(timeout)
+    
+    def result(self, timeout: float = None) -> Optional[WatchResult]:
+        """WatchResult once resolved, None if still pending after timeout"""
+        self._done.wait(timeout)
+        return self._result
+    
+    def cancel(self) -> bool:
+        """Stop watching. Returns False if the watch already resolved."""
+        return self._scheduler._resolve(self, WatchResult(fired=False, cancelled=True))
+    
+    def _set(self, result: WatchResult) -> bool:
+        if self._result is not None:
+            return False
+        result.checks = self._checks
+        self._result = result
+        self._done.set()
+        return True
+
+
+class WatchScheduler:
+    """
+    Evaluates all active watches of one frame source per tick.
+    
+    - tick(): one scheduling step (expire, grab one frame if any watch is
+      due, evaluate due predicates); returns the clock time of the next
+      due check or deadline
+    - start(): background thread that ticks while watches are active and
+      sleeps on a condition otherwise
+    """
+    
+    def __init__(self, frame_source: Callable[[], Optional[Frame]],
+                 tick_ms: float = DEFAULT_TICK_MS,
+                 clock: Callable[[], float] = time.monotonic,
+                 name: str = ""):
+        """
+        Args:
+            frame_source: Returns the current Frame (or None if unavailable)
+            tick_ms: Default (and fastest) evaluation interval
+            clock: Time source in seconds; a virtual clock for tests
+            name: Log label
+        """
+        self.frame_source = frame_source
+        self.tick_ms = tick_ms
+        self.clock = clock
+        self.name = name
+        
+        self._watches: List[WatchFuture] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        
+        self.ticks = 0
+        self.frames = 0  # frames grabbed (at most one per tick)
+        self.evaluations = 0
+        self.fired = 0
+        self.timeouts = 0
+    
+    def watch(self, predicate: Predicate, timeout_ms: float = None,
+              interval_ms: float = None, name: str = "",
+              poller: Optional[Poller] = None) -> WatchFuture:
+        """
+        Register a predicate.
+        
+        Args:
+            predicate: Called with the tick's Frame; return None to keep
+                       waiting, anything else to fire
+            timeout_ms: Resolve as timeout after this long (None = never)
+            interval_ms: Minimum spacing between evaluations of this watch
+                         (default tick_ms); slower waits keep their cadence
+            name: Log label
+            poller: Adaptive pacing (core.polling); overrides interval_ms.
+                    The predicate reports changes via poller.observe()
+        """
+        now = self.clock()
+        deadline = now + timeout_ms / 1000.0 if timeout_ms is not None else None
+        interval = max(interval_ms if interval_ms is not None else self.tick_ms, 0) / 1000.0
+        future = WatchFuture(self, predicate, now, deadline, interval, name, poller)
+        with self._cond:
+            self._watches.append(future)
+            self._cond.notify_all()
+        return future
+    
+    @property
+    def active(self) -> int:
+        with self._cond:
+            return len(self._watches)
+    
+    def _resolve(self, future: WatchFuture, result: WatchResult) -> bool:
+        with self._cond:
+            if future in self._watches:
+                self._watches.remove(future)
+            result.elapsed_ms = (self.clock() - future._start) * 1000
+            return future._set(result)
+    
+    def tick(self) -> Optional[float]:
+        """
+        One scheduling step.
+        
+        Returns:
+            Clock time of the next due check/deadline, None if idle
+        """
+        now = self.clock()
+        self.ticks += 1
+        
+        with self._cond:
+            watches = list(self._watches)
+        
+        # Timeouts are decided before looking at a new frame (like the old loops)
+        due = []
+        for future in watches:
+            if future._deadline is not None and now >= future._deadline:
+                if self._resolve(future, WatchResult(fired=False, timeout=True)):
+                    self.timeouts += 1
+            elif now >= future._next_check:
+                due.append(future)
+        
+        if due:
+            frame = None
+            try:
+                frame = self.frame_source()
+            except Exception as e:
+                log(f"[WATCH] {self.name} frame source error: {e}")
+            if frame is not None:
+                self.frames += 1
+            
+            for future in due:
+                poller = future._poller
+                future._next_check = now + future._interval
+                if frame is None or future.done():
+                    continue
+                if poller is not None and not poller.acquire():
+                    # Over the global check cap: retry when a slot frees up
+                    future._next_check = now + poller.budget.retry_after()
+                    continue
+                
+                future._checks += 1
+                self.evaluations += 1
+                try:
+                    value = future._predicate(frame)
+                except Exception as e:
+                    log(f"[WATCH] {self.name} predicate '{future.name}' error: {e}")
+                    continue
+                if value is not None and self._resolve(future, WatchResult(fired=True, value=value)):
+                    self.fired += 1
+                elif poller is not None:
+                    future._next_check = now + poller.interval_ms() / 1000.0
+        
+        with self._cond:
+            times = [f._next_check for f in self._watches]
+            times += [f._deadline for f in self._watches if f._deadline is not None]
+        return min(times) if times else None
+    
+    def start(self):
+        """Run tick() on a daemon thread until stop()"""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name=f"watch-{self.name}")
+            self._thread.start()
+    
+    def stop(self, cancel: bool = True):
+        """Stop the thread; pending watches are cancelled unless cancel=False"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+            pending = list(self._watches) if cancel else []
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._thread = None
+        for future in pending:
+            future.cancel()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._watches and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+            
+            next_due = self.tick()
+            
+            with self._cond:
+                if self._stopping:
+                    return
+                if next_due is not None:
+                    delay = next_due - self.clock()
+                    if delay > 0:
+                        # New watches notify, so they get their first check right away
+                        self._cond.wait(timeout=delay)
+    
+    def stats(self) -> dict:
+        """
+        Returns:
+            {"active", "ticks", "frames", "evaluations", "fired", "timeouts",
+             "evaluations_per_frame"}
+        """
+        return {
+            "active": self.active,
+            "ticks": self.ticks,
+            "frames": self.frames,
+            "evaluations": self.evaluations,
+            "fired": self.fired,
+            "timeouts": self.timeouts,
+            "evaluations_per_frame": self.evaluations / self.frames if self.frames else 0.0,
+        }
+
+
+# ==================== PREDICATES ====================
+
+def crop(frame: Frame, region: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+    """Region (x1, y1, x2, y2, client coords) of frame, clipped like CaptureManager.get_region"""
+    x1, y1, x2, y2 = region
+    x1 = max(0, min(x1, frame.width))
+    x2 = max(0, min(x2, frame.width))
+    y1 = max(0, min(y1, frame.height))
+    y2 = max(0, min(y2, frame.height))
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return frame.pixels[y1:y2, x1:x2]
+
+
+def pixel_color(x: int, y: int, expected_rgb: Tuple[int, int, int],
+                tolerance: int = 0) -> Predicate:
+    """Fires with (r, g, b) when pixel (x, y) is within tolerance per channel"""
+    r_target, g_target, b_target = expected_rgb
+    
+    def check(frame: Frame):
+        if not (0 <= x < frame.width and 0 <= y < frame.height):
+            return None
+        b, g, r = (int(c) for c in frame.pixels[y, x, :3])
+        if (abs(r - r_target) <= tolerance and
+                abs(g - g_target) <= tolerance and
+                abs(b - b_target) <= tolerance):
+            return (r, g, b)
+        return None
+    return check
+
+
+def signature_matches(signature) -> Predicate:
+    """Fires with the matching probe count once a PixelSignature matches"""
+    def check(frame: Frame):
+        matched, hits = signature.check(frame.pixels)
+        return hits if matched else None
+    return check
+
+
+def template_present(hwnd: int, templates: List, region: Optional[Tuple[int, int, int, int]] = None,
+                     threshold: float = 0.8, engine: str = "full",
+                     poller: Optional[Poller] = None) -> Predicate:
+    """
+    Fires with (index, ImageMatch) once the first of templates is found in
+    region of the frame (image_actions.find_many, one pass for all).
+    
+    Args:
+        hwnd: Window the frames come from (hot-region memory key)
+        templates: Template paths or configured FindImage objects
+        poller: Told whether the search area changed since the last check
+    """
+    from core.image_actions import FindImage, find_many
+    from core.polling import FrameChangeDetector
+    finders = [
+        t if isinstance(t, FindImage) else FindImage(
+            template_path=t, region=region, threshold=threshold,
+            target_hwnd=hwnd, engine=engine)
+        for t in templates
+    ]
+    change = FrameChangeDetector()
+    
+    def check(frame: Frame):
+        if region is not None:
+            screen = crop(frame, region)
+            if screen is None:
+                return None
+            offset = (max(0, region[0]), max(0, region[1]))
+        else:
+            screen, offset = frame.pixels, (0, 0)
+        if poller is not None:
+            poller.observe(change.changed(screen))
+        matches = find_many(finders, frame=screen, offset=offset, target_hwnd=hwnd, first_only=True)
+        for i, match in enumerate(matches):
+            if match.found:
+                return i, match
+        return None
+    return check
+
+
+# ==================== PER-WINDOW SCHEDULERS ====================
+
+_schedulers: dict = {}  # hwnd -> WatchScheduler
+_schedulers_lock = threading.Lock()
+
+
+def window_frame_source(hwnd: int, max_age_ms: float = DEFAULT_TICK_MS) -> Callable[[], Optional[Frame]]:
+    """Client-area frame of hwnd from the shared CaptureManager (one grab per tick)"""
+    def source() -> Optional[Frame]:
+        manager = get_capture_manager()
+        rect = manager.window_rect(hwnd)
+        if rect is None:
+            return None
+        return manager.get_frame(hwnd, *rect, ttl=max_age_ms / 1000.0)
+    return source
+
+
+def get_watch_scheduler(hwnd: int) -> WatchScheduler:
+    """Running scheduler for a window, created on first use"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(hwnd)
+        if scheduler is None:
+            scheduler = WatchScheduler(window_frame_source(hwnd), name=str(hwnd))
+            _schedulers[hwnd] = scheduler
+        scheduler.start()
+        return scheduler
+
+
+def release_watch_scheduler(hwnd: int = None):
+    """Stop a window's scheduler (or all), cancelling its pending watches"""
+    with _schedulers_lock:
+        if hwnd is None:
+            schedulers = list(_schedulers.values())
+            _schedulers.clear()
+        else:
+            scheduler = _schedulers.pop(hwnd, None)
+            schedulers = [scheduler] if scheduler is not None else []
+    for scheduler in schedulers:
+        scheduler.stop()
+
+
+def wait_for(future: WatchFuture, stop_event: Optional[threading.Event] = None,
+             is_stopped: Callable[[], bool] = None, poll_s: float = 0.05) -> WatchResult:
+    """
+    Block on a watch while honouring a stop signal.
+    
+    Returns:
+        The watch result, or a cancelled result if stopped first
+    """
+    while not future.wait(poll_s):
+        if (stop_event is not None and stop_event.is_set()) or (is_stopped is not None and is_stopped()):
+            future.cancel()
+            break
+    return future.result()
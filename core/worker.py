@@ -3,6 +3,7 @@ from core.adb_manager import ADBManager
 from core.models import Script, Command, CommandType, OnFailAction
 from core.emulator import EmulatorInstance, ClientRect
 from core.capture import get_capture_manager, CaptureManager, Frame
+from core.watch_scheduler import get_watch_scheduler, wait_for
 from core.input import InputManager, ButtonType as InputButtonType, HotKeyOrder
 from utils.logger import log
 import time
@@ -110,6 +111,12 @@ class WorkerStatus:
             adb_manager=adb,
             adb_serial=self.adb_device
         )
+        if adb.adb_path:
+            self._capture_manager.set_adb_path(adb.adb_path)
+        # Register client rect so batched capture can include this window
+        self._capture_manager.register_window(
+            self.hwnd, self.client_x, self.client_y, self.client_w, self.client_h
+        )
         log(f"[WORKER] {self.id}: Providers initialized (Capture: {self._capture_manager.active_provider_name})")
 
 class Worker(WorkerStatus):
@@ -159,6 +166,36 @@ class Worker(WorkerStatus):
         }
         return self._sct.grab(monitor)
 
+    def capture_frame(self, ttl: float = None, force_refresh: bool = False) -> Optional[Frame]:
+        """
+        Client area as a cached Frame (shared with other consumers of this
+        window, so derived views like frame.gray are computed once)
+        """
+        return self._capture_manager.get_frame(
+            hwnd=self.hwnd,
+            x=self.client_rect.x,
+            y=self.client_rect.y,
+            w=self.client_rect.w,
+            h=self.client_rect.h,
+            force_refresh=force_refresh,
+            ttl=ttl
+        )
+    
+    def start_background_capture(self, interval: float = None):
+        """
+        Opt-in: keep this window's frames fresh from a background producer
+        so Wait polling wakes on new frames instead of grabbing inline
+        """
+        self._capture_manager.start_producer(
+            self.hwnd,
+            self.client_rect.x, self.client_rect.y,
+            self.client_rect.w, self.client_rect.h,
+            interval=interval
+        )
+    
+    def stop_background_capture(self):
+        """Stop the background producer for this window"""
+        self._capture_manager.stop_producer(self.hwnd)
 
     def is_inside(self, x, y):
         return 0 <= x <= self.res_width and 0 <= y <= self.res_height
@@ -410,76 +447,73 @@ class Worker(WorkerStatus):
                 log(f"[WORKER {self.id}] Wait: PixelColor missing parameters")
                 return False, None
             
-            while time.time() - start_time < timeout:
-                # Get fresh frame with force_refresh for Wait polling
-                frame = self._capture_manager.get_frame(
-                    hwnd=self.hwnd,
-                    x=self.client_rect.x,
-                    y=self.client_rect.y,
-                    w=self.client_rect.w,
-                    h=self.client_rect.h,
-                    force_refresh=True  # Use WAIT_TTL (0.1s)
-                )
-                
-                if frame and frame.pixels is not None:
-                    # Check pixel at target location
-                    if 0 <= target_y < frame.height and 0 <= target_x < frame.width:
-                        pixel = frame.pixels[target_y, target_x]
-                        # pixel is BGR
-                        pixel_b, pixel_g, pixel_r = pixel[0], pixel[1], pixel[2]
-                        target_r, target_g, target_b = target_color[0], target_color[1], target_color[2]
-                        
-                        diff = abs(pixel_r - target_r) + abs(pixel_g - target_g) + abs(pixel_b - target_b)
-                        
-                        if diff <= tolerance * 3:
-                            log(f"[WORKER {self.id}] Wait: PixelColor matched at ({target_x},{target_y})")
-                            return True, None
-                
-                time.sleep(0.1)  # Poll interval
-                
-                if self.stopped:
-                    return False, None
+            def pixel_matches(frame: Frame):
+                # Check pixel at target location
+                if 0 <= target_y < frame.height and 0 <= target_x < frame.width:
+                    pixel = frame.pixels[target_y, target_x]
+                    # pixel is BGR
+                    pixel_b, pixel_g, pixel_r = pixel[0], pixel[1], pixel[2]
+                    target_r, target_g, target_b = target_color[0], target_color[1], target_color[2]
+                    
+                    diff = abs(pixel_r - target_r) + abs(pixel_g - target_g) + abs(pixel_b - target_b)
+                    
+                    if diff <= tolerance * 3:
+                        return True
+                return None
+            
+            if self._watch(pixel_matches, timeout):
+                log(f"[WORKER {self.id}] Wait: PixelColor matched at ({target_x},{target_y})")
+                return True, None
+            
+            if self.stopped:
+                return False, None
             
             log(f"[WORKER {self.id}] Wait: PixelColor timeout")
             return False, None
         
         elif cmd.wait_type == WaitType.SCREEN_CHANGE:
-            # Poll screen change detection
+            # Screen change between consecutive frames
             prev_frame = None
             change_threshold = cmd.screen_threshold or 0.05  # 5% change
             
-            while time.time() - start_time < timeout:
-                # Get fresh frame
-                frame = self._capture_manager.get_frame(
-                    hwnd=self.hwnd,
-                    x=self.client_rect.x,
-                    y=self.client_rect.y,
-                    w=self.client_rect.w,
-                    h=self.client_rect.h,
-                    force_refresh=True
-                )
-                
-                if frame and frame.pixels is not None:
-                    if prev_frame is not None:
-                        # Calculate frame difference
-                        diff = np.abs(frame.pixels.astype(float) - prev_frame.astype(float))
-                        change_ratio = np.mean(diff) / 255.0
-                        
-                        if change_ratio >= change_threshold:
-                            log(f"[WORKER {self.id}] Wait: ScreenChange detected (ratio={change_ratio:.3f})")
-                            return True, None
+            def screen_changed(frame: Frame):
+                nonlocal prev_frame
+                if frame.pixels is None:
+                    return None
+                if prev_frame is not None:
+                    # Calculate frame difference
+                    diff = np.abs(frame.pixels.astype(float) - prev_frame.astype(float))
+                    change_ratio = np.mean(diff) / 255.0
                     
-                    prev_frame = frame.pixels.copy()
-                
-                time.sleep(0.1)
+                    if change_ratio >= change_threshold:
+                        log(f"[WORKER {self.id}] Wait: ScreenChange detected (ratio={change_ratio:.3f})")
+                        return change_ratio
                 
-                if self.stopped:
-                    return False, None
+                prev_frame = frame.pixels.copy()
+                return None
+            
+            if self._watch(screen_changed, timeout):
+                return True, None
+            
+            if self.stopped:
+                return False, None
             
             log(f"[WORKER {self.id}] Wait: ScreenChange timeout")
             return False, None
         
         return True, None
+    
+    def _watch(self, predicate, timeout_sec: float) -> bool:
+        """
+        Evaluate predicate on this window's watch scheduler (one shared
+        frame per tick) until it fires, times out or the worker stops
+        """
+        future = get_watch_scheduler(self.hwnd).watch(
+            predicate, timeout_ms=timeout_sec * 1000, interval_ms=100,
+            name=f"worker {self.id} wait"
+        )
+        result = wait_for(future, is_stopped=lambda: self.stopped)
+        return result.fired
 
     def _execute_condition(self, cmd, script: Script) -> tuple:
         """Execute Condition command with expression evaluation and nested commands"""
@@ -735,8 +769,8 @@ class Worker(WorkerStatus):
             self.variables[cmd.output_var] = None
             return False
         
-        # Extract region
-        region = frame.pixels[cmd.y1:cmd.y2, cmd.x1:cmd.x2]
+        # Extract region, widened to signed channels (only the crop, not the frame)
+        region = frame.pixels[cmd.y1:cmd.y2, cmd.x1:cmd.x2, :3].astype(np.int16)
         
         # Search for target color
         result = self._find_color_in_region(
@@ -764,10 +798,14 @@ class Worker(WorkerStatus):
         # Target color is RGB, image is BGR
         target_b, target_g, target_r = target_color[2], target_color[1], target_color[0]
         
+        # Signed channels (callers may pass them already widened; max total diff 765 fits int16)
+        if region.dtype != np.int16:
+            region = region[:, :, :3].astype(np.int16)
+        
         # Create color difference mask
-        diff_b = np.abs(region[:, :, 0].astype(int) - target_b)
-        diff_g = np.abs(region[:, :, 1].astype(int) - target_g)
-        diff_r = np.abs(region[:, :, 2].astype(int) - target_r)
+        diff_b = np.abs(region[:, :, 0] - target_b)
+        diff_g = np.abs(region[:, :, 1] - target_g)
+        diff_r = np.abs(region[:, :, 2] - target_r)
         
         total_diff = diff_b + diff_g + diff_r
         
@@ -1,5 +1,6 @@
 from core.tech import cv2, np, time
 from core.state_machine import StateResult
+from core.template_cache import get_template_cache
 
 
 class ImageScanHandler:
@@ -28,13 +29,14 @@ class ImageScanHandler:
                 "data": {}
             }
 
-        template = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-        if template is None:
+        entry = get_template_cache().get(image_path)
+        if entry is None:
             return {
                 "status": StateResult.FAIL,
                 "data": {}
             }
 
+        template = entry.gray
         th, tw = template.shape[:2]
 
         start_time = time.time()
@@ -46,13 +48,13 @@ class ImageScanHandler:
                     "data": {}
                 }
 
-            frame = worker.capture()
+            frame = worker.capture_frame(ttl=retry_interval)
             if frame is None:
                 time.sleep(retry_interval)
                 continue
 
-            img = np.array(frame)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            # Memoized on the Frame: shared with other consumers of this capture
+            gray = frame.gray
 
             result = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
             min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
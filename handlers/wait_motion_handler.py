@@ -33,13 +33,13 @@ class WaitMotionHandler:
                     "data": {}
                 }
 
-            frame = worker.capture()
+            frame = worker.capture_frame(ttl=sample_interval)
             if frame is None:
                 time.sleep(sample_interval)
                 continue
 
-            img = np.array(frame)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            # Memoized on the Frame: shared with other consumers of this capture
+            gray = frame.gray
 
             if prev_gray is None:
                 prev_gray = gray
@@ -0,0 +1,128 @@
+"""CaptureManager frame cache under concurrency, with a slow fake provider"""
+
+import threading
+import time
+
+import numpy as np
+
+from core.capture import CaptureManager, Frame, FramePool, ICaptureProvider
+
+
+GRAB_MS = 30
+RECT = (0, 0, 480, 270)
+
+
+class SlowProvider(ICaptureProvider):
+    """Slices a fixed desktop after sleeping delay seconds; counts grabs"""
+    
+    def __init__(self, delay: float):
+        self.desktop = np.random.default_rng(0).integers(0, 256, (540, 960, 3), dtype=np.uint8)
+        self.delay = delay
+        self.calls = 0
+    
+    @property
+    def name(self) -> str:
+        return "Slow"
+    
+    def is_available(self) -> bool:
+        return True
+    
+    def grab(self, x: int, y: int, w: int, h: int) -> Frame:
+        self.calls += 1
+        time.sleep(self.delay)
+        pixels = self.desktop[y:y + h, x:x + w].copy()
+        return Frame(pixels=pixels, width=w, height=h, timestamp=time.time(), provider=self.name)
+    
+    def release(self):
+        pass
+
+
+def make_manager():
+    provider = SlowProvider(GRAB_MS / 1000.0)
+    return CaptureManager(providers=[provider], cache_budget=1 << 30), provider
+
+
+def hit_p99_us(workers: int, duration: float = 0.3) -> float:
+    """
+    p99 cache-hit latency while each worker reads its own window, with
+    every 10th call a forced (slow) grab.
+    """
+    manager, _ = make_manager()
+    for hwnd in range(1, workers + 1):
+        manager.get_frame(hwnd, *RECT)
+    
+    latencies = [[] for _ in range(workers)]
+    stop = threading.Event()
+    
+    def worker(i: int):
+        calls = 0
+        while not stop.is_set():
+            calls += 1
+            if calls % 10 == 0:
+                manager.get_frame(i + 1, *RECT, force_refresh=True)
+                continue
+            start = time.perf_counter()
+            manager.get_frame(i + 1, *RECT, ttl=1e9)
+            latencies[i].append(time.perf_counter() - start)
+    
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    
+    hits = np.array([v for lat in latencies for v in lat]) * 1e6
+    assert hits.size > 0
+    return float(np.percentile(hits, 99))
+
+
+def test_hit_latency_flat_under_concurrent_grabs():
+    single = hit_p99_us(1)
+    many = hit_p99_us(16)
+    # A hit that waited on another window's grab would take ~GRAB_MS
+    assert many <= max(10 * single, GRAB_MS * 1000 / 10), (single, many)
+
+
+def test_concurrent_misses_share_one_grab():
+    manager, provider = make_manager()
+    workers = 16
+    barrier = threading.Barrier(workers)
+    frames = []
+    
+    def refresh():
+        barrier.wait()
+        frames.append(manager.get_frame(1, *RECT, force_refresh=True))
+    
+    threads = [threading.Thread(target=refresh, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert provider.calls == 1
+    assert len(frames) == workers and all(f is frames[0] for f in frames)
+
+
+def test_pool_reuses_buffer_only_after_last_view():
+    pool = FramePool(max_per_shape=2)
+    first = pool.acquire(4, 6)
+    crop = first[1:3, 2:5, :2]  # views keep the lease alive
+    del first
+    
+    second = pool.acquire(4, 6)
+    assert not np.shares_memory(second, crop)
+    assert pool.stats()["leased"] == 2
+    
+    del crop
+    assert pool.stats()["leased"] == 1
+    third = pool.acquire(4, 6)
+    assert pool.reused == 1 and pool.allocated == 2
+    
+    pool.acquire(4, 6)  # both buffers leased: falls back to a plain array
+    assert pool.unpooled == 1
+    
+    del second, third
+    pool.trim()
+    assert pool.stats()["buffers"] == 0
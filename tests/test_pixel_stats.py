@@ -0,0 +1,98 @@
+"""core.pixel_stats returns exactly what the per-byte wait loops it replaced did"""
+
+from collections import Counter
+
+import numpy as np
+
+from core import pixel_stats
+
+
+# ---- The original loops (core/wait_actions.py before vectorization) ----
+
+def loop_difference(data1: bytes, data2: bytes) -> float:
+    diff_count = 0
+    total = len(data1)
+    for i in range(0, total, 4):
+        if (data1[i] != data2[i] or
+            data1[i+1] != data2[i+1] or
+            data1[i+2] != data2[i+2]):
+            diff_count += 1
+    return diff_count / (total / 4)
+
+
+def loop_count_colors(data: bytes, colors, tolerance: int) -> float:
+    match_count = 0
+    total_pixels = len(data) // 4
+    for i in range(0, len(data), 4):
+        b, g, r = data[i], data[i+1], data[i+2]
+        for r_target, g_target, b_target in colors:
+            if (abs(r - r_target) <= tolerance and
+                abs(g - g_target) <= tolerance and
+                abs(b - b_target) <= tolerance):
+                match_count += 1
+                break
+    return (match_count / total_pixels) if total_pixels > 0 else 0.0
+
+
+def loop_analyze_colors(data: bytes) -> list:
+    color_counts = Counter()
+    for i in range(0, len(data), 4):
+        b, g, r = data[i], data[i+1], data[i+2]
+        color_counts[((r // 10) * 10, (g // 10) * 10, (b // 10) * 10)] += 1
+    return color_counts.most_common(5)
+
+
+def loop_top_colors(data: bytes, count: int = 3) -> list:
+    color_counts = Counter()
+    for i in range(0, len(data), 4):
+        b, g, r = data[i], data[i+1], data[i+2]
+        color_counts[(r, g, b)] += 1
+    filtered_colors = [(color, cnt) for color, cnt in color_counts.items()
+                       if color != (0, 0, 0) and color != (255, 255, 255)]
+    if not filtered_colors:
+        filtered_colors = list(color_counts.items())
+    return sorted(filtered_colors, key=lambda x: x[1], reverse=True)[:count]
+
+
+def regions(seed: int = 0):
+    """Blocky BGRA regions with noise, black and white pixels, of a few sizes"""
+    rng = np.random.default_rng(seed)
+    for w, h in ((1, 1), (7, 5), (40, 30), (64, 48)):
+        blocks = rng.integers(0, 256, (h // 6 + 1, w // 6 + 1, 4), dtype=np.uint8)
+        img = np.repeat(np.repeat(blocks, 6, axis=0), 6, axis=1)[:h, :w].copy()
+        img[rng.random((h, w)) < 0.1] = 0
+        img[rng.random((h, w)) < 0.05] = 255
+        img[:, :, 3] = rng.integers(0, 256, (h, w))  # alpha is ignored
+        yield img
+
+
+def test_changed_ratio_matches_loop():
+    for img in regions():
+        other = img.copy()
+        other[::2, ::3, 1] ^= 4
+        other[:, :, 3] ^= 255
+        d1, d2 = img.tobytes(), other.tobytes()
+        expected = loop_difference(d1, d2)
+        assert pixel_stats.changed_ratio(d1, d2) == expected
+        assert pixel_stats.changed_ratio(img, other) == expected
+        assert pixel_stats.changed_ratio(img[:, :, :3], other[:, :, :3]) == expected
+
+
+def test_match_ratio_matches_loop():
+    for img in regions(1):
+        data = img.tobytes()
+        first = tuple(int(v) for v in img[0, 0, 2::-1])
+        for colors in ([first], [first, (0, 0, 0)], [(255, 255, 255), (128, 64, 32)]):
+            for tolerance in (0, 10, 30):
+                assert pixel_stats.match_ratio(data, colors, tolerance) == \
+                    loop_count_colors(data, colors, tolerance)
+
+
+def test_histograms_match_counter_order():
+    for img in regions(2):
+        data = img.tobytes()
+        assert pixel_stats.most_common(*pixel_stats.color_counts(data, 10), 5) == \
+            loop_analyze_colors(data)
+        assert pixel_stats.most_common(*pixel_stats.color_counts(data), 3,
+                                       exclude=((0, 0, 0), (255, 255, 255))) == \
+            loop_top_colors(data)
@@ -0,0 +1,137 @@
+"""core.polling with injected clocks (no real sleeping)"""
+
+import numpy as np
+import pytest
+
+from core.polling import (BackoffPolicy, CheckBudget, FrameChangeDetector, PollPolicy, Poller,
+                          get_poll_stats, make_policy, reset_poll_stats, set_policy_factory)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, ms: float):
+        self.now += ms / 1000.0
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_poll_stats()
+    yield
+    reset_poll_stats()
+    set_policy_factory(None)
+
+
+def test_backoff_grows_while_static_and_caps():
+    policy = BackoffPolicy(100, min_ms=50, max_ms=400)
+    intervals = []
+    for _ in range(5):
+        policy.observe(False)
+        intervals.append(policy.interval_ms())
+    assert intervals == [150, 225, 337.5, 400, 400]
+
+
+def test_backoff_bursts_after_change():
+    policy = BackoffPolicy(100, min_ms=50, max_ms=400, burst_checks=3)
+    for _ in range(4):
+        policy.observe(False)
+    
+    policy.observe(True)
+    assert policy.interval_ms() == 50
+    for _ in range(3):  # held at min_ms for burst_checks static checks
+        policy.observe(False)
+        assert policy.interval_ms() == 50
+    policy.observe(False)
+    assert policy.interval_ms() == 75
+    
+    policy.reset()
+    assert policy.interval_ms() == 100
+
+
+def test_policy_factory_swap():
+    assert isinstance(make_policy(100, max_ms=800), BackoffPolicy)
+    set_policy_factory(PollPolicy)
+    fixed = make_policy(100, max_ms=800)
+    fixed.observe(False)
+    assert type(fixed) is PollPolicy and fixed.interval_ms() == 100
+
+
+def test_check_budget_refill():
+    clock = FakeClock()
+    budget = CheckBudget(10, clock=clock)
+    assert all(budget.try_acquire() for _ in range(10))  # one second of burst
+    assert not budget.try_acquire()
+    assert budget.retry_after() == pytest.approx(0.1)
+    
+    clock.advance(50)
+    assert not budget.try_acquire()
+    clock.advance(50)
+    assert budget.try_acquire()
+    
+    # Idle time refills at most one second's worth
+    clock.advance(10000)
+    assert sum(budget.try_acquire() for _ in range(20)) == 10
+
+
+def test_check_budget_unlimited():
+    budget = CheckBudget(0, clock=FakeClock())
+    assert all(budget.try_acquire() for _ in range(1000))
+    assert budget.retry_after() == 0.0
+
+
+def test_poller_saved_accounting():
+    clock = FakeClock()
+    poller = Poller(BackoffPolicy(100, max_ms=800), owner="test-saved", clock=clock,
+                    budget=CheckBudget(0, clock=clock))
+    poller.observe(False)  # first check: expected 1
+    clock.advance(400)
+    poller.observe(False)  # a fixed 100ms loop would have checked 4 more times
+    assert get_poll_stats()["test-saved"] == {"checks": 2, "expected": 5, "saved": 3, "throttled": 0}
+    
+    # A paused loop (e.g. FindImage between find() calls) does not bill the gap
+    poller.pause()
+    clock.advance(60000)
+    poller.observe(False)
+    assert get_poll_stats()["test-saved"]["expected"] == 6
+
+
+def test_poller_throttled_by_budget():
+    clock = FakeClock()
+    poller = Poller(PollPolicy(100), owner="test-throttle", clock=clock,
+                    budget=CheckBudget(2, clock=clock))
+    assert poller.acquire() and poller.acquire()
+    assert not poller.acquire()
+    assert get_poll_stats()["test-throttle"]["throttled"] == 1
+
+
+def test_frame_change_detector():
+    detector = FrameChangeDetector(step=4, tolerance=8)
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+    assert not detector.changed(frame)  # first frame: nothing to compare
+    assert not detector.changed(frame)
+    
+    noisy = frame.copy()
+    noisy[::4, ::4] = 8  # within tolerance
+    assert not detector.changed(noisy)
+    
+    moved = frame.copy()
+    moved[4, 4] = 200  # on the sampling grid
+    assert detector.changed(moved)
+    assert detector.changed(np.zeros((16, 16, 3), dtype=np.uint8))  # size change
+
+
+def test_stable_count_exit_keeps_fixed_cadence():
+    from core.wait_actions import WaitColorDisappear
+    
+    counting = WaitColorDisappear(region=(0, 0, 10, 10), stable_count_exit=3)._make_poller(200)
+    adaptive = WaitColorDisappear(region=(0, 0, 10, 10), stable_count_exit=0)._make_poller(200)
+    for changed in (False, False, True, False, False, False, False):
+        counting.observe(changed)
+        adaptive.observe(changed)
+        # N identical checks take N * 200ms, whatever happened before
+        assert counting.interval_ms() == 200
+    assert adaptive.interval_ms() == 150  # burst at 100ms, then backing off
@@ -0,0 +1,95 @@
+"""Fast matching engines give the same answers as full TM_CCOEFF_NORMED matching"""
+
+import cv2
+import numpy as np
+
+from core.template_cache import Template
+from core.template_match import (ScreenPyramid, fingerprint_rejects, match_exact, match_full,
+                                 match_pyramid, top_k_nms)
+
+
+METHOD = cv2.TM_CCOEFF_NORMED
+
+
+def blocky(rng, w: int, h: int, block: int = 8) -> np.ndarray:
+    blocks = rng.integers(0, 256, (h // block + 1, w // block + 1, 3), dtype=np.uint8)
+    return np.repeat(np.repeat(blocks, block, axis=0), block, axis=1)[:h, :w].copy()
+
+
+def add_noise(rng, img: np.ndarray, amount: int) -> np.ndarray:
+    noise = rng.integers(-amount, amount + 1, img.shape)
+    return np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def test_pyramid_decisions_match_full():
+    rng = np.random.default_rng(0)
+    w, h, tw, th = 480, 270, 60, 48
+    template = Template("<test>", blocky(rng, tw, th), (0, 0))
+    accept = 0.8
+    
+    for i in range(24):
+        screen = blocky(rng, w, h)
+        if i % 2 == 0:
+            x, y = int(rng.integers(0, w - tw)), int(rng.integers(0, h - th))
+            screen[y:y + th, x:x + tw] = template.bgr
+        screen = add_noise(rng, screen, 6)
+        
+        full = match_full(screen, template.bgr, METHOD)
+        pyr = match_pyramid(screen, template, METHOD, accept)
+        assert (pyr.score >= accept) == (full.score >= accept), i
+        if full.score >= accept:
+            assert pyr.top_left == full.top_left == (x, y)
+
+
+def test_top_k_nms_picks_each_icon_once():
+    rng = np.random.default_rng(0)
+    icon, pitch = 40, 64
+    template = blocky(rng, icon, icon, block=4)
+    screen = np.full((270, 480, 3), 40, dtype=np.uint8)
+    positions = set()
+    for y in range(12, 270 - icon, pitch):
+        for x in range(12, 480 - icon, pitch):
+            screen[y:y + icon, x:x + icon] = template
+            positions.add((x, y))
+    screen = add_noise(rng, screen, 8)
+    
+    scores = cv2.matchTemplate(screen, template, METHOD)
+    picks = top_k_nms(scores, 50, icon, icon, 0.7)
+    assert {pos for _, pos in picks} == positions
+    assert [s for s, _ in picks] == sorted((s for s, _ in picks), reverse=True)
+
+
+def test_exact_hits_match_ccoeff():
+    rng = np.random.default_rng(0)
+    w, h, tw, th = 480, 270, 48, 24
+    template = Template("<test>", blocky(rng, tw, th, block=4), (0, 0))
+    
+    for _ in range(8):
+        screen = blocky(rng, w, h)
+        x, y = int(rng.integers(0, w - tw)), int(rng.integers(0, h - th))
+        assert match_exact(screen, template) is None  # no verbatim copy yet
+        
+        screen[y:y + th, x:x + tw] = template.bgr
+        exact = match_exact(screen, template)
+        full = match_full(screen, template.bgr, METHOD)
+        assert exact is not None and exact.top_left == full.top_left == (x, y)
+        assert full.score > 0.999
+        assert match_exact(screen, template, pyramid=ScreenPyramid(screen)) == exact
+        
+        screen[y + th // 2, x + tw // 2, 0] ^= 1  # one channel of one pixel off
+        assert match_exact(screen, template) is None
+
+
+def test_fingerprint_rejects_only_clear_mismatches():
+    rng = np.random.default_rng(0)
+    template = Template("<test>", blocky(rng, 40, 30, block=4), (0, 0))
+    max_diff = 255.0 * (1.0 - (0.95 - 0.7) / 0.3)  # FindImage at threshold 0.95
+    
+    area = add_noise(rng, blocky(rng, 56, 44), 4)
+    assert fingerprint_rejects(area, template.fingerprint, max_diff) is True
+    
+    area[9:39, 5:45] = add_noise(rng, template.bgr, 4)
+    assert fingerprint_rejects(area, template.fingerprint, max_diff) is False
+    
+    # Too many offsets to be worth sampling: leave it to the full match
+    assert fingerprint_rejects(blocky(rng, 480, 270), template.fingerprint, max_diff) is None
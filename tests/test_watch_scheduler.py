@@ -0,0 +1,126 @@
+"""WatchScheduler driven by tick() with a virtual clock and fake frames"""
+
+import cv2
+import numpy as np
+
+from core.capture import Frame
+from core.watch_scheduler import WatchScheduler, pixel_color, template_present
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, ms: float):
+        self.now += ms / 1000.0
+
+
+class FakeScreen:
+    """Frame source returning the current pixels; counts grabs"""
+    
+    def __init__(self, w: int = 20, h: int = 10):
+        self.pixels = np.zeros((h, w, 3), dtype=np.uint8)
+        self.grabs = 0
+    
+    def __call__(self) -> Frame:
+        self.grabs += 1
+        h, w = self.pixels.shape[:2]
+        return Frame(pixels=self.pixels.copy(), width=w, height=h, timestamp=0.0, provider="fake")
+
+
+def make_scheduler():
+    clock, screen = FakeClock(), FakeScreen()
+    return WatchScheduler(screen, tick_ms=50, clock=clock, name="test"), clock, screen
+
+
+def test_fires_when_predicate_matches():
+    scheduler, clock, screen = make_scheduler()
+    future = scheduler.watch(pixel_color(5, 5, (255, 0, 0)), timeout_ms=1000, interval_ms=100)
+    
+    assert scheduler.tick() == 0.1  # next check due
+    assert not future.done()
+    
+    screen.pixels[5, 5] = (0, 0, 255)  # BGR red
+    clock.advance(50)
+    scheduler.tick()  # not due yet: no grab, no evaluation
+    assert screen.grabs == 1
+    assert not future.done()
+    
+    clock.advance(50)
+    scheduler.tick()
+    result = future.result(timeout=0)
+    assert result.fired and not result.timeout
+    assert result.value == (255, 0, 0)
+    assert result.checks == 2
+    assert result.elapsed_ms == 100
+    assert scheduler.active == 0
+
+
+def test_times_out_before_evaluating_late_frame():
+    scheduler, clock, screen = make_scheduler()
+    future = scheduler.watch(pixel_color(5, 5, (255, 0, 0)), timeout_ms=300, interval_ms=100)
+    
+    for _ in range(3):
+        scheduler.tick()
+        clock.advance(100)
+    assert not future.done()
+    
+    # The pixel turns red exactly at the deadline: the timeout wins
+    screen.pixels[5, 5] = (0, 0, 255)
+    assert scheduler.tick() is None  # idle
+    result = future.result(timeout=0)
+    assert result.timeout and not result.fired
+    assert result.checks == 3
+    assert screen.grabs == 3
+    assert scheduler.stats()["timeouts"] == 1
+
+
+def test_due_watches_share_one_frame():
+    scheduler, clock, screen = make_scheduler()
+    first = scheduler.watch(pixel_color(0, 0, (9, 9, 9)), interval_ms=100)
+    second = scheduler.watch(pixel_color(1, 1, (0, 0, 0)), interval_ms=300)
+    
+    scheduler.tick()
+    assert screen.grabs == 1
+    assert scheduler.evaluations == 2  # both checked against the same frame
+    assert second.result(timeout=0).value == (0, 0, 0)
+    assert not first.done()
+    
+    third = scheduler.watch(pixel_color(2, 2, (9, 9, 9)), interval_ms=100)
+    clock.advance(100)
+    scheduler.tick()
+    assert screen.grabs == 2
+    assert scheduler.evaluations == 4  # first and third; second is resolved
+    assert scheduler.stats()["evaluations_per_frame"] == 2.0
+    
+    assert first.cancel() and third.cancel()
+    assert first.result(timeout=0).cancelled
+    assert not first.cancel()  # already resolved
+    assert scheduler.tick() is None
+
+
+def test_template_present_fires_on_scheduler_frame(tmp_path):
+    scheduler, clock, screen = make_scheduler()
+    screen.pixels = np.zeros((120, 160, 3), dtype=np.uint8)
+    patch = np.random.default_rng(1).integers(0, 256, (16, 24, 3), dtype=np.uint8)
+    paths = [str(tmp_path / "a.png"), str(tmp_path / "b.png")]
+    cv2.imwrite(paths[0], np.full((16, 24, 3), 200, dtype=np.uint8))
+    cv2.imwrite(paths[1], patch)
+    
+    future = scheduler.watch(template_present(1234, paths, region=(10, 10, 150, 110)),
+                             timeout_ms=1000, interval_ms=100)
+    scheduler.tick()
+    assert not future.done()
+    
+    screen.pixels[50:66, 70:94] = patch
+    clock.advance(100)
+    scheduler.tick()
+    result = future.result(timeout=0)
+    assert result.fired and result.checks == 2
+    index, match = result.value
+    assert index == 1
+    assert (match.x, match.y) == (70, 50)  # frame coords, region offset added back
+    assert screen.grabs == 2
@@ -669,6 +669,7 @@ class ActionType(Enum):
     WAIT_SCREEN_CHANGE = "WAIT_SCREEN_CHANGE"
     WAIT_COMBOKEY = "WAIT_COMBOKEY"  # Renamed from WAIT_HOTKEY
     WAIT_FILE = "WAIT_FILE"
+    WAIT_ANY_IMAGE = "WAIT_ANY_IMAGE"  # First of N templates, goto per template
     
     # Image Actions (V2 - spec B2)
     FIND_IMAGE = "FIND_IMAGE"
@@ -795,6 +796,9 @@ class Action:
         elif self.action == "FIND_IMAGE":
             path = v.get("template_path", "")
             return os.path.basename(path)[:20]
+        elif self.action == "WAIT_ANY_IMAGE":
+            names = [os.path.basename(e.get("template_path", "")) for e in v.get("templates", [])]
+            return f"[{len(names)}] " + ", ".join(names)[:20]
         elif self.action == "CAPTURE_IMAGE":
             path = v.get("save_path", "")
             return os.path.basename(path)[:20] if path else "auto"
@@ -822,6 +826,22 @@ class Action:
         return str(v)[:30]
 
 
+def template_path_refs(action_dict: dict) -> list:
+    """
+    (holder, key) pairs of the template image paths in an action dict:
+    FIND_IMAGE's template_path and each WAIT_ANY_IMAGE entry's. Embed and
+    load code rewrite holder[key] in place.
+    """
+    value = action_dict.get("value") or {}
+    if action_dict.get("action") == "FIND_IMAGE":
+        holders = [value]
+    elif action_dict.get("action") == "WAIT_ANY_IMAGE":
+        holders = [e for e in value.get("templates", []) if isinstance(e, dict)]
+    else:
+        return []
+    return [(holder, "template_path") for holder in holders if holder.get("template_path")]
+
+
 MACRO_STORE = "data/macros.json"
 SCRIPT_STORE = "data/scripts.json"
 ACTIONS_STORE = "data/actions.json"
@@ -939,9 +959,9 @@ class MainUI:
             for action in self.actions:
                 action_dict = action.to_dict()
                 
-                # Embed FIND_IMAGE templates
-                if action.action == "FIND_IMAGE" and action.value.get("template_path"):
-                    old_path = action.value["template_path"]
+                # Embed FIND_IMAGE / WAIT_ANY_IMAGE templates
+                for holder, key in template_path_refs(action_dict):
+                    old_path = holder[key]
                     if not old_path.startswith("@embedded:") and os.path.exists(old_path):
                         with open(old_path, "rb") as img_file:
                             img_data = base64.b64encode(img_file.read()).decode('utf-8')
@@ -952,7 +972,7 @@ class MainUI:
                             clean_filename = f"image_{image_count:03d}.png"
                         img_key = f"session_img_{image_count:03d}_{clean_filename}"
                         images_embedded[img_key] = img_data
-                        action_dict["value"]["template_path"] = f"@embedded:{img_key}"
+                        holder[key] = f"@embedded:{img_key}"
                         image_count += 1
                 
                 actions_data.append(action_dict)
@@ -1010,11 +1030,10 @@ class MainUI:
                 
                 # Update paths in actions
                 for action_data in actions_data:
-                    if action_data.get("action") == "FIND_IMAGE":
-                        template_path = action_data.get("value", {}).get("template_path", "")
-                        if template_path.startswith("@embedded:"):
-                            img_key = template_path.replace("@embedded:", "")
-                            action_data["value"]["template_path"] = os.path.join(temp_dir, img_key)
+                    for holder, key in template_path_refs(action_data):
+                        if holder[key].startswith("@embedded:"):
+                            img_key = holder[key].replace("@embedded:", "")
+                            holder[key] = os.path.join(temp_dir, img_key)
             
             self.actions = [Action.from_dict(a) for a in actions_data]
             self._refresh_action_list()
@@ -1111,16 +1130,16 @@ class MainUI:
                 for action_data in actions_data:
                     # Update embedded image paths
                     if images:
-                        if action_data.get("action") == "FIND_IMAGE":
-                            path = action_data.get("value", {}).get("template_path", "")
+                        for holder, key in template_path_refs(action_data):
+                            path = holder[key]
                             if path.startswith("@embedded:"):
                                 img_key = path.replace("@embedded:", "")
                                 # Ensure extension
                                 if not img_key.endswith(('.png', '.jpg', '.jpeg', '.bmp')):
                                     img_key += '.png'
                                 resolved_path = os.path.join(temp_dir, img_key)
-                                action_data["value"]["template_path"] = resolved_path
-                                log(f"[UI] Resolved FIND_IMAGE template: {resolved_path}")
+                                holder[key] = resolved_path
+                                log(f"[UI] Resolved {action_data.get('action')} template: {resolved_path}")
                         
                         if action_data.get("action") == "WAIT_SCREEN_CHANGE":
                             path = action_data.get("value", {}).get("reference_image", "")
@@ -1165,9 +1184,9 @@ class MainUI:
                 for action in actions:
                     action_dict = action.to_dict()
                     
-                    # Embed FIND_IMAGE templates
-                    if action.action == "FIND_IMAGE" and action.value.get("template_path"):
-                        old_path = action.value["template_path"]
+                    # Embed FIND_IMAGE / WAIT_ANY_IMAGE templates
+                    for holder, key in template_path_refs(action_dict):
+                        old_path = holder[key]
                         if os.path.exists(old_path) and not old_path.startswith("@embedded:"):
                             with open(old_path, "rb") as img_file:
                                 img_data = base64.b64encode(img_file.read()).decode('utf-8')
@@ -1175,7 +1194,7 @@ class MainUI:
                             filename = os.path.basename(old_path)
                             img_key = f"w{worker_id}_img_{image_count:03d}_{filename}"
                             images_embedded[img_key] = img_data
-                            action_dict["value"]["template_path"] = f"@embedded:{img_key}"
+                            holder[key] = f"@embedded:{img_key}"
                             image_count += 1
                     
                     # Embed WAIT_SCREEN_CHANGE reference
@@ -2889,8 +2908,8 @@ class MainUI:
                             loaded_actions = []
                             for action_dict in macro_data.get('actions', []):
                                 # Handle embedded images
-                                if action_dict.get('action') == 'FIND_IMAGE':
-                                    template_path = action_dict.get('value', {}).get('template_path', '')
+                                for holder, key in template_path_refs(action_dict):
+                                    template_path = holder[key]
                                     if template_path.startswith('@embedded:'):
                                         img_key = template_path.replace('@embedded:', '')
                                         if img_key in images_embedded:
@@ -2901,7 +2920,7 @@ class MainUI:
                                             temp_path = os.path.join(temp_dir, f"preview_{wid}_{img_key}")
                                             with open(temp_path, 'wb') as img_file:
                                                 img_file.write(img_data)
-                                            action_dict['value']['template_path'] = temp_path
+                                            holder[key] = temp_path
                                 
                                 # Convert to Action object
                                 loaded_actions.append(Action.from_dict(action_dict))
@@ -3073,9 +3092,9 @@ class MainUI:
                         action_dict = action.to_dict()
                         action_obj = action
                     
-                    # Handle FIND_IMAGE - embed template as base64
-                    if action_obj.action == "FIND_IMAGE" and action_obj.value.get("template_path"):
-                        old_path = action_obj.value["template_path"]
+                    # Handle FIND_IMAGE / WAIT_ANY_IMAGE - embed templates as base64
+                    for holder, key in template_path_refs(action_dict):
+                        old_path = holder[key]
                         if os.path.exists(old_path):
                             with open(old_path, "rb") as img_file:
                                 img_data = base64.b64encode(img_file.read()).decode('utf-8')
@@ -3083,7 +3102,7 @@ class MainUI:
                             filename = os.path.basename(old_path)
                             img_key = f"img_{image_count:03d}_{filename}"
                             images_embedded[img_key] = img_data
-                            action_dict["value"]["template_path"] = f"@embedded:{img_key}"
+                            holder[key] = f"@embedded:{img_key}"
                             image_count += 1
                     
                     actions_data.append(action_dict)
@@ -3157,11 +3176,10 @@ class MainUI:
                     
                     # Update paths
                     for action_data in actions_data:
-                        if action_data.get("action") == "FIND_IMAGE":
-                            template_path = action_data.get("value", {}).get("template_path", "")
-                            if template_path.startswith("@embedded:"):
-                                img_key = template_path.replace("@embedded:", "")
-                                action_data["value"]["template_path"] = os.path.join(temp_dir, img_key)
+                        for holder, key in template_path_refs(action_data):
+                            if holder[key].startswith("@embedded:"):
+                                img_key = holder[key].replace("@embedded:", "")
+                                holder[key] = os.path.join(temp_dir, img_key)
                         
                         if action_data.get("action") == "WAIT_SCREEN_CHANGE":
                             ref_path = action_data.get("value", {}).get("reference_image", "")
@@ -3172,10 +3190,9 @@ class MainUI:
                     # Legacy format - update relative paths
                     folder = os.path.dirname(filepath)
                     for action_data in actions_data:
-                        if action_data.get("action") == "FIND_IMAGE":
-                            template_path = action_data.get("value", {}).get("template_path", "")
-                            if template_path and not os.path.isabs(template_path):
-                                action_data["value"]["template_path"] = os.path.join(folder, template_path)
+                        for holder, key in template_path_refs(action_data):
+                            if not os.path.isabs(holder[key]):
+                                holder[key] = os.path.join(folder, holder[key])
                 
                 # Convert to Action objects
                 loaded_actions = [Action.from_dict(a) for a in actions_data]
@@ -3522,6 +3539,10 @@ class MainUI:
                     if action_type == "FIND_IMAGE":
                         target = action.value.get("template_path", "")[:40]
                         value = f"conf={action.value.get('confidence', 0.8)}"
+                    elif action_type == "WAIT_ANY_IMAGE":
+                        target = ", ".join(os.path.basename(e.get("template_path", ""))
+                                           for e in action.value.get("templates", []))[:40]
+                        value = f"conf={action.value.get('threshold', 0.8)}"
                     elif action_type == "CLICK":
                         target = f"({action.value.get('x', 0)}, {action.value.get('y', 0)})"
                         value = action.value.get("button", "left")
@@ -3598,11 +3619,10 @@ class MainUI:
                     
                     # Update action paths
                     for action_data in actions_data:
-                        if action_data.get("action") == "FIND_IMAGE":
-                            template_path = action_data.get("value", {}).get("template_path", "")
-                            if template_path.startswith("@embedded:"):
-                                img_key = template_path.replace("@embedded:", "")
-                                action_data["value"]["template_path"] = os.path.join(temp_dir, img_key)
+                        for holder, key in template_path_refs(action_data):
+                            if holder[key].startswith("@embedded:"):
+                                img_key = holder[key].replace("@embedded:", "")
+                                holder[key] = os.path.join(temp_dir, img_key)
                         
                         if action_data.get("action") == "WAIT_SCREEN_CHANGE":
                             ref_path = action_data.get("value", {}).get("reference_image", "")
@@ -5580,11 +5600,10 @@ class MainUI:
                                 log(f"[EMBED_MACRO] Failed to extract image {img_key}: {e}")
                         
                         for action_data in actions_data:
-                            if action_data.get("action") == "FIND_IMAGE":
-                                template_path = action_data.get("value", {}).get("template_path", "")
-                                if template_path.startswith("@embedded:"):
-                                    img_key = template_path.replace("@embedded:", "")
-                                    action_data["value"]["template_path"] = os.path.join(temp_dir, img_key)
+                            for holder, key in template_path_refs(action_data):
+                                if holder[key].startswith("@embedded:"):
+                                    img_key = holder[key].replace("@embedded:", "")
+                                    holder[key] = os.path.join(temp_dir, img_key)
                     
                     embedded_actions = [Action.from_dict(a) for a in actions_data]
                     log(f"[EMBED_MACRO] Executing {len(embedded_actions)} actions")
@@ -5800,6 +5819,7 @@ class MainUI:
         elif action.action == "FIND_IMAGE":
             if IMAGE_ACTIONS_AVAILABLE:
                 from core.image_actions import FindImage
+                from core.polling import Poller, make_policy
                 import time as time_module
                 import ctypes.wintypes
                 
@@ -5837,11 +5857,29 @@ class MainUI:
                 if not hasattr(self, '_action_vars'):
                     self._action_vars = {}
                 
-                # Search loop with retry
+                # One finder for all attempts (template comes from the shared TemplateCache)
+                finder = FindImage(
+                    template_path=template_path,
+                    region=search_region,  # Use crop_region for search area
+                    threshold=threshold,
+                    timeout_ms=1000,  # Single scan timeout
+                    target_hwnd=target_hwnd or 0,
+                    engine=v.get("engine", "full"),  # "pyramid" = coarse-to-fine
+                    pyramid_tolerance=v.get("pyramid_tolerance", 0.1),
+                    multi_scale=v.get("multi_scale", False),
+                    scale_range=(v.get("scale_min", 0.8), v.get("scale_max", 1.2)),
+                    scale_step=v.get("scale_step", 0.05),
+                    exact_cutoff=v.get("exact_cutoff", 0.95),
+                    fingerprint=v.get("fingerprint")
+                )
+                
+                # Search loop with retry; the pause between attempts backs off
+                # while the window stays static (long loading screens)
                 found = False
                 match = None
                 start_time = time_module.time()
                 attempt = 0
+                retry_poller = Poller(make_policy(500, min_ms=250, max_ms=2000))
                 
                 while not found and (time_module.time() - start_time) < retry_seconds:
                     if self._playback_stop_event and self._playback_stop_event.is_set():
@@ -5850,19 +5888,14 @@ class MainUI:
                     attempt += 1
                     elapsed = time_module.time() - start_time
                     
-                    finder = FindImage(
-                        template_path=template_path,
-                        region=search_region,  # Use crop_region for search area
-                        threshold=threshold,
-                        timeout_ms=1000,  # Single scan timeout
-                        target_hwnd=target_hwnd or 0
-                    )
                     match = finder.find(self._playback_stop_event)
                     found = match.found if match else False
                     
                     if not found:
                         log(f"[FIND_IMAGE] Attempt {attempt}: not found ({elapsed:.1f}s / {retry_seconds}s)")
-                        time_module.sleep(0.5)  # Wait before retry
+                        retry_poller.observe(finder.screen_changed)
+                        remaining_ms = (retry_seconds - (time_module.time() - start_time)) * 1000
+                        retry_poller.sleep(self._playback_stop_event, limit_ms=remaining_ms)
                 
                 # Store result
                 self._action_vars["last_image_x"] = match.center_x if match and match.found else 0
@@ -6256,6 +6289,43 @@ class MainUI:
                     
                     self._handle_goto(goto_target)
         
+        elif action.action == "WAIT_ANY_IMAGE":
+            # First of N templates to appear, each with its own goto
+            # (replaces chains of FIND_IMAGE + goto polling the same screen)
+            if IMAGE_ACTIONS_AVAILABLE:
+                from core.wait_actions import WaitAnyImage
+                
+                entries = [e for e in v.get("templates", []) if e.get("template_path")]
+                wait = WaitAnyImage(
+                    template_paths=[e["template_path"] for e in entries],
+                    threshold=v.get("threshold", 0.8),
+                    timeout_ms=v.get("timeout_ms", 30000),
+                    target_hwnd=target_hwnd or 0,
+                    engine=v.get("engine", "full")
+                )
+                result = wait.wait(self._playback_stop_event)
+                
+                if not hasattr(self, '_action_vars'):
+                    self._action_vars = {}
+                
+                if result.success:
+                    index = result.data["index"]
+                    match = result.data["match"]
+                    self._action_vars["last_image_x"] = match.center_x
+                    self._action_vars["last_image_y"] = match.center_y
+                    self._action_vars["last_image_found"] = True
+                    self._action_vars["last_image_index"] = index
+                    goto_target = entries[index].get("goto", "Next")
+                else:
+                    log(f"[WAIT_ANY_IMAGE] {result.message}")
+                    self._action_vars["last_image_found"] = False
+                    self._action_vars["last_image_index"] = -1
+                    goto_target = v.get("goto_if_not_found", "Next")
+                
+                if goto_target and goto_target.startswith("→ "):
+                    goto_target = goto_target[2:]
+                self._handle_goto(goto_target)
+        
         elif action.action == "CAPTURE_IMAGE":
             if IMAGE_ACTIONS_AVAILABLE:
                 from core.image_actions import CaptureImage
@@ -6943,10 +7013,10 @@ class MainUI:
                 """Recursively embed images in action (handles nested GROUP actions)"""
                 import re
                 
-                # Handle FIND_IMAGE
-                if action_dict.get("action") == "FIND_IMAGE" and action_dict.get("value", {}).get("template_path"):
-                    old_path = action_dict["value"]["template_path"]
-                    log(f"[SAVE] FIND_IMAGE template_path: {old_path}")
+                # Handle FIND_IMAGE / WAIT_ANY_IMAGE
+                for holder, key in template_path_refs(action_dict):
+                    old_path = holder[key]
+                    log(f"[SAVE] {action_dict.get('action')} template_path: {old_path}")
                     if old_path.startswith("@embedded:"):
                         log(f"[SAVE] Already embedded, keeping reference")
                     elif os.path.exists(old_path):
@@ -6959,7 +7029,7 @@ class MainUI:
                             clean_filename = f"image_{image_count:03d}.png"
                         img_key = f"img_{image_count:03d}_{clean_filename}"
                         images_embedded[img_key] = img_data
-                        action_dict["value"]["template_path"] = f"@embedded:{img_key}"
+                        holder[key] = f"@embedded:{img_key}"
                         image_count += 1
                         log(f"[SAVE] Embedded image: {filename} -> {img_key}")
                     else:
@@ -7100,14 +7170,13 @@ class MainUI:
         
         def update_embedded_paths(action_data, temp_dir):
             """Recursively update @embedded: paths in action (handles nested GROUP actions)"""
-            # Handle FIND_IMAGE
-            if action_data.get("action") == "FIND_IMAGE":
-                template_path = action_data.get("value", {}).get("template_path", "")
-                if template_path.startswith("@embedded:"):
-                    img_key = template_path.replace("@embedded:", "")
+            # Handle FIND_IMAGE / WAIT_ANY_IMAGE
+            for holder, key in template_path_refs(action_data):
+                if holder[key].startswith("@embedded:"):
+                    img_key = holder[key].replace("@embedded:", "")
                     new_path = os.path.join(temp_dir, img_key)
-                    action_data["value"]["template_path"] = new_path
-                    log(f"[LOAD] Resolved FIND_IMAGE: {img_key} -> {new_path}")
+                    holder[key] = new_path
+                    log(f"[LOAD] Resolved {action_data.get('action')}: {img_key} -> {new_path}")
             
             # Handle WAIT_SCREEN_CHANGE
             if action_data.get("action") == "WAIT_SCREEN_CHANGE":
@@ -7142,11 +7211,9 @@ class MainUI:
         
         # Update template paths to absolute if relative
         for action_data in actions_data:
-            if action_data.get("action") == "FIND_IMAGE":
-                template_path = action_data.get("value", {}).get("template_path", "")
-                if template_path and not os.path.isabs(template_path):
-                    abs_path = os.path.join(folder, template_path)
-                    action_data["value"]["template_path"] = abs_path
+            for holder, key in template_path_refs(action_data):
+                if not os.path.isabs(holder[key]):
+                    holder[key] = os.path.join(folder, holder[key])
         
         # Append to existing actions instead of replacing
         new_actions = [Action.from_dict(a) for a in actions_data]
@@ -7216,7 +7283,7 @@ class MainUI:
             "Click": ["CLICK", "DRAG", "WHEEL"],
             "Input": ["KEY_PRESS", "COMBOKEY", "TEXT"],
             "Image": ["FIND_IMAGE", "CAPTURE_IMAGE"],
-            "Wait": ["WAIT", "WAIT_TIME", "WAIT_PIXEL_COLOR", "WAIT_SCREEN_CHANGE", "WAIT_COLOR_DISAPPEAR", "WAIT_COMBOKEY", "WAIT_FILE"],
+            "Wait": ["WAIT", "WAIT_TIME", "WAIT_PIXEL_COLOR", "WAIT_SCREEN_CHANGE", "WAIT_COLOR_DISAPPEAR", "WAIT_COMBOKEY", "WAIT_FILE", "WAIT_ANY_IMAGE"],
             "Flow": ["REPEAT", "EMBED_MACRO", "GROUP"]
         }
         
@@ -7432,6 +7499,8 @@ class MainUI:
                 self._render_wait_combokey_config(config_frame, config_widgets, value)
             elif action_type == "WAIT_FILE":
                 self._render_wait_file_config(config_frame, config_widgets, value)
+            elif action_type == "WAIT_ANY_IMAGE":
+                self._render_wait_any_image_config(config_frame, config_widgets, value)
             # V2 Image Actions
             elif action_type == "FIND_IMAGE":
                 self._render_find_image_config(config_frame, config_widgets, value, dialog)
@@ -8467,6 +8536,16 @@ class MainUI:
                 "condition": widgets["condition"].get(),
                 "timeout_ms": widgets["timeout_ms"].get()
             }
+        elif action_type == "WAIT_ANY_IMAGE":
+            return {
+                "templates": [{"template_path": path_var.get(), "goto": goto_var.get()}
+                              for path_var, goto_var in widgets.get("_templates", [])
+                              if path_var.get()],
+                "threshold": widgets["threshold"].get(),
+                "timeout_ms": widgets["timeout_ms"].get(),
+                "engine": widgets["engine"].get(),
+                "goto_if_not_found": widgets["goto_if_not_found"].get()
+            }
         # V2 Image Actions
         elif action_type == "FIND_IMAGE":
             result = {
@@ -9385,6 +9464,90 @@ class MainUI:
         tk.Entry(timeout_frame, textvariable=timeout_var, width=10).pack(side="left")
         widgets["timeout_ms"] = timeout_var
     
+    def _render_wait_any_image_config(self, parent, widgets, value):
+        """Render WAIT_ANY_IMAGE config: templates in priority order, each with its own goto"""
+        def get_label_list():
+            labels = ["Next", "Previous", "Start", "End", "Exit macro"]
+            for action in self.actions:
+                label_name = ""
+                if action.action == "LABEL":
+                    if isinstance(action.value, dict):
+                        label_name = action.value.get("name", "")
+                if not label_name and action.label:
+                    label_name = action.label
+                if label_name and f"→ {label_name}" not in labels:
+                    labels.append(f"→ {label_name}")
+            return labels
+        
+        rows_frame = tk.Frame(parent)
+        rows_frame.pack(fill="x", padx=10, pady=5)
+        tk.Label(rows_frame, text="Templates (first found wins, top = priority):",
+                font=("Arial", 9)).pack(anchor="w")
+        rows = []
+        widgets["_templates"] = rows
+        
+        def add_row(path="", goto="Next"):
+            row = tk.Frame(rows_frame)
+            row.pack(fill="x", pady=2)
+            path_var = tk.StringVar(value=path)
+            goto_var = tk.StringVar(value=goto)
+            entry = (path_var, goto_var)
+            tk.Entry(row, textvariable=path_var, width=28).pack(side="left")
+            
+            def browse():
+                from tkinter import filedialog
+                fp = filedialog.askopenfilename(filetypes=[("Images", "*.png *.jpg *.jpeg *.bmp")])
+                if fp:
+                    path_var.set(fp)
+            tk.Button(row, text="...", command=browse).pack(side="left", padx=2)
+            
+            tk.Label(row, text="→", font=("Arial", 9)).pack(side="left", padx=(5, 2))
+            goto_combo = ttk.Combobox(row, textvariable=goto_var, width=14,
+                                      values=get_label_list(), state="readonly")
+            goto_combo.pack(side="left")
+            goto_combo.bind("<Button-1>", lambda e: goto_combo.configure(values=get_label_list()))
+            
+            def remove():
+                rows.remove(entry)
+                row.destroy()
+            tk.Button(row, text="✕", command=remove).pack(side="left", padx=2)
+            rows.append(entry)
+        
+        for item in value.get("templates", []):
+            add_row(item.get("template_path", ""), item.get("goto", "Next"))
+        if not rows:
+            add_row()
+        tk.Button(parent, text="+ Add template", command=add_row).pack(anchor="w", padx=10)
+        
+        opts_frame = tk.Frame(parent)
+        opts_frame.pack(fill="x", padx=10, pady=5)
+        tk.Label(opts_frame, text="Threshold:", font=("Arial", 9)).pack(side="left", padx=(0, 5))
+        threshold_var = tk.DoubleVar(value=value.get("threshold", 0.8))
+        tk.Entry(opts_frame, textvariable=threshold_var, width=6).pack(side="left")
+        widgets["threshold"] = threshold_var
+        tk.Label(opts_frame, text="Engine:", font=("Arial", 9)).pack(side="left", padx=(10, 5))
+        engine_var = tk.StringVar(value=value.get("engine", "full"))
+        ttk.Combobox(opts_frame, textvariable=engine_var, values=["full", "pyramid"],
+                    state="readonly", width=8).pack(side="left")
+        widgets["engine"] = engine_var
+        
+        timeout_frame = tk.Frame(parent)
+        timeout_frame.pack(fill="x", padx=10, pady=5)
+        tk.Label(timeout_frame, text="Timeout (ms):", font=("Arial", 9)).pack(side="left", padx=(0, 5))
+        timeout_var = tk.IntVar(value=value.get("timeout_ms", 30000))
+        tk.Entry(timeout_frame, textvariable=timeout_var, width=10).pack(side="left")
+        widgets["timeout_ms"] = timeout_var
+        
+        notfound_frame = tk.Frame(parent)
+        notfound_frame.pack(fill="x", padx=10, pady=5)
+        tk.Label(notfound_frame, text="❌ If timeout:", font=("Arial", 9)).pack(side="left", padx=(0, 5))
+        goto_notfound_var = tk.StringVar(value=value.get("goto_if_not_found", "Next"))
+        goto_notfound_combo = ttk.Combobox(notfound_frame, textvariable=goto_notfound_var, width=20,
+                                           values=get_label_list(), state="readonly")
+        goto_notfound_combo.pack(side="left")
+        goto_notfound_combo.bind("<Button-1>", lambda e: goto_notfound_combo.configure(values=get_label_list()))
+        widgets["goto_if_not_found"] = goto_notfound_var
+    
     def _render_find_image_config(self, parent, widgets, value, dialog=None):
         """Render FIND_IMAGE config - Modern dark UI with proper color tolerance"""
         from PIL import Image, ImageTk
@@ -9789,11 +9952,12 @@ class MainUI:
                 screen_gray = cv2.cvtColor(screen_bgr, cv2.COLOR_BGR2GRAY)
                 
                 # Load template
-                template = cv2.imread(template_path)
-                if template is None:
+                from core.template_cache import get_template_cache
+                entry = get_template_cache().get(template_path)
+                if entry is None:
                     messagebox.showerror("Error", "Cannot read template image")
                     return
-                template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+                template_gray = entry.gray
                 
                 h, w = template_gray.shape
                 
@@ -12730,6 +12894,8 @@ class MainUI:
         """Refresh workers without showing messagebox (for internal use)"""
         from initialize_workers import detect_ldplayer_windows
         from core.worker import Worker
+        from core.capture import get_capture_manager
+        from core.watch_scheduler import release_watch_scheduler
         
         log(f"[DEBUG _refresh_workers_silent] START - root geometry: {self.root.winfo_geometry()}")
         log(f"[DEBUG _refresh_workers_silent] START - screen: {self.root.winfo_screenwidth()}x{self.root.winfo_screenheight()}")
@@ -12748,6 +12914,7 @@ class MainUI:
         self.worker_mgr.cleanup_stale_assignments(current_hwnds)
         
         # Update workers list
+        old_hwnds = {w.hwnd for w in self.workers}
         new_workers = []
         for window in windows:
             hwnd = window['hwnd']
@@ -12799,6 +12966,17 @@ class MainUI:
                 self._update_worker_resolution_from_adb(worker)  # Get real resolution
                 new_workers.append(worker)
         
+        # Drop cached frames/producers/match memory of windows that closed or were reassigned
+        capture_manager = get_capture_manager()
+        for stale_hwnd in old_hwnds - {w.hwnd for w in new_workers}:
+            capture_manager.invalidate(stale_hwnd)
+            release_watch_scheduler(stale_hwnd)
+            if IMAGE_ACTIONS_AVAILABLE:
+                from core.image_actions import get_hot_regions, get_scale_memory, get_response_cache
+                get_hot_regions().forget(stale_hwnd)
+                get_scale_memory().forget(stale_hwnd)
+                get_response_cache().forget(stale_hwnd)
+        
         self.workers = new_workers
         self._auto_refresh_status()
         